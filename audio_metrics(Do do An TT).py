@@ -1,54 +1,37 @@
-import numpy as np
-import wave
+from steganography.metrics import compare_audio
+from steganography.streaming import DEFAULT_BLOCK_FRAMES
 
-def calculate_snr_psnr(original_audio_path, modified_audio_path):
+def calculate_snr_psnr(original_audio_path, modified_audio_path, block_frames=DEFAULT_BLOCK_FRAMES):
     """
     Calculates SNR and PSNR between two WAV audio files.
-    """
-    try:
-        # Read original audio file
-        with wave.open(original_audio_path, 'r') as original_file:
-            original_frames = original_file.readframes(original_file.getnframes())
-            original_data = np.frombuffer(original_frames, dtype=np.int16)
-
-        # Read modified audio file
-        with wave.open(modified_audio_path, 'r') as modified_file:
-            modified_frames = modified_file.readframes(modified_file.getnframes())
-            modified_data = np.frombuffer(modified_frames, dtype=np.int16)
 
-    except FileNotFoundError:
-        print("Error: One or both files were not found.")
-        return None, None
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    Both files are streamed block by block with float64 accumulators (see
+    steganography.metrics.compare_audio), so the result does not overflow and
+    memory use does not grow with the file length.
+    """
+    metrics = calculate_metrics(original_audio_path, modified_audio_path, block_frames)
+    if metrics is None:
         return None, None
 
-    # Ensure both arrays have the same length
-    min_len = min(len(original_data), len(modified_data))
-    original_data = original_data[:min_len]
-    modified_data = modified_data[:min_len]
-
-    # Calculate Mean Squared Error (MSE)
-    mse = np.mean((original_data - modified_data) ** 2)
-
-    if mse == 0:
+    if metrics.mse == 0:
         print("The files are identical. SNR and PSNR are infinite.")
         return float('inf'), float('inf')
 
-    # Calculate Signal Power (Ps)
-    signal_power = np.mean(original_data ** 2)
+    return metrics.snr, metrics.psnr
 
-    # Calculate Noise Power (Pn) - equivalent to MSE
-    noise_power = mse
-
-    # Calculate SNR in dB
-    snr_db = 10 * np.log10(signal_power / noise_power)
-
-    # Calculate PSNR in dB
-    max_signal_value = np.max(np.abs(original_data))
-    psnr_db = 10 * np.log10((max_signal_value ** 2) / mse)
-
-    return snr_db, psnr_db
+def calculate_metrics(original_audio_path, modified_audio_path, block_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Calculates MSE, SNR, PSNR, segmental SNR and max abs error in a single pass,
+    overall and per channel. Returns an AudioMetrics tuple, or None on error.
+    """
+    try:
+        return compare_audio(original_audio_path, modified_audio_path, block_frames=block_frames)
+    except FileNotFoundError:
+        print("Error: One or both files were not found.")
+        return None
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
 
 # --- Example Usage ---
 if __name__ == "__main__":
@@ -61,3 +44,12 @@ if __name__ == "__main__":
     if snr is not None and psnr is not None:
         print(f"SNR (Signal-to-Noise Ratio): {snr:.2f} dB")
         print(f"PSNR (Peak Signal-to-Noise Ratio): {psnr:.2f} dB")
+
+    metrics = calculate_metrics(original_file, modified_file)
+    if metrics is not None:
+        print(f"MSE: {metrics.mse:.4f}")
+        print(f"Segmental SNR: {metrics.segmental_snr:.2f} dB")
+        print(f"Max abs error: {metrics.max_abs_error:.0f}")
+        for i, channel in enumerate(metrics.channels):
+            print(f"Channel {i}: SNR {channel.snr:.2f} dB, PSNR {channel.psnr:.2f} dB, "
+                  f"segmental SNR {channel.segmental_snr:.2f} dB, max abs error {channel.max_abs_error:.0f}")
@@ -0,0 +1,321 @@
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from steganography.capacity import parse_param
+from steganography.streaming import DEFAULT_BLOCK_FRAMES
+
+
+def _embed_lsb(carrier, message, output, block_frames=None, **params):
+    from steganography.lsb_message import embed_message
+    # LSB sửa trực tiếp bản sao qua np.memmap, không cần xử lý theo luồng
+    return embed_message(carrier, output, message, **params)
+
+
+def _extract_lsb(stego, block_frames=None, **params):
+    from steganography.lsb_message import extract_message
+    return extract_message(stego, **params)
+
+
+def _embed_hide_stegano(carrier, message, output, block_frames=None, **params):
+    from steganography.hide_stegano import embed_text
+    return embed_text(carrier, message, output, **params)
+
+
+def _extract_hide_stegano(stego, block_frames=None, **params):
+    from steganography.hide_stegano import extract_text
+    return extract_text(stego, **params)
+
+
+def _embed_echo(carrier, message, output, block_frames=None, **params):
+    from steganography.echo import embed_echo
+    return embed_echo(carrier, message, output, block_frames, **params)
+
+
+def _extract_echo(stego, block_frames=None, **params):
+    from steganography.echo import extract_echo
+    return extract_echo(stego, **params)
+
+
+def _embed_phase(carrier, message, output, block_frames=None, **params):
+    from steganography.phase import embed_phase
+    return embed_phase(carrier, message, output, block_frames, **params)
+
+
+def _extract_phase(stego, block_frames=None, **params):
+    from steganography.phase import extract_phase
+    return extract_phase(stego, **params)
+
+
+def _embed_spread(carrier, message, output, block_frames=None, **params):
+    from steganography.spread import embed_spread
+    # Chế độ sync: tin nhắn tự mô tả độ dài nên trích xuất không cần thông tin ngoài
+    return embed_spread(carrier, message, output, block_frames, sync=True, **params)
+
+
+def _extract_spread(stego, block_frames=None, **params):
+    from steganography.spread import extract_spread_sync
+    return extract_spread_sync(stego, **params)[0]
+
+
+# Kỹ thuật -> (hàm giấu, hàm trích xuất); các hàm ném ngoại lệ khi lỗi
+TECHNIQUES = {
+    'lsb': (_embed_lsb, _extract_lsb),
+    'hide_stegano': (_embed_hide_stegano, _extract_hide_stegano),
+    'echo': (_embed_echo, _extract_echo),
+    'phase': (_embed_phase, _extract_phase),
+    'spread': (_embed_spread, _extract_spread),
+}
+
+
+def run_job(job):
+    """
+    Chạy một tác vụ (giấu hoặc trích xuất một file) trong tiến trình con.
+
+    Mọi lỗi của tác vụ được bắt lại và trả về trong kết quả, nên một file hỏng không
+    ảnh hưởng đến các file khác.
+    """
+    start = time.perf_counter()
+    result = {'key': job['key'], 'input': job['input'], 'output': job['output']}
+    try:
+        embed, extract = TECHNIQUES[job['technique']]
+        if job['mode'] == 'embed':
+            with open(job['payload'], 'r', encoding='utf-8') as f:
+                message = f.read()
+            embed(job['input'], message, job['output'], job['block_frames'], **job['params'])
+        else:
+            message = extract(job['input'], job['block_frames'], **job['params'])
+            with open(job['output'], 'w', encoding='utf-8') as f:
+                f.write(message)
+        result.update(status='ok', bytes=os.path.getsize(job['input']))
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}")
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _job_key(mode, technique, input_path, output_path):
+    return f"{mode}:{technique}:{os.path.abspath(input_path)}->{os.path.abspath(output_path)}"
+
+
+def read_manifest(path):
+    """
+    Đọc manifest CSV (có dòng tiêu đề) hoặc JSON Lines với các cột `input`, `output`
+    và `payload` (file văn bản cần giấu, chỉ dùng khi giấu). Trả về iterator các dict.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def scan_directory(input_dir, output_dir, mode, payload=None, payload_dir=None):
+    """
+    Sinh các cặp (input, output, payload) cho mọi file .wav trong `input_dir` (kể cả thư
+    mục con). Khi giấu, payload là file `payload` chung hoặc file <tên>.txt trong
+    `payload_dir`; khi trích xuất, kết quả được ghi ra <tên>.txt trong `output_dir`.
+    """
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.lower().endswith('.wav'):
+                continue
+            input_path = os.path.join(root, name)
+            relative = os.path.relpath(input_path, input_dir)
+            stem = os.path.splitext(relative)[0]
+            if mode == 'embed':
+                yield {
+                    'input': input_path,
+                    'output': os.path.join(output_dir, relative),
+                    'payload': payload or os.path.join(payload_dir, stem + '.txt'),
+                }
+            else:
+                yield {'input': input_path, 'output': os.path.join(output_dir, stem + '.txt')}
+
+
+def load_state(state_path):
+    """Đọc nhật ký tiến độ (JSON Lines); trả về tập khóa của các tác vụ đã thành công."""
+    done = set()
+    if state_path and os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Dòng cuối có thể bị cắt dở nếu lần chạy trước bị dừng đột ngột
+                    continue
+                if entry.get('status') == 'ok':
+                    done.add(entry['key'])
+    return done
+
+
+def run_batch(entries, technique, mode='embed', params=None, workers=None, max_in_flight=None,
+              block_frames=DEFAULT_BLOCK_FRAMES, state_path=None):
+    """
+    Chạy giấu hoặc trích xuất tin trên nhiều file bằng ProcessPoolExecutor.
+
+    `entries` là iterable các dict {'input', 'output', 'payload'} (ví dụ từ read_manifest
+    hoặc scan_directory), được đọc dần nên danh sách có thể rất lớn. Số tác vụ đang
+    chạy hoặc chờ không vượt quá `max_in_flight` (mặc định 2 * workers). Mỗi kết quả
+    được ghi ngay vào nhật ký `state_path`; khi chạy lại, các tác vụ đã thành công
+    được bỏ qua. Nếu một tiến trình con bị dừng đột ngột, các tác vụ bị mất theo nó
+    được chạy lại một lần, từng tác vụ riêng lẻ, trên pool mới. Trả về dict tổng kết.
+    """
+    if technique not in TECHNIQUES:
+        raise ValueError(f"Không hỗ trợ kỹ thuật '{technique}'.")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    done = load_state(state_path)
+
+    summary = {'technique': technique, 'mode': mode, 'ok': 0, 'error': 0, 'skipped': 0,
+               'bytes': 0, 'job_seconds': 0.0, 'errors': []}
+    started = time.perf_counter()
+
+    def jobs():
+        for entry in entries:
+            key = _job_key(mode, technique, entry['input'], entry['output'])
+            if key in done:
+                summary['skipped'] += 1
+                continue
+            os.makedirs(os.path.dirname(os.path.abspath(entry['output'])), exist_ok=True)
+            yield {'key': key, 'mode': mode, 'technique': technique, 'input': entry['input'],
+                   'output': entry['output'], 'payload': entry.get('payload'),
+                   'block_frames': block_frames, 'params': params or {}}
+
+    state = open(state_path, 'a', encoding='utf-8') if state_path else None
+    if state and state.tell():
+        # Dòng cuối bị cắt dở (lần chạy trước bị dừng đột ngột) không được nối với kết quả mới
+        with open(state_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                state.write('\n')
+
+    def record(result):
+        summary[result['status']] += 1
+        summary['job_seconds'] += result['seconds']
+        if result['status'] == 'ok':
+            summary['bytes'] += result['bytes']
+        else:
+            summary['errors'].append({'input': result['input'], 'error': result['error']})
+            print(f"❌ {result['input']}: {result['error']}")
+        if state:
+            state.write(json.dumps(result, ensure_ascii=False) + '\n')
+            state.flush()
+        finished = summary['ok'] + summary['error']
+        if finished % 100 == 0:
+            print(f"⏳ Đã xử lý {finished} file ({summary['error']} lỗi, {summary['skipped']} bỏ qua)")
+
+    retry = deque()
+    requeued = set()
+
+    def lost(job, error):
+        # Tác vụ bị mất khi pool hỏng được chạy lại một lần, riêng một mình trên pool để
+        # tác vụ gây hỏng pool không kéo theo tác vụ khác; nếu lại bị mất thì ghi lỗi
+        if job['key'] in requeued:
+            record({'key': job['key'], 'input': job['input'], 'output': job['output'],
+                    'status': 'error', 'error': f"BrokenProcessPool: {error}", 'seconds': 0.0})
+        else:
+            requeued.add(job['key'])
+            retry.append(job)
+
+    try:
+        pending_jobs = jobs()
+        executor = ProcessPoolExecutor(max_workers=workers)
+        in_flight = {}
+        exhausted = False
+        while in_flight or retry or not exhausted:
+            # Giữ số tác vụ đang chờ trong giới hạn để bộ nhớ không tăng theo số file
+            while len(in_flight) < max_in_flight:
+                if retry:
+                    if not in_flight:
+                        job = retry.popleft()
+                        in_flight[executor.submit(run_job, job)] = job
+                    break
+                if exhausted:
+                    break
+                job = next(pending_jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                in_flight[executor.submit(run_job, job)] = job
+            if not in_flight:
+                break
+
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = None
+            for future in completed:
+                job = in_flight.pop(future)
+                try:
+                    record(future.result())
+                except BrokenProcessPool as e:
+                    broken = e
+                    lost(job, e)
+            if broken is None:
+                continue
+
+            # Một tiến trình con bị dừng đột ngột (ví dụ hết bộ nhớ): các tác vụ còn lại
+            # đều kết thúc ngay; tác vụ đã xong trước đó vẫn giữ kết quả, chỉ các tác vụ
+            # thực sự bị mất mới được chạy lại trên pool mới
+            wait(in_flight)
+            for future, job in in_flight.items():
+                try:
+                    record(future.result())
+                except BrokenProcessPool as e:
+                    lost(job, e)
+            in_flight.clear()
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = ProcessPoolExecutor(max_workers=workers)
+        executor.shutdown()
+    finally:
+        if state:
+            state.close()
+
+    summary['wall_seconds'] = time.perf_counter() - started
+    summary['files_per_s'] = (summary['ok'] + summary['error']) / max(summary['wall_seconds'], 1e-12)
+    summary['mb_per_s'] = summary['bytes'] / (1 << 20) / max(summary['wall_seconds'], 1e-12)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Giấu hoặc trích xuất tin trên hàng loạt file WAV.")
+    parser.add_argument('mode', choices=['embed', 'extract'])
+    parser.add_argument('technique', choices=list(TECHNIQUES))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--manifest', help="File CSV/JSONL với các cột input, output, payload")
+    source.add_argument('--input-dir', help="Thư mục chứa các file WAV đầu vào")
+    parser.add_argument('--output-dir', help="Thư mục kết quả (dùng với --input-dir)")
+    parser.add_argument('--payload', help="File văn bản giấu chung cho mọi file (dùng với --input-dir)")
+    parser.add_argument('--payload-dir', help="Thư mục chứa <tên>.txt cho từng file (dùng với --input-dir)")
+    parser.add_argument('--param', action='append', default=[], type=parse_param,
+                        help="Tham số của kỹ thuật, dạng tên=giá_trị (ví dụ k=2, chip_size=500)")
+    parser.add_argument('--workers', type=int, default=None, help="Số tiến trình (mặc định: số CPU)")
+    parser.add_argument('--max-in-flight', type=int, default=None, help="Số tác vụ chờ tối đa")
+    parser.add_argument('--block-frames', type=int, default=DEFAULT_BLOCK_FRAMES,
+                        help="Kích thước khối khi xử lý theo luồng, 0 để đọc toàn bộ file")
+    parser.add_argument('--state', default='batch_state.jsonl', help="Nhật ký tiến độ để chạy tiếp")
+    parser.add_argument('--report', default='batch_report.json', help="File JSON tổng kết")
+    args = parser.parse_args()
+
+    if args.manifest:
+        entries = read_manifest(args.manifest)
+    else:
+        if not args.output_dir or (args.mode == 'embed' and not (args.payload or args.payload_dir)):
+            parser.error("--input-dir cần --output-dir, và --payload hoặc --payload-dir khi giấu tin.")
+        entries = scan_directory(args.input_dir, args.output_dir, args.mode, args.payload, args.payload_dir)
+
+    summary = run_batch(entries, args.technique, args.mode, dict(args.param), args.workers,
+                        args.max_in_flight, args.block_frames or None, args.state)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ Thành công: {summary['ok']}, ❌ lỗi: {summary['error']}, ⏭️ bỏ qua: {summary['skipped']}")
+    print(f"⏱️  {summary['wall_seconds']:.1f}s, {summary['files_per_s']:.1f} file/s, {summary['mb_per_s']:.1f} MB/s")
+    print(f"📄 Báo cáo: {args.report}")
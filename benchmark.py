@@ -0,0 +1,328 @@
+import argparse
+import contextlib
+import importlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Thời lượng (giây) của các file mang tin tổng hợp
+QUICK_DURATIONS = [1, 10, 60]
+FULL_DURATIONS = [1, 60, 600, 3600]
+
+# Tên file văn bản chứa tin nhắn trong thư mục làm việc (hide_stegano đọc tin từ file)
+MESSAGE_FILE = 'message.txt'
+
+
+def make_carrier(path, seconds, framerate=44100, channels=1, sampwidth=2, block_frames=1 << 18):
+    """
+    Ghi một file WAV tổng hợp (âm 440 Hz cộng 1% nhiễu) theo từng khối, nên tạo được
+    cả file dài một giờ với bộ nhớ cố định. Nhiễu giúp echo hiding giải được tin.
+    """
+    rng = np.random.default_rng(0)
+    n_frames = int(seconds * framerate)
+    full_scale = 127 if sampwidth == 1 else np.iinfo(np.int16).max
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(sampwidth)
+        out.setframerate(framerate)
+        for start in range(0, n_frames, block_frames):
+            t = np.arange(start, min(start + block_frames, n_frames)) / framerate
+            signal = 0.5 * np.sin(2 * np.pi * 440 * t)
+            signal = np.repeat(signal[:, None], channels, axis=1) + rng.normal(0, 0.005, (len(t), channels))
+            samples = np.round(signal * full_scale)
+            if sampwidth == 1:
+                samples = (samples + 128).astype(np.uint8)
+            else:
+                samples = samples.astype(np.int16)
+            out.writeframes(samples.tobytes())
+
+
+def _message_file(stego_path):
+    """File văn bản chứa tin nhắn cho hide_stegano, do run_benchmarks ghi một lần cho mỗi lần chạy."""
+    return os.path.join(os.path.dirname(stego_path), MESSAGE_FILE)
+
+
+def _lsb_steghide(op, carrier, stego, message, block_frames):
+    module = importlib.import_module('steganography.lsb_message')
+    if op == 'import':
+        return None
+    if op == 'embed':
+        return module.embed_message_in_audio(carrier, stego, message, block_frames=block_frames)
+    return module.extract_message_from_audio(stego)
+
+
+def _hide_stegano(bit_to_modify):
+    def run(op, carrier, stego, message, block_frames):
+        from steganography import hide_stegano
+        if op == 'import':
+            return None
+        if op == 'embed':
+            return hide_stegano.hide_text_in_audio(carrier, _message_file(stego), stego,
+                                                   bit_to_modify=bit_to_modify, block_frames=block_frames)
+        return hide_stegano.extract_text_from_audio(stego, bit_to_modify)
+    return run
+
+
+def _echo(op, carrier, stego, message, block_frames):
+    module = importlib.import_module('steganography.echo')
+    if op == 'import':
+        return None
+    if op == 'embed':
+        return module.hide_message_in_wav(carrier, message, stego, block_frames=block_frames)
+    return module.extract_message_echo_hiding(stego)
+
+
+def _phase(op, carrier, stego, message, block_frames):
+    module = importlib.import_module('steganography.phase')
+    if op == 'import':
+        return None
+    if op == 'embed':
+        return module.hide_message_phase_coding(carrier, message, stego, block_frames=block_frames)
+    return module.extract_message_phase_coding(stego)
+
+
+def _spread(op, carrier, stego, message, block_frames):
+    module = importlib.import_module('steganography.spread')
+    if op == 'import':
+        return None
+    if op == 'embed':
+        # Biên độ mặc định được chọn theo RMS của tín hiệu, gồm cả chi phí đo RMS
+        return module.spread_spectrum_embed(carrier, message, stego, block_frames=block_frames)
+    return module.spread_spectrum_extract(stego, len(module.binary_message(message)), block_frames=block_frames)
+
+
+# Tên kỹ thuật -> hàm chạy một thao tác ('embed', 'extract', hoặc 'import' để chỉ nạp module)
+TECHNIQUES = {
+    'lsb_steghide': _lsb_steghide,
+    'hide_stegano': _hide_stegano(0),      # hide_stegano.py và hide_stegano(version 2).py
+    'hide_stegano_v1': _hide_stegano(1),   # hide_stegano(version 1).py
+    'echo': _echo,
+    'phase': _phase,
+    'spread': _spread,
+}
+
+
+def _peak_rss_bytes():
+    """Bộ nhớ thường trú lớn nhất của tiến trình hiện tại (byte), None nếu không đo được."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run_op(technique, op, carrier, stego, message, block_frames, repeat):
+    """
+    Chạy một thao tác trong tiến trình con riêng để đo được bộ nhớ đỉnh của riêng nó.
+
+    Các hàm giấu tin in lỗi và trả về None thay vì ném ngoại lệ, nên lần giấu chỉ được
+    coi là thành công khi file kết quả được tạo ra; nếu không (ví dụ file quá ngắn để
+    chứa tin), trạng thái là 'skipped' và thời gian đo được không có ý nghĩa.
+    """
+    run = TECHNIQUES[technique]
+    output = io.StringIO()
+    # Nạp module trước khi đo để thời gian và bộ nhớ nền không tính vào kết quả
+    with contextlib.redirect_stdout(output):
+        run('import', carrier, stego, message, block_frames)
+        baseline_rss = _peak_rss_bytes()
+
+        best, result, produced = None, None, True
+        for _ in range(repeat):
+            if op == 'embed' and os.path.exists(stego):
+                os.remove(stego)
+            start = time.perf_counter()
+            result = run(op, carrier, stego, message, block_frames)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            if op == 'embed' and not os.path.exists(stego):
+                produced = False
+                break
+
+    if op == 'embed':
+        status = 'ok' if produced else 'skipped'
+    else:
+        status = 'ok' if result == message else 'failed'
+    errors = [line.strip() for line in output.getvalue().splitlines() if 'Lỗi' in line]
+    return {
+        'seconds': best if status != 'skipped' else None,
+        'peak_rss_bytes': _peak_rss_bytes(),
+        'baseline_rss_bytes': baseline_rss,
+        'status': status,
+        'error': errors[-1] if errors and status != 'ok' else None,
+    }
+
+
+def run_benchmarks(durations, channels=(1, 2), widths=(1, 2), rates=(44100, 48000), techniques=None,
+                   workdir='bench_carriers', message='Benchmark tiếng Việt ✓', stream=False, repeat=1):
+    """
+    Đo thời gian giấu và trích xuất của từng kỹ thuật trên mọi tổ hợp file tổng hợp.
+
+    Mỗi thao tác chạy trong một tiến trình con mới (spawn) để bộ nhớ đỉnh (peak RSS)
+    không bị ảnh hưởng bởi các lần chạy trước. Các file mang tin được giữ lại trong
+    `workdir` và dùng lại ở lần chạy sau. Với `stream=True`, các hàm được gọi với
+    block_frames mặc định (xử lý theo luồng). Trả về danh sách dict kết quả.
+    """
+    from steganography.streaming import DEFAULT_BLOCK_FRAMES
+
+    os.makedirs(workdir, exist_ok=True)
+    block_frames = DEFAULT_BLOCK_FRAMES if stream else None
+    context = multiprocessing.get_context('spawn')
+
+    results = []
+    message_file = os.path.join(workdir, MESSAGE_FILE)
+    with open(message_file, 'w', encoding='utf-8') as f:
+        f.write(message)
+    try:
+        for seconds, n_channels, sampwidth, framerate in itertools.product(durations, channels, widths, rates):
+            name = f'carrier_{seconds:g}s_{n_channels}ch_{sampwidth * 8}bit_{framerate}.wav'
+            carrier = os.path.join(workdir, name)
+            if not os.path.exists(carrier):
+                print(f"🎵 Tạo file mang tin {name}")
+                make_carrier(carrier, seconds, framerate, n_channels, sampwidth)
+            n_samples = int(seconds * framerate) * n_channels
+
+            for technique in techniques or TECHNIQUES:
+                stego = os.path.join(workdir, f'stego_{technique}_{name}')
+                embedded = False
+                for op in ('embed', 'extract'):
+                    if op == 'extract' and not embedded:
+                        # Không có file đã giấu tin để trích xuất
+                        measured = {'seconds': None, 'peak_rss_bytes': None, 'baseline_rss_bytes': None,
+                                    'status': 'skipped', 'error': "Bước giấu tin không thành công"}
+                    else:
+                        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                            measured = executor.submit(_run_op, technique, op, carrier, stego, message,
+                                                       block_frames, repeat).result()
+                        embedded = embedded or (op == 'embed' and measured['status'] == 'ok')
+                    timed = measured['seconds'] is not None
+                    results.append({
+                        'technique': technique,
+                        'op': op,
+                        'seconds_audio': seconds,
+                        'channels': n_channels,
+                        'sampwidth': sampwidth,
+                        'framerate': framerate,
+                        'stream': stream,
+                        'wall_seconds': measured['seconds'],
+                        'samples_per_s': n_samples / max(measured['seconds'], 1e-12) if timed else None,
+                        'peak_rss_mb': _mb(measured['peak_rss_bytes']),
+                        'rss_delta_mb': _mb(measured['peak_rss_bytes'], measured['baseline_rss_bytes']),
+                        'status': measured['status'],
+                        'ok': measured['status'] == 'ok',
+                        'error': measured['error'],
+                    })
+                    row = results[-1]
+                    if row['status'] == 'skipped':
+                        print(f"⏭️  {technique:16} {op:8} {name}: bỏ qua ({row['error']})")
+                        continue
+                    print(f"⏱️  {technique:16} {op:8} {name}: {row['wall_seconds']:.4f}s, "
+                          f"{row['samples_per_s'] / 1e6:.1f} M mẫu/s, peak RSS {row['peak_rss_mb']} MB"
+                          + (f", {'OK' if row['ok'] else 'SAI'}" if op == 'extract' else ''))
+                if os.path.exists(stego):
+                    os.remove(stego)
+    finally:
+        os.remove(message_file)
+    return results
+
+
+def _mb(value, baseline=0):
+    if value is None or baseline is None:
+        return None
+    return round((value - baseline) / (1 << 20), 2)
+
+
+def _case_key(row):
+    return (row['technique'], row['op'], row['seconds_audio'], row['channels'],
+            row['sampwidth'], row['framerate'], row['stream'])
+
+
+def _status(row):
+    # Kết quả của phiên bản cũ không có trường status
+    return row.get('status', 'ok' if row.get('ok') is not False else 'failed')
+
+
+def compare_results(current, baseline, threshold=1.2):
+    """
+    So sánh hai lần chạy theo từng trường hợp; trả về danh sách các trường hợp chậm hơn
+    `threshold` lần, hoặc thành công ở lần trước nhưng thất bại/bị bỏ qua ở lần này.
+    Thời gian chỉ được so sánh khi cả hai lần đều thành công ('ok').
+    """
+    previous = {_case_key(row): row for row in baseline}
+    regressions = []
+    for row in current:
+        old = previous.get(_case_key(row))
+        if old is None or _status(old) != 'ok':
+            continue
+        if _status(row) != 'ok':
+            regressions.append({'case': _case_key(row), 'ratio': None,
+                                'old_seconds': old['wall_seconds'], 'new_seconds': row['wall_seconds'],
+                                'ok': False})
+            continue
+        ratio = row['wall_seconds'] / max(old['wall_seconds'], 1e-12)
+        if ratio > threshold:
+            regressions.append({'case': _case_key(row), 'ratio': ratio,
+                                'old_seconds': old['wall_seconds'], 'new_seconds': row['wall_seconds'],
+                                'ok': row['ok']})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các kỹ thuật giấu tin trên file WAV tổng hợp.")
+    parser.add_argument('--durations', type=float, nargs='+', help="Thời lượng file (giây), mặc định 1 10 60")
+    parser.add_argument('--full', action='store_true', help="Dùng thời lượng 1 giây đến 1 giờ")
+    parser.add_argument('--channels', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--widths', type=int, nargs='+', default=[1, 2], help="Độ rộng mẫu (byte)")
+    parser.add_argument('--rates', type=int, nargs='+', default=[44100, 48000])
+    parser.add_argument('--techniques', nargs='+', choices=list(TECHNIQUES))
+    parser.add_argument('--stream', action='store_true', help="Gọi các hàm ở chế độ luồng (block_frames)")
+    parser.add_argument('--repeat', type=int, default=1, help="Số lần lặp, lấy thời gian nhỏ nhất")
+    parser.add_argument('--workdir', default='bench_carriers')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="File JSON của lần chạy trước để phát hiện hồi quy")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Tỉ lệ chậm hơn bị coi là hồi quy")
+    args = parser.parse_args()
+
+    durations = args.durations or (FULL_DURATIONS if args.full else QUICK_DURATIONS)
+    results = run_benchmarks(durations, args.channels, args.widths, args.rates, args.techniques,
+                             args.workdir, stream=args.stream, repeat=args.repeat)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ Đã ghi {len(results)} kết quả vào '{args.output}'")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare_results(results, json.load(f)['results'], args.threshold)
+        for regression in regressions:
+            if regression['ratio'] is None:
+                print(f"⚠️  Hồi quy {regression['case']}: lần trước thành công, lần này thất bại hoặc bị bỏ qua")
+                continue
+            print(f"⚠️  Hồi quy {regression['case']}: {regression['old_seconds']:.4f}s -> "
+                  f"{regression['new_seconds']:.4f}s (x{regression['ratio']:.2f}), ok={regression['ok']}")
+        if regressions:
+            sys.exit(1)
+        print("✅ Không phát hiện hồi quy.")
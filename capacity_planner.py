@@ -0,0 +1,114 @@
+import argparse
+import codecs
+import csv
+import json
+import os
+
+from steganography.capacity import CarrierIndex, parse_param
+
+
+def _utf8_size(path, chunk_size=1 << 20):
+    """
+    Trả về kích thước (byte) của file nếu nội dung là văn bản UTF-8 hợp lệ, ngược lại None.
+
+    batch.py đọc payload dưới dạng văn bản UTF-8 nên file nhị phân không giấu được;
+    file được giải mã theo từng đoạn để không phải nạp toàn bộ vào bộ nhớ.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    size = 0
+    with open(path, 'rb') as f:
+        try:
+            while chunk := f.read(chunk_size):
+                decoder.decode(chunk)
+                size += len(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return None
+    return size
+
+
+def text_payloads(payload_dir):
+    """
+    Liệt kê các file payload trong `payload_dir` mà batch.py đọc được.
+
+    Trả về bộ (sizes, skipped): `sizes` là dict {tên file: số byte} của các file văn bản
+    UTF-8, `skipped` là danh sách tên các file không phải UTF-8 (bị bỏ qua khi gán).
+    """
+    sizes, skipped = {}, []
+    for name in sorted(os.listdir(payload_dir)):
+        path = os.path.join(payload_dir, name)
+        if not os.path.isfile(path):
+            continue
+        size = _utf8_size(path)
+        if size is None:
+            skipped.append(name)
+        else:
+            sizes[name] = size
+    return sizes, skipped
+
+
+def write_manifest(assignment, payload_dir, output_dir, manifest_path):
+    """Ghi kết quả gán thành manifest CSV (input, output, payload) cho batch.py."""
+    with open(manifest_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['input', 'output', 'payload'])
+        writer.writeheader()
+        for name, carrier in sorted(assignment.items()):
+            if carrier is not None:
+                writer.writerow({'input': carrier,
+                                 'output': os.path.join(output_dir, os.path.splitext(name)[0] + '.wav'),
+                                 'payload': os.path.join(payload_dir, name)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lập kế hoạch dung lượng giấu tin từ tiêu đề các file WAV.")
+    parser.add_argument('--db', default='carriers.sqlite', help="File chỉ mục SQLite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index = commands.add_parser('index', help="Lập hoặc cập nhật chỉ mục cho các thư mục WAV")
+    index.add_argument('directories', nargs='+')
+    index.add_argument('--plans', help="File JSON dạng {kỹ thuật: {tham số: [giá trị, ...]}}")
+    index.add_argument('--prune', action='store_true', help="Xóa các file không còn tồn tại khỏi chỉ mục")
+
+    for name, help_text in (('find', "Liệt kê các file giấu được một payload"),
+                            ('assign', "Gán các file payload cho các file mang tin")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('technique')
+        command.add_argument('--param', action='append', default=[], type=parse_param,
+                             help="Tham số của kỹ thuật, dạng tên=giá_trị (ví dụ k=2)")
+    commands.choices['find'].add_argument('payload_bytes', type=int)
+    commands.choices['assign'].add_argument('payload_dir')
+    commands.choices['assign'].add_argument('--output-dir', default='stego', help="Thư mục kết quả trong manifest")
+    commands.choices['assign'].add_argument('--manifest', default='manifest.csv', help="Manifest CSV cho batch.py")
+    args = parser.parse_args()
+
+    plans = None
+    if getattr(args, 'plans', None):
+        with open(args.plans, encoding='utf-8') as f:
+            plans = json.load(f)
+
+    with CarrierIndex(args.db, plans) as carriers:
+        if args.command == 'index':
+            for directory in args.directories:
+                counts = carriers.scan(directory)
+                print(f"📁 {directory}: {counts['added']} file mới/đã đổi, "
+                      f"{counts['unchanged']} không đổi, {counts['invalid']} không hợp lệ")
+            if args.prune:
+                print(f"🗑️  Đã xóa {carriers.prune()} file không còn tồn tại")
+
+        elif args.command == 'find':
+            matches = carriers.find(args.technique, args.payload_bytes, **dict(args.param))
+            for path, bits in matches:
+                print(f"{bits // 8:>12} byte  {path}")
+            print(f"✅ {len(matches)} file đủ dung lượng")
+
+        else:
+            sizes, skipped = text_payloads(args.payload_dir)
+            for name in skipped:
+                print(f"⚠️  Bỏ qua {name}: không phải văn bản UTF-8 (batch.py chỉ giấu được văn bản)")
+            assignment = carriers.assign(sizes, args.technique, **dict(args.param))
+            write_manifest(assignment, args.payload_dir, args.output_dir, args.manifest)
+            unassigned = sorted(name for name, carrier in assignment.items() if carrier is None)
+            for name in unassigned:
+                print(f"❌ Không có file mang tin đủ dung lượng cho {name} ({sizes[name]} byte)")
+            print(f"✅ Đã gán {len(assignment) - len(unassigned)}/{len(assignment)} payload, "
+                  f"manifest: '{args.manifest}'")
@@ -1,37 +1,20 @@
-import os
-from Cryptodome.Cipher import AES
-from Cryptodome.Util.Padding import pad, unpad
+from steganography import aes
 
 # Hàm giải mã file
-def decrypt_file(encrypted_file_path, key):
+def decrypt_file(encrypted_file_path, key, output=None):
     """
-    Giải mã một tệp tin đã được mã hóa bằng AES.
+    Giải mã một tệp tin đã được mã hóa bằng AES (theo từng đoạn, bộ nhớ cố định).
 
     Args:
         encrypted_file_path (str): Đường dẫn đến tệp tin đã mã hóa.
         key (bytes): Khóa mã hóa (độ dài 32 byte).
+        output (str hoặc stream, tùy chọn): Nơi ghi kết quả; mặc định đổi '.enc' thành '.dec'.
 
     Returns:
-        str: Đường dẫn đến tệp tin đã giải mã.
+        str: Đường dẫn đến tệp tin đã giải mã (hoặc stream `output`).
     """
     try:
-        # Đọc IV(intial vector) và dữ liệu đã mã hóa
-        with open(encrypted_file_path, 'rb') as f:
-            iv = f.read(AES.block_size)
-            encrypted_data = f.read()
-
-        # Tạo đối tượng cipher AES
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        
-        # Giải mã dữ liệu và xóa padding
-        decrypted_data = unpad(cipher.decrypt(encrypted_data), AES.block_size)
-        
-        # Ghi dữ liệu đã giải mã ra file mới
-        decrypted_file_path = encrypted_file_path.replace('.enc', '.dec')
-        with open(decrypted_file_path, 'wb') as f:
-            f.write(decrypted_data)
-        
-        return decrypted_file_path
+        return aes.decrypt_file(encrypted_file_path, key, output)
     except FileNotFoundError:
         print(f"Lỗi: Không tìm thấy tệp tin {encrypted_file_path}.")
         return None
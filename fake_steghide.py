@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Chương trình giả lập steghide để chạy thử khi chưa cài steghide thật.
+
+Hỗ trợ các lệnh mà gói steganography dùng:
+    embed -cf <cover.wav> -ef <secret> -sf <stego.wav> -p <mật khẩu> [-f] [-q]
+    extract -sf <stego.wav> -p <mật khẩu> -xf <output> [-f] [-q]
+
+Dữ liệu được giấu vào bit thứ hai của các byte cuối chunk 'data' (không mã hóa), nên
+lớp LSB giấu ở bit thấp nhất của các byte đầu file không làm hỏng nó. Thông báo lỗi
+và mã thoát giống steghide. Dùng bằng cách đặt biến môi trường
+STEGHIDE="python fake_steghide.py". Các biến môi trường để thử tình huống đặc biệt:
+    FAKE_STEGHIDE_DELAY  số giây chờ trước khi xử lý (thử đồng thời, hết giờ)
+    FAKE_STEGHIDE_FAIL   mã thoát khác 0 để luôn báo lỗi
+"""
+import hashlib
+import os
+import struct
+import sys
+import time
+import wave
+
+MAGIC = b'FSTG'
+BIT = 1
+
+
+def fail(message, code=1):
+    sys.stderr.write(f"steghide: {message}\n")
+    sys.exit(code)
+
+
+def read_wav(path):
+    try:
+        with wave.open(path, 'rb') as audio:
+            return audio.getparams(), bytearray(audio.readframes(audio.getnframes()))
+    except FileNotFoundError:
+        fail(f'could not open the file "{path}".')
+    except (wave.Error, EOFError):
+        fail(f'the file format of the file "{path}" is not supported.')
+
+
+def write_wav(path, params, frames):
+    with wave.open(path, 'wb') as audio:
+        audio.setparams(params)
+        audio.writeframes(bytes(frames))
+
+
+def _positions(frames, n_bits):
+    # Các byte cuối của dữ liệu âm thanh, tính ngược từ cuối
+    return range(len(frames) - 1, len(frames) - 1 - n_bits, -1)
+
+
+def embed(cover, secret, stego, password):
+    params, frames = read_wav(cover)
+    try:
+        with open(secret, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        fail(f'could not open the file "{secret}".')
+
+    record = MAGIC + hashlib.sha256(password.encode('utf-8')).digest()[:8] + struct.pack('>I', len(data)) + data
+    n_bits = len(record) * 8
+    if n_bits > len(frames):
+        fail("the cover file is too short to embed the data.")
+    for i, position in enumerate(_positions(frames, n_bits)):
+        bit = (record[i // 8] >> (7 - i % 8)) & 1
+        frames[position] = (frames[position] & ~(1 << BIT) & 0xFF) | (bit << BIT)
+    write_wav(stego, params, frames)
+
+
+def _read_bytes(frames, start, count):
+    positions = list(_positions(frames, (start + count) * 8))[start * 8:]
+    out = bytearray(count)
+    for i, position in enumerate(positions):
+        out[i // 8] |= ((frames[position] >> BIT) & 1) << (7 - i % 8)
+    return bytes(out)
+
+
+def extract(stego, password, output):
+    _, frames = read_wav(stego)
+    header_size = len(MAGIC) + 8 + 4
+    if len(frames) < header_size * 8:
+        fail("could not extract any data with that passphrase!")
+    header = _read_bytes(frames, 0, header_size)
+    digest = hashlib.sha256(password.encode('utf-8')).digest()[:8]
+    if header[:4] != MAGIC or header[4:12] != digest:
+        fail("could not extract any data with that passphrase!")
+    length, = struct.unpack('>I', header[12:])
+    if (header_size + length) * 8 > len(frames):
+        fail("could not extract any data with that passphrase!")
+    with open(output, 'wb') as f:
+        f.write(_read_bytes(frames, header_size, length))
+
+
+def main(argv):
+    if not argv or argv[0] not in ('embed', 'extract'):
+        fail("unknown command, only 'embed' and 'extract' are supported by this stand-in.")
+    command, options, i = argv[0], {}, 1
+    while i < len(argv):
+        if argv[i] in ('-f', '-q'):
+            i += 1
+            continue
+        if i + 1 >= len(argv):
+            fail(f'the argument "{argv[i]}" is incomplete.')
+        options[argv[i]] = argv[i + 1]
+        i += 2
+
+    time.sleep(float(os.environ.get('FAKE_STEGHIDE_DELAY', 0)))
+    if int(os.environ.get('FAKE_STEGHIDE_FAIL', 0)):
+        fail("simulated failure.", int(os.environ['FAKE_STEGHIDE_FAIL']))
+
+    try:
+        if command == 'embed':
+            embed(options['-cf'], options['-ef'], options['-sf'], options['-p'])
+            if '-q' not in argv:
+                print(f'embedding "{options["-ef"]}" in "{options["-cf"]}"... done')
+        else:
+            extract(options['-sf'], options['-p'], options['-xf'])
+            if '-q' not in argv:
+                print(f'wrote extracted data to "{options["-xf"]}".')
+    except KeyError as e:
+        fail(f"missing argument {e.args[0]}.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,25 @@
+"""
+Các thành phần dùng chung cho những kỹ thuật giấu tin trong âm thanh.
+
+Các module con (lsb, lsb_message, hide_stegano, echo, phase, spread, steghide, aes, ...)
+không làm gì khi được import; scipy, Cryptodome và subprocess chỉ được nạp khi
+hàm cần đến chúng được gọi lần đầu. Bản thân gói không import module con nào:
+`steganography.echo`, `steganography.spread`, ... được nạp khi truy cập lần đầu.
+"""
+import importlib
+
+_SUBMODULES = {
+    'aes', 'capacity', 'echo', 'encrypted', 'hide_stegano', 'layers', 'lsb', 'lsb_message',
+    'metrics', 'payload', 'phase', 'pn', 'spread', 'steghide', 'steghide_async', 'streaming',
+    'wav_io',
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,319 @@
+# Cài đặt PyCryptodome: pip install pycryptodomex
+# Cryptodome chỉ được nạp khi mã hóa hoặc giải mã.
+import itertools
+import os
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Kích thước khối của AES (byte), cũng là độ dài IV ở đầu file đã mã hóa
+AES_BLOCK_SIZE = 16
+
+# Số byte đọc mỗi lần khi mã hóa/giải mã theo luồng (bội số của AES_BLOCK_SIZE)
+CHUNK_SIZE = 1 << 20
+
+# Định dạng chia đoạn AES-GCM: tiêu đề gồm magic, phiên bản, kích thước đoạn và nonce
+# của file; theo sau là các đoạn, mỗi đoạn gồm bản mã và tag 16 byte
+GCM_MAGIC = b'SGCM'
+GCM_VERSION = 1
+GCM_HEADER = struct.Struct('>4sBI8s')
+GCM_TAG_SIZE = 16
+GCM_CHUNK_SIZE = 1 << 20
+
+
+def _iter_chunks(source, chunk_size):
+    """Duyệt `source` (file nhị phân có read() hoặc iterable các bytes) theo từng đoạn."""
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def _write(destination, data):
+    # Không dựa vào giá trị trả về của write(): một số stream trả về None
+    destination.write(data)
+    return len(data)
+
+
+def encrypt_stream(source, destination, key, chunk_size=CHUNK_SIZE):
+    """
+    Mã hóa AES-CBC theo luồng: đọc `source` (file nhị phân hoặc iterable các bytes)
+    và ghi IV rồi bản mã vào `destination` (đối tượng có write()).
+
+    Kết quả giống hệt encrypt_file (IV + bản mã có padding PKCS#7) nhưng bộ nhớ chỉ
+    phụ thuộc `chunk_size`. Trả về số byte đã ghi.
+    """
+    from Cryptodome.Cipher import AES
+    from Cryptodome.Util.Padding import pad
+
+    cipher = AES.new(key, AES.MODE_CBC)
+    written = _write(destination, cipher.iv)
+
+    # Phần dư chưa đủ một khối AES được giữ lại để ghép với đoạn sau
+    carry = b''
+    for chunk in _iter_chunks(source, chunk_size):
+        data = carry + chunk if carry else chunk
+        n = len(data) - len(data) % AES_BLOCK_SIZE
+        if n:
+            written += _write(destination, cipher.encrypt(memoryview(data)[:n]))
+        carry = bytes(data[n:])
+
+    # Chỉ khối cuối cùng được thêm padding
+    written += _write(destination, cipher.encrypt(pad(carry, AES_BLOCK_SIZE)))
+    return written
+
+
+def decrypt_stream(source, destination, key, chunk_size=CHUNK_SIZE):
+    """
+    Giải mã AES-CBC theo luồng dữ liệu có IV ở đầu (định dạng của encrypt_file).
+
+    `source` là file nhị phân hoặc iterable các bytes, bản rõ được ghi vào
+    `destination`. Khối cuối cùng được giữ lại đến hết dữ liệu để bỏ padding. Ném
+    ValueError nếu dữ liệu không hợp lệ hoặc sai khóa. Trả về số byte đã ghi.
+    """
+    from Cryptodome.Cipher import AES
+    from Cryptodome.Util.Padding import unpad
+
+    cipher = None
+    buffer = bytearray()
+    pending = b''
+    written = 0
+    for chunk in _iter_chunks(source, chunk_size):
+        buffer += chunk
+        if cipher is None:
+            if len(buffer) < AES_BLOCK_SIZE:
+                continue
+            cipher = AES.new(key, AES.MODE_CBC, bytes(buffer[:AES_BLOCK_SIZE]))
+            del buffer[:AES_BLOCK_SIZE]
+
+        n = len(buffer) - len(buffer) % AES_BLOCK_SIZE
+        if n:
+            plaintext = cipher.decrypt(buffer[:n])
+            del buffer[:n]
+            # Khối cuối cùng có thể chứa padding nên chưa ghi ngay
+            if pending:
+                written += _write(destination, pending)
+            written += _write(destination, memoryview(plaintext)[:-AES_BLOCK_SIZE])
+            pending = plaintext[-AES_BLOCK_SIZE:]
+
+    if cipher is None or buffer or not pending:
+        raise ValueError("Dữ liệu mã hóa không hợp lệ: độ dài phải là bội số của kích thước khối AES.")
+    written += _write(destination, unpad(pending, AES_BLOCK_SIZE))
+    return written
+
+
+def _to_file(output, transform):
+    """
+    Ghi ra `output` (đường dẫn hoặc stream). Với đường dẫn, kết quả được ghi vào file
+    tạm rồi đổi tên, nên không có file dở dang khi lỗi và `output` có thể trùng file đầu vào.
+    """
+    if hasattr(output, 'write'):
+        transform(output)
+        return output
+    temporary = output + '.tmp'
+    try:
+        with open(temporary, 'wb') as f:
+            transform(f)
+        os.replace(temporary, output)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return output
+
+
+# Hàm mã hóa file
+def encrypt_file(file_path, key, output=None, chunk_size=CHUNK_SIZE):
+    """
+    Mã hóa file bằng AES-CBC theo từng đoạn `chunk_size` byte.
+
+    `output` là đường dẫn hoặc stream nhận kết quả; mặc định ghi ra file_path + '.enc'.
+    Trả về `output` (hoặc đường dẫn mặc định).
+    """
+    if output is None:
+        output = file_path + '.enc'
+    with open(file_path, 'rb') as f:
+        return _to_file(output, lambda destination: encrypt_stream(f, destination, key, chunk_size))
+
+
+# Hàm giải mã file
+def decrypt_file(encrypted_file_path, key, output=None, chunk_size=CHUNK_SIZE):
+    """
+    Giải mã file đã mã hóa bằng encrypt_file (IV ở đầu file) theo từng đoạn.
+
+    `output` là đường dẫn hoặc stream nhận kết quả; mặc định đổi '.enc' thành '.dec'
+    trong đường dẫn. Trả về `output` (hoặc đường dẫn mặc định).
+    """
+    if output is None:
+        output = encrypted_file_path.replace('.enc', '.dec')
+    with open(encrypted_file_path, 'rb') as f:
+        return _to_file(output, lambda destination: decrypt_stream(f, destination, key, chunk_size))
+
+
+def _exact_chunks(source, size):
+    """Chia lại `source` thành các đoạn đúng `size` byte (trừ đoạn cuối), kèm cờ đoạn cuối."""
+    buffer = bytearray()
+    previous = None
+    for chunk in _iter_chunks(source, size):
+        buffer += chunk
+        while len(buffer) >= size:
+            if previous is not None:
+                yield previous, False
+            previous = bytes(buffer[:size])
+            del buffer[:size]
+    if buffer or previous is None:
+        if previous is not None:
+            yield previous, False
+        yield bytes(buffer), True
+    else:
+        yield previous, True
+
+
+def _ordered_map(function, items, workers):
+    """
+    Chạy `function(*item)` trên thread pool và trả kết quả theo đúng thứ tự.
+
+    Chỉ tối đa 2 * workers đoạn được giữ trong bộ nhớ cùng lúc. Cryptodome nhả GIL
+    khi mã hóa nên các thread chạy song song thật sự trên nhiều lõi.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        window = deque()
+        for item in items:
+            window.append(executor.submit(function, *item))
+            if len(window) >= 2 * workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def _chunk_cipher(key, header, index, last):
+    from Cryptodome.Cipher import AES
+
+    # Nonce 12 byte của đoạn = nonce của file (8 byte) + chỉ số đoạn (4 byte). Tiêu đề và
+    # cờ đoạn cuối được xác thực cùng bản mã, nên không thể sửa tiêu đề, đổi thứ tự hay
+    # cắt bớt đoạn mà không bị phát hiện.
+    file_nonce = GCM_HEADER.unpack(header)[3]
+    cipher = AES.new(key, AES.MODE_GCM, nonce=file_nonce + struct.pack('>I', index))
+    cipher.update(header + (b'\x01' if last else b'\x00'))
+    return cipher
+
+
+def _seal_chunk(key, header, index, data, last):
+    ciphertext, tag = _chunk_cipher(key, header, index, last).encrypt_and_digest(data)
+    return ciphertext + tag
+
+
+def _open_chunk(key, header, index, sealed, last):
+    if len(sealed) < GCM_TAG_SIZE:
+        raise ValueError(f"Đoạn {index} bị cắt cụt.")
+    try:
+        return _chunk_cipher(key, header, index, last).decrypt_and_verify(
+            sealed[:-GCM_TAG_SIZE], sealed[-GCM_TAG_SIZE:])
+    except ValueError:
+        raise ValueError(f"Đoạn {index} bị hỏng hoặc đã bị sửa đổi (sai tag xác thực).") from None
+
+
+def _parse_gcm_header(header):
+    """Kiểm tra tiêu đề của định dạng AES-GCM chia đoạn; trả về kích thước đoạn."""
+    if len(header) < GCM_HEADER.size:
+        raise ValueError("Dữ liệu quá ngắn, không phải định dạng AES-GCM chia đoạn.")
+    magic, version, chunk_size, _ = GCM_HEADER.unpack(header)
+    if magic != GCM_MAGIC or version != GCM_VERSION or chunk_size == 0:
+        raise ValueError("Dữ liệu không phải định dạng AES-GCM chia đoạn.")
+    return chunk_size
+
+
+def gcm_encrypted_size(plaintext_size, chunk_size=GCM_CHUNK_SIZE):
+    """Kích thước (byte) của dữ liệu encrypt_chunked tạo ra từ `plaintext_size` byte bản rõ."""
+    n_chunks = max(1, -(-plaintext_size // chunk_size))
+    return GCM_HEADER.size + plaintext_size + n_chunks * GCM_TAG_SIZE
+
+
+def iter_encrypt_chunked(source, key, chunk_size=GCM_CHUNK_SIZE, workers=None):
+    """
+    Mã hóa xác thực `source` (file nhị phân hoặc iterable các bytes), sinh lần lượt
+    tiêu đề rồi từng đoạn đã mã hóa.
+
+    Dữ liệu được chia thành các đoạn `chunk_size` byte, mỗi đoạn được mã hóa bằng
+    AES-GCM với nonce riêng (nonce ngẫu nhiên của file + chỉ số đoạn), song song trên
+    `workers` thread (mặc định: số CPU).
+    """
+    header = GCM_HEADER.pack(GCM_MAGIC, GCM_VERSION, chunk_size, os.urandom(8))
+    yield header
+    items = ((key, header, index, data, last)
+             for index, (data, last) in enumerate(_exact_chunks(source, chunk_size)))
+    yield from _ordered_map(_seal_chunk, items, workers)
+
+
+def iter_decrypt_chunked(source, key, workers=None):
+    """
+    Giải mã dữ liệu của encrypt_chunked song song trên `workers` thread, sinh lần lượt
+    bản rõ của từng đoạn.
+
+    Ném ValueError cho biết đoạn đầu tiên bị hỏng, bị sửa đổi hoặc bị cắt bớt.
+    """
+    chunks = _iter_chunks(source, CHUNK_SIZE)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= GCM_HEADER.size:
+            break
+    header = bytes(head[:GCM_HEADER.size])
+    sealed_size = _parse_gcm_header(header) + GCM_TAG_SIZE
+
+    body = itertools.chain([head[GCM_HEADER.size:]], chunks)
+    items = ((key, header, index, sealed, last)
+             for index, (sealed, last) in enumerate(_exact_chunks(body, sealed_size)))
+    yield from _ordered_map(_open_chunk, items, workers)
+
+
+def encrypt_chunked(source, destination, key, chunk_size=GCM_CHUNK_SIZE, workers=None):
+    """Ghi kết quả của iter_encrypt_chunked vào `destination`; trả về số byte đã ghi."""
+    return sum(_write(destination, sealed) for sealed in iter_encrypt_chunked(source, key, chunk_size, workers))
+
+
+def decrypt_chunked(source, destination, key, workers=None):
+    """
+    Ghi kết quả của iter_decrypt_chunked vào `destination`; trả về số byte đã ghi.
+
+    Khi có đoạn bị hỏng, các đoạn đứng trước đã được ghi vào `destination`.
+    """
+    return sum(_write(destination, data) for data in iter_decrypt_chunked(source, key, workers))
+
+
+def decrypt_chunk(encrypted_file_path, key, index):
+    """
+    Giải mã riêng đoạn thứ `index` của file AES-GCM chia đoạn mà không đọc các đoạn khác.
+
+    Ném IndexError nếu không có đoạn này, ValueError nếu đoạn bị hỏng.
+    """
+    with open(encrypted_file_path, 'rb') as f:
+        header = f.read(GCM_HEADER.size)
+        sealed_size = _parse_gcm_header(header) + GCM_TAG_SIZE
+        body_size = os.fstat(f.fileno()).st_size - GCM_HEADER.size
+        n_chunks = max(1, -(-body_size // sealed_size))
+        if not 0 <= index < n_chunks:
+            raise IndexError(f"File chỉ có {n_chunks} đoạn.")
+        f.seek(GCM_HEADER.size + index * sealed_size)
+        return _open_chunk(key, header, index, f.read(sealed_size), index == n_chunks - 1)
+
+
+def encrypt_file_gcm(file_path, key, output=None, chunk_size=GCM_CHUNK_SIZE, workers=None):
+    """Như encrypt_file nhưng dùng định dạng AES-GCM chia đoạn; mặc định ghi ra file_path + '.gcm'."""
+    if output is None:
+        output = file_path + '.gcm'
+    with open(file_path, 'rb') as f:
+        return _to_file(output, lambda destination: encrypt_chunked(f, destination, key, chunk_size, workers))
+
+
+def decrypt_file_gcm(encrypted_file_path, key, output=None, workers=None):
+    """Giải mã file của encrypt_file_gcm; mặc định đổi '.gcm' thành '.dec' trong đường dẫn."""
+    if output is None:
+        output = encrypted_file_path.replace('.gcm', '.dec')
+    with open(encrypted_file_path, 'rb') as f:
+        return _to_file(output, lambda destination: decrypt_chunked(f, destination, key, workers))
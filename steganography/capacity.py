@@ -0,0 +1,272 @@
+import bisect
+import itertools
+import json
+import os
+import sqlite3
+import wave
+
+from .echo import resolve_delays, segment_length
+from .lsb import check_bit_range, resolve_k, sample_dtype
+from .payload import HEADER_BITS
+from .spread import SYNC_CHIPS
+from .wav_io import WavInfo, parse_wav_header, read_params
+
+# Các bộ tham số mặc định được tính sẵn khi lập chỉ mục: kỹ thuật -> {tham số: [giá trị, ...]}
+DEFAULT_PLANS = {
+    'lsb': {'k': [1, 2]},
+    'hide_stegano': {'k': [1, 2]},
+    'phase': {'block_size': [512]},
+    'echo': {'segment_len': [None]},
+    'spread': {'chip_size': [1000], 'sync': [False, True]},
+}
+
+
+# Các hàm tính dung lượng nhận thêm **_ để bỏ qua tham số chỉ dùng khi giấu
+# (amplitude, decay_rate, bit_to_modify, ...), nhờ đó dùng chung được một bộ tham số.
+
+def _lsb_capacity(info, k=1, **_):
+    # lsb_message: mỗi mẫu mang k bit
+    return info.nframes * info.nchannels * resolve_k(k, info.sampwidth) - HEADER_BITS
+
+
+def _hide_stegano_capacity(info, bit_to_modify=0, k=1, **_):
+    # hide_stegano: mỗi byte dữ liệu âm thanh mang k bit, bắt đầu từ bit_to_modify
+    k = resolve_k(k, info.sampwidth)
+    try:
+        check_bit_range(bit_to_modify, k, 8)
+    except ValueError:
+        return 0
+    return info.nframes * info.nchannels * info.sampwidth * k - HEADER_BITS
+
+
+def _phase_capacity(info, block_size=512, **_):
+    return info.nframes // block_size - HEADER_BITS
+
+
+def _echo_capacity(info, delay_0=None, delay_1=None, segment_len=None, **_):
+    delay_0, delay_1 = resolve_delays(info.framerate, delay_0, delay_1)
+    return info.nframes // segment_length(delay_0, delay_1, segment_len) - HEADER_BITS
+
+
+def _spread_capacity(info, chip_size=1000, sync=False, **_):
+    # Chế độ thường không có tiêu đề payload; chế độ sync có chuỗi đồng bộ và tiêu đề
+    if sync:
+        return (info.nframes - SYNC_CHIPS * chip_size) // chip_size - HEADER_BITS
+    return info.nframes // chip_size
+
+
+# Các kỹ thuật giấu theo từng byte nên dùng được mọi độ rộng mẫu (kể cả 24-bit);
+# các kỹ thuật còn lại đọc mẫu PCM và chỉ hỗ trợ các độ rộng có trong sample_dtype
+BYTE_TECHNIQUES = {'hide_stegano'}
+
+CAPACITY = {
+    'lsb': _lsb_capacity,
+    'hide_stegano': _hide_stegano_capacity,
+    'phase': _phase_capacity,
+    'echo': _echo_capacity,
+    'spread': _spread_capacity,
+}
+
+
+def capacity_bits(info, technique, **params):
+    """
+    Số bit tin nhắn (không gồm tiêu đề payload) giấu được trong file có tiêu đề `info`
+    (WavInfo hoặc kết quả của read_params) bằng `technique` với tham số `params`.
+
+    Chỉ dùng thông số trong tiêu đề nên không cần đọc dữ liệu âm thanh. Trả về 0 nếu
+    kỹ thuật không giấu được vào file này (độ rộng mẫu không hỗ trợ, hoặc vùng bit
+    bit_to_modify..bit_to_modify + k vượt quá một byte như bộ giấu tin kiểm tra).
+    """
+    if technique not in CAPACITY:
+        raise ValueError(f"Không hỗ trợ kỹ thuật '{technique}'.")
+    if technique not in BYTE_TECHNIQUES:
+        try:
+            sample_dtype(info.sampwidth)
+        except ValueError:
+            return 0
+    return max(0, CAPACITY[technique](info, **params))
+
+
+def file_capacity(path, technique, **params):
+    """Như capacity_bits nhưng đọc tiêu đề RIFF của file `path`."""
+    return capacity_bits(parse_wav_header(path), technique, **params)
+
+
+def parse_param(text):
+    """
+    Chuyển 'tên=giá_trị' thành (tên, giá trị); giá trị được đọc như JSON nếu được.
+    Dùng cho tùy chọn --param của batch.py và capacity_planner.py.
+    """
+    name, _, value = text.partition('=')
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def _plan_key(params):
+    """Chuỗi chuẩn hóa của bộ tham số, dùng làm khóa trong chỉ mục."""
+    return json.dumps(params, sort_keys=True)
+
+
+def expand_plans(plans):
+    """Sinh danh sách (kỹ thuật, dict tham số) từ tích Descartes của các giá trị."""
+    cells = []
+    for technique, params in plans.items():
+        names = list(params)
+        for values in itertools.product(*(params[name] for name in names)):
+            cells.append((technique, dict(zip(names, values))))
+    return cells
+
+
+class CarrierIndex:
+    """
+    Chỉ mục SQLite của các file mang tin và dung lượng của chúng theo từng kỹ thuật.
+
+    Mỗi file được nhận diện bằng (đường dẫn, kích thước, mtime); chỉ file mới hoặc
+    đã thay đổi mới bị đọc lại tiêu đề. Thông số tiêu đề được lưu lại nên dung
+    lượng cho một bộ tham số mới được tính mà không cần mở lại file nào.
+    """
+
+    def __init__(self, db_path='carriers.sqlite', plans=None):
+        self.plans = expand_plans(DEFAULT_PLANS if plans is None else plans)
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS carriers (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER,
+                nchannels INTEGER, sampwidth INTEGER, framerate INTEGER, nframes INTEGER);
+            CREATE TABLE IF NOT EXISTS capacities (
+                path TEXT, technique TEXT, params TEXT, bits INTEGER,
+                PRIMARY KEY (path, technique, params));
+            CREATE INDEX IF NOT EXISTS capacities_by_plan ON capacities (technique, params, bits);
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(self, paths):
+        """
+        Thêm hoặc cập nhật các file trong `paths` (iterable đường dẫn).
+
+        File có kích thước và mtime giống trong chỉ mục được bỏ qua mà không mở;
+        file không phải WAV PCM hợp lệ (hoặc module wave không mở được) bị loại khỏi
+        chỉ mục. Trả về dict số file 'added', 'unchanged' và 'invalid'.
+        """
+        counts = {'added': 0, 'unchanged': 0, 'invalid': 0}
+        with self.db:
+            for path in paths:
+                path = os.path.abspath(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    counts['invalid'] += 1
+                    continue
+                row = self.db.execute("SELECT size, mtime_ns FROM carriers WHERE path = ?", (path,)).fetchone()
+                if row == (stat.st_size, stat.st_mtime_ns):
+                    counts['unchanged'] += 1
+                    continue
+
+                self._forget(path)
+                try:
+                    info = parse_wav_header(path)
+                    # Các bộ giấu tin theo luồng đọc file bằng module wave; file mà wave không
+                    # mở được (ví dụ WAVE_FORMAT_EXTENSIBLE trước Python 3.12) không dùng được
+                    read_params(path)
+                except (OSError, ValueError, EOFError, wave.Error):
+                    counts['invalid'] += 1
+                    continue
+                self.db.execute("INSERT INTO carriers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (path, stat.st_size, stat.st_mtime_ns, info.nchannels,
+                                 info.sampwidth, info.framerate, info.nframes))
+                self.db.executemany("INSERT INTO capacities VALUES (?, ?, ?, ?)",
+                                    [(path, technique, _plan_key(params), capacity_bits(info, technique, **params))
+                                     for technique, params in self.plans])
+                counts['added'] += 1
+        return counts
+
+    def scan(self, directory):
+        """Cập nhật chỉ mục với mọi file .wav trong `directory` (kể cả thư mục con)."""
+        return self.update(os.path.join(root, name)
+                           for root, _, files in os.walk(directory)
+                           for name in files if name.lower().endswith('.wav'))
+
+    def prune(self):
+        """Xóa khỏi chỉ mục các file không còn tồn tại; trả về số file đã xóa."""
+        missing = [path for path, in self.db.execute("SELECT path FROM carriers") if not os.path.exists(path)]
+        with self.db:
+            for path in missing:
+                self._forget(path)
+        return len(missing)
+
+    def _forget(self, path):
+        self.db.execute("DELETE FROM carriers WHERE path = ?", (path,))
+        self.db.execute("DELETE FROM capacities WHERE path = ?", (path,))
+
+    def _ensure_plan(self, technique, params):
+        """Tính dung lượng cho bộ tham số chưa có trong chỉ mục từ thông số tiêu đề đã lưu."""
+        key = _plan_key(params)
+        rows = self.db.execute("""
+            SELECT path, nchannels, sampwidth, framerate, nframes FROM carriers
+            WHERE path NOT IN (SELECT path FROM capacities WHERE technique = ? AND params = ?)
+        """, (technique, key)).fetchall()
+        if not rows:
+            return key
+        with self.db:
+            self.db.executemany("INSERT INTO capacities VALUES (?, ?, ?, ?)", [
+                (path, technique, key, capacity_bits(
+                    WavInfo(nchannels, sampwidth, framerate, nframes, None, nframes * nchannels * sampwidth),
+                    technique, **params))
+                for path, nchannels, sampwidth, framerate, nframes in rows
+            ])
+        return key
+
+    def capacity(self, path, technique, **params):
+        """Dung lượng (bit) của một file đã có trong chỉ mục, None nếu chưa có."""
+        key = self._ensure_plan(technique, params)
+        row = self.db.execute("SELECT bits FROM capacities WHERE path = ? AND technique = ? AND params = ?",
+                              (os.path.abspath(path), technique, key)).fetchone()
+        return row[0] if row else None
+
+    def find(self, technique, payload_bytes, **params):
+        """
+        Trả về danh sách (đường dẫn, dung lượng bit) của các file giấu được
+        `payload_bytes` byte, sắp xếp theo dung lượng tăng dần.
+        """
+        key = self._ensure_plan(technique, params)
+        return self.db.execute("""
+            SELECT path, bits FROM capacities
+            WHERE technique = ? AND params = ? AND bits >= ? ORDER BY bits, path
+        """, (technique, key, payload_bytes * 8)).fetchall()
+
+    def assign(self, payload_sizes, technique, **params):
+        """
+        Gán mỗi payload cho một file mang tin riêng đủ dung lượng.
+
+        `payload_sizes` là dict {tên payload: số byte}. Payload lớn được gán trước,
+        mỗi payload nhận file nhỏ nhất còn trống giấu được nó (best-fit), để các
+        file lớn được dành cho payload lớn. Chỉ truy vấn chỉ mục một lần, không đọc
+        file âm thanh nào. Trả về dict {tên payload: đường dẫn hoặc None nếu không
+        còn file phù hợp}.
+        """
+        if not payload_sizes:
+            return {}
+        candidates = self.find(technique, min(payload_sizes.values()), **params)
+        capacities = [bits for _, bits in candidates]
+        paths = [path for path, _ in candidates]
+
+        assignment = {}
+        for name, size in sorted(payload_sizes.items(), key=lambda item: -item[1]):
+            i = bisect.bisect_left(capacities, size * 8)
+            if i == len(capacities):
+                assignment[name] = None
+                continue
+            assignment[name] = paths.pop(i)
+            del capacities[i]
+        return assignment
+
@@ -0,0 +1,226 @@
+from functools import partial
+
+import numpy as np
+
+from .lsb import bits_to_bytes, bytes_to_bits
+from .payload import HEADER_BITS, pack_payload, unpack_header, verify_payload
+from .streaming import stream_transform
+from .wav_io import map_data, parse_wav_header, read_params
+
+# Số mẫu tối thiểu cho mỗi bit để cepstrum giải được bit một cách tin cậy
+MIN_SEGMENT_LEN = 512
+
+def _echo_mixers(secret_bits, segment_len, start, n, ramp):
+    """
+    Tạo hai tín hiệu trộn (mixer_0, mixer_1) cho các mẫu [start, start + n).
+
+    mixer_1 bằng 1 trên các đoạn giấu bit '1', mixer_0 bằng 1 trên các đoạn giấu
+    bit '0', cả hai bằng 0 sau phần tin nhắn. Nếu `ramp` > 1, hai tín hiệu được làm
+    mượt bằng cửa sổ Hann dài `ramp` mẫu để tránh tiếng click ở ranh giới bit.
+    """
+    pad_before = ramp // 2 if ramp > 1 else 0
+    pad_after = ramp - 1 - pad_before if ramp > 1 else 0
+    lo, hi = start - pad_before, start + n + pad_after
+
+    mixer_1 = np.zeros(hi - lo, dtype=np.float32)
+    active = np.zeros(hi - lo, dtype=np.float32)
+    first_bit = max(lo, 0) // segment_len
+    last_bit = min(len(secret_bits), -(-hi // segment_len))
+    if last_bit > first_bit:
+        # Mỗi bit được lặp lại trên toàn bộ đoạn segment_len mẫu của nó
+        segment_bits = np.repeat(secret_bits[first_bit:last_bit].astype(np.float32), segment_len)
+        offset = first_bit * segment_len - lo
+        begin, end = max(offset, 0), min(offset + len(segment_bits), hi - lo)
+        mixer_1[begin:end] = segment_bits[begin - offset:end - offset]
+        active[begin:end] = 1
+
+    if ramp > 1:
+        # Bỏ hai điểm 0 ở hai đầu của cửa sổ Hann dài ramp + 2 để tổng luôn dương
+        # (np.hanning(2) bằng [0, 0])
+        window = np.hanning(ramp + 2)[1:-1].astype(np.float32)
+        window /= window.sum()
+        mixer_1 = np.convolve(mixer_1, window, mode='valid')
+        active = np.convolve(active, window, mode='valid')
+    return active - mixer_1, mixer_1
+
+def resolve_delays(framerate, delay_0=None, delay_1=None):
+    """Độ trễ (mẫu) của echo '0' và '1'; mặc định lần lượt 1 ms và 2 ms ở tần số `framerate`."""
+    if delay_0 is None:
+        delay_0 = int(framerate * 0.001)
+    if delay_1 is None:
+        delay_1 = int(framerate * 0.002)
+    return delay_0, delay_1
+
+def segment_length(delay_0, delay_1, segment_len=None):
+    """
+    Số mẫu dành cho mỗi bit; mặc định đủ dài để cepstrum phân biệt được hai độ trễ.
+    Ném ValueError nếu `segment_len` không lớn hơn độ trễ.
+    """
+    if segment_len is None:
+        segment_len = max(MIN_SEGMENT_LEN, max(delay_0, delay_1) * 2)
+    if segment_len <= max(delay_0, delay_1):
+        raise ValueError("Độ dài đoạn giấu bit phải lớn hơn độ trễ echo.")
+    return segment_len
+
+def echo_transform(secret_bits, delay_0, delay_1, decay_rate, segment_len, ramp=0):
+    """
+    Tạo hàm giấu echo cho các khối âm thanh liên tiếp (bắt đầu từ frame 0).
+
+    Tín hiệu được cộng với hai bản trễ của chính nó (delay_0 và delay_1), trộn
+    theo mixer của từng bit. Phần cuối của khối trước được giữ lại để bản trễ
+    liền mạch giữa các khối.
+    """
+    message_end = len(secret_bits) * segment_len + ramp
+    history = None
+
+    def transform(block, start):
+        nonlocal history
+        max_delay = max(delay_0, delay_1)
+        if history is None:
+            history = np.zeros((max_delay, *block.shape[1:]), dtype=block.dtype)
+        context = np.concatenate([history, block])
+        history = context[len(context) - max_delay:]
+
+        if start >= message_end:
+            return np.copy(block)
+
+        # Hai bản trễ của toàn bộ khối
+        echo_0 = context[max_delay - delay_0 : max_delay - delay_0 + len(block)]
+        echo_1 = context[max_delay - delay_1 : max_delay - delay_1 + len(block)]
+
+        mixer_0, mixer_1 = _echo_mixers(secret_bits, segment_len, start, len(block), ramp)
+        if block.ndim > 1:
+            mixer_0, mixer_1 = mixer_0[:, None], mixer_1[:, None]
+        return block + decay_rate * (mixer_0 * echo_0 + mixer_1 * echo_1)
+
+    return transform
+
+def _embed_echo_bits(carrier_file, secret_bits, output_file, block_frames,
+                     delay_0, delay_1, decay_rate, ramp, segment_len):
+    """Giấu mảng bit đã có tiêu đề payload bằng echo hiding; xem embed_echo."""
+    # Chỉ đọc tiêu đề để kiểm tra dung lượng trước khi nạp dữ liệu âm thanh
+    params = read_params(carrier_file)
+    sample_rate, n_frames = params.framerate, params.nframes
+
+    # Echo '0' (delay ngắn, 1ms) và Echo '1' (delay dài, 2ms)
+    delay_0, delay_1 = resolve_delays(sample_rate, delay_0, delay_1)
+    segment_len = segment_length(delay_0, delay_1, segment_len)
+
+    # Đảm bảo có đủ không gian để giấu
+    if len(secret_bits) * segment_len > n_frames:
+        raise ValueError("File âm thanh quá nhỏ để giấu tin nhắn này.")
+
+    make_transform = partial(echo_transform, secret_bits, delay_0, delay_1, decay_rate, segment_len, ramp)
+    if block_frames is not None:
+        stream_transform(carrier_file, output_file, make_transform, dtype=np.float32,
+                         block_frames=block_frames)
+        return len(secret_bits)
+
+    # Đọc file WAV và chuyển về kiểu float để dễ xử lý
+    from scipy.io import wavfile
+    sample_rate, data = wavfile.read(carrier_file)
+
+    # Giấu toàn bộ tin nhắn bằng vài phép toán trên cả mảng
+    stego_audio = make_transform()(data.astype(np.float32), 0)
+
+    # Chuẩn hóa lại dữ liệu và lưu
+    stego_audio_int16 = np.int16(stego_audio / np.max(np.abs(stego_audio)) * 32767)
+    wavfile.write(output_file, sample_rate, stego_audio_int16)
+    return len(secret_bits)
+
+def embed_echo(carrier_file, secret_message, output_file, block_frames=None,
+               delay_0=None, delay_1=None, decay_rate=0.5, ramp=0, segment_len=None, compress=True):
+    """
+    Giấu tin nhắn bằng echo hiding, không in ra màn hình.
+
+    Ném FileNotFoundError/ValueError khi lỗi (file không hợp lệ, độ trễ không hợp lệ,
+    không đủ dung lượng), để dùng trong các chương trình xử lý hàng loạt.
+    Trả về số bit đã giấu (gồm tiêu đề). Với `compress=True`, tin nhắn được nén
+    trước khi giấu nếu việc nén làm nó ngắn hơn.
+    """
+    # Mã hóa tiêu đề payload và tin nhắn (UTF-8, đã nén nếu có lợi) thành mảng bit
+    secret_bits = bytes_to_bits(pack_payload(secret_message.encode('utf-8'), compress=compress))
+    return _embed_echo_bits(carrier_file, secret_bits, output_file, block_frames,
+                            delay_0, delay_1, decay_rate, ramp, segment_len)
+
+def hide_message_in_wav(carrier_file, secret_message, output_file, block_frames=None,
+                        delay_0=None, delay_1=None, decay_rate=0.5, ramp=0, segment_len=None, compress=True):
+    """
+    Giấu một chuỗi tin nhắn vào file WAV bằng kỹ thuật echo hiding 
+
+    delay_0/delay_1 là độ trễ (số mẫu) của echo cho bit '0' và bit '1', mặc định
+    1ms và 2ms theo tần số lấy mẫu. `segment_len` là số mẫu cho mỗi bit (mặc định
+    max(512, 2 * độ trễ lớn nhất)). `ramp` là độ dài (mẫu) của đoạn chuyển tiếp
+    mượt giữa các bit, 0 để tắt.
+    Nếu `block_frames` được chỉ định, file được xử lý theo dạng luồng từng khối
+    (bộ nhớ không phụ thuộc độ dài file), cho kết quả giống hệt khi đọc toàn bộ.
+    """
+    secret_bits = bytes_to_bits(pack_payload(secret_message.encode('utf-8'), compress=compress))
+    print(f"Tin nhắn bí mật: {len(secret_bits)} bit (gồm tiêu đề)")
+    try:
+        _embed_echo_bits(carrier_file, secret_bits, output_file, block_frames,
+                         delay_0, delay_1, decay_rate, ramp, segment_len)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {carrier_file}")
+        return
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return
+    print(f"Đã giấu tin nhắn vào file: {output_file}")
+
+
+def decode_echo_bits(data, delay_0, delay_1, segment_len):
+    """
+    Giải các bit từ các đoạn liên tiếp của `data` bằng cepstrum thực.
+
+    Tất cả các đoạn được biến đổi trong một lần gọi rfft/irfft; bit là '1' nếu
+    đỉnh cepstrum tại delay_1 lớn hơn tại delay_0.
+    """
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    n_segments = len(data) // segment_len
+    segments = data[:n_segments * segment_len].astype(np.float64).reshape(n_segments, segment_len)
+
+    spectrum = np.fft.rfft(segments * np.hanning(segment_len), axis=1)
+    cepstrum = np.fft.irfft(np.log(np.abs(spectrum) + 1e-12), n=segment_len, axis=1)
+    return (cepstrum[:, delay_1] > cepstrum[:, delay_0]).astype(np.uint8)
+
+def extract_echo(stego_file, delay_0=None, delay_1=None, segment_len=None):
+    """
+    Trích xuất tin nhắn đã giấu bằng echo hiding, không in ra màn hình.
+
+    delay_0/delay_1/segment_len phải giống giá trị khi giấu. Chỉ các
+    đoạn chứa tiêu đề, sau đó đúng số đoạn chứa tin nhắn được đọc qua np.memmap.
+    Ném FileNotFoundError/ValueError khi lỗi.
+    """
+    info = parse_wav_header(stego_file)
+    data = map_data(stego_file, info=info)
+    if info.nchannels > 1:
+        data = data.reshape(-1, info.nchannels)
+
+    delay_0, delay_1 = resolve_delays(info.framerate, delay_0, delay_1)
+    segment_len = segment_length(delay_0, delay_1, segment_len)
+
+    header_bits = decode_echo_bits(data[:HEADER_BITS * segment_len], delay_0, delay_1, segment_len)
+    flags, length, crc = unpack_header(bits_to_bytes(header_bits))
+
+    total_bits = HEADER_BITS + length * 8
+    if total_bits * segment_len > len(data):
+        raise ValueError("Độ dài tin nhắn trong tiêu đề vượt quá dung lượng file âm thanh.")
+
+    message_bits = decode_echo_bits(data[HEADER_BITS * segment_len:total_bits * segment_len], delay_0, delay_1, segment_len)
+    return verify_payload(bits_to_bytes(message_bits), length, crc, flags).decode('utf-8', errors='replace')
+
+def extract_message_echo_hiding(stego_file, delay_0=None, delay_1=None, segment_len=None):
+    """Trích xuất tin nhắn từ file WAV đã giấu bằng echo hiding (xem extract_echo)."""
+    try:
+        message = extract_echo(stego_file, delay_0, delay_1, segment_len)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {stego_file}")
+        return None
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return None
+
+    print(f"Tin nhắn đã trích xuất: {message}")
+    return message
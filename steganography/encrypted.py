@@ -0,0 +1,103 @@
+import itertools
+import os
+
+import numpy as np
+
+from .aes import GCM_CHUNK_SIZE, gcm_encrypted_size, iter_decrypt_chunked, iter_encrypt_chunked
+from .lsb import bits_to_bytes, extract_bits, resolve_k, units_needed
+from .payload import FLAG_AES_GCM, HEADER_BITS, pack_header, unpack_header
+from .streaming import DEFAULT_BLOCK_FRAMES, stream_embed_bits
+from .wav_io import map_data, parse_wav_header
+
+# Số byte bản mã được trích xuất mỗi lần; chia hết cho 3 để 8 * n bit luôn là bội số
+# của mọi k từ 1 đến lsb.MAX_K (4), nên mỗi đoạn bắt đầu tại đầu một đơn vị mang tin
+EXTRACT_PIECE_BYTES = 3 << 18
+
+
+def _open_secret(secret):
+    """Trả về (nguồn dữ liệu, số byte, hàm đóng) cho bytes, đường dẫn hoặc file nhị phân."""
+    if isinstance(secret, (bytes, bytearray, memoryview)):
+        return [bytes(secret)], len(secret), lambda: None
+    if hasattr(secret, 'read'):
+        position = secret.tell()
+        size = secret.seek(0, os.SEEK_END) - position
+        secret.seek(position)
+        return secret, size, lambda: None
+    f = open(secret, 'rb')
+    return f, os.fstat(f.fileno()).st_size, f.close
+
+
+def embed_encrypted(audio_path, output_path, secret, key, k=1, bit=0, unit_dtype=None,
+                    block_frames=DEFAULT_BLOCK_FRAMES, chunk_size=GCM_CHUNK_SIZE, workers=None):
+    """
+    Mã hóa `secret` bằng AES-GCM chia đoạn và giấu bản mã vào file WAV bằng LSB, theo luồng.
+
+    `secret` là bytes, đường dẫn hoặc file nhị phân. Bản rõ được đọc dần vào bộ mã
+    hóa, bản mã được đưa thẳng vào bộ giấu bit (stream_embed_bits) dưới dạng
+    generator: không có file .enc trung gian, bộ nhớ chỉ phụ thuộc `chunk_size` và
+    `block_frames`. `unit_dtype=None` giấu vào mẫu như lsb_message, `np.uint8` giấu vào
+    từng byte như hide_stegano (khi đó `bit` là vị trí bit được sửa).
+
+    Ném ValueError nếu file không đủ dung lượng (kiểm tra từ tiêu đề, trước khi mã hóa).
+    Trả về số bit đã giấu.
+    """
+    info = parse_wav_header(audio_path)
+    k = resolve_k(k, info.sampwidth)
+    unit_size = np.dtype(unit_dtype).itemsize if unit_dtype is not None else info.sampwidth
+    n_units = info.data_size // unit_size
+
+    source, plaintext_size, close = _open_secret(secret)
+    try:
+        length = gcm_encrypted_size(plaintext_size, chunk_size)
+        if units_needed(HEADER_BITS + length * 8, k) > n_units:
+            raise ValueError("File âm thanh quá nhỏ để chứa dữ liệu đã mã hóa.")
+
+        payload = itertools.chain([pack_header(length, flags=FLAG_AES_GCM)],
+                                  iter_encrypt_chunked(source, key, chunk_size, workers))
+        return stream_embed_bits(audio_path, output_path, payload, unit_dtype, bit, block_frames, k)
+    finally:
+        close()
+
+
+def iter_extract_encrypted(audio_path, key, k=1, bit=0, unit_dtype=None, workers=None):
+    """
+    Trích xuất và giải mã payload của embed_encrypted, sinh lần lượt các đoạn bản rõ.
+
+    Các bit được đọc dần từ np.memmap của file (chỉ phần chứa tin được đọc từ đĩa) và
+    đưa thẳng vào bộ giải mã; bản rõ không được ghi ra đĩa. Ném ValueError nếu file
+    không chứa dữ liệu mã hóa, sai khóa hoặc dữ liệu bị sửa đổi.
+    """
+    info = parse_wav_header(audio_path)
+    k = resolve_k(k, info.sampwidth)
+    units = map_data(audio_path, dtype=unit_dtype, info=info)
+
+    flags, length, _ = unpack_header(bits_to_bytes(extract_bits(units, HEADER_BITS, bit, k=k)))
+    if not flags & FLAG_AES_GCM:
+        raise ValueError("Payload không được mã hóa bằng AES-GCM chia đoạn.")
+    if units_needed(HEADER_BITS + length * 8, k) > len(units):
+        raise ValueError("Độ dài payload trong tiêu đề vượt quá dung lượng file âm thanh.")
+
+    def ciphertext():
+        # HEADER_BITS chia hết cho mọi k <= MAX_K nên bản mã bắt đầu tại đầu một đơn vị
+        offset = HEADER_BITS // k
+        for start in range(0, length, EXTRACT_PIECE_BYTES):
+            n_bits = min(EXTRACT_PIECE_BYTES, length - start) * 8
+            yield bits_to_bytes(extract_bits(units, n_bits, bit, offset=offset, k=k))
+            offset += n_bits // k
+
+    yield from iter_decrypt_chunked(ciphertext(), key, workers)
+
+
+def extract_encrypted(audio_path, key, destination=None, k=1, bit=0, unit_dtype=None, workers=None):
+    """
+    Như iter_extract_encrypted nhưng ghi bản rõ vào `destination` (đối tượng có write())
+    và trả về số byte đã ghi; nếu không có `destination`, trả về bản rõ dạng bytes.
+    """
+    chunks = iter_extract_encrypted(audio_path, key, k, bit, unit_dtype, workers)
+    if destination is None:
+        return b''.join(chunks)
+    written = 0
+    for chunk in chunks:
+        destination.write(chunk)
+        written += len(chunk)
+    return written
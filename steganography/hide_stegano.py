@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+
+from .lsb import bytes_to_bits, embed_bits, read_payload, resolve_k, units_needed
+from .payload import pack_payload
+from .streaming import stream_embed_bits
+from .wav_io import clone_file, map_data, parse_wav_header
+
+
+def _embed_payload(audio_file_path, payload, output_path, bit_to_modify, block_frames, k, info):
+    """Giấu payload đã đóng gói (pack_payload) vào file WAV có tiêu đề `info`; `k` đã được chuẩn hóa."""
+    full_binary_data = bytes_to_bits(payload)
+
+    # Mỗi byte trong frames có thể chứa k bit dữ liệu
+    if len(full_binary_data) > info.data_size * k:
+        raise ValueError("File âm thanh quá nhỏ để chứa toàn bộ dữ liệu.")
+
+    if block_frames is not None:
+        return stream_embed_bits(audio_file_path, output_path, payload, unit_dtype=np.uint8,
+                                 bit=bit_to_modify, block_frames=block_frames, k=k)
+
+    # Sao chép file gốc rồi giấu dữ liệu vào bit đã chọn của các byte đầu tiên
+    clone_file(audio_file_path, output_path)
+    frames = map_data(output_path, dtype=np.uint8, mode='r+', info=info)
+    embed_bits(frames, full_binary_data, bit_to_modify, k)
+    frames.flush()
+    del frames
+    return len(full_binary_data)
+
+
+def embed_text(audio_file_path, text_data, output_path, bit_to_modify=0, block_frames=None, k=1, compress=True):
+    """
+    Giấu chuỗi `text_data` (UTF-8, kèm tiêu đề payload) vào file WAV bằng LSB.
+
+    Giống hide_text_in_audio nhưng không in ra màn hình và ném ngoại lệ khi lỗi
+    (ValueError nếu file không hợp lệ hoặc không đủ dung lượng), để dùng trong
+    các chương trình xử lý hàng loạt. Với `compress=True`, văn bản được nén trước khi
+    giấu nếu việc nén làm nó ngắn hơn. Trả về số bit đã giấu.
+    """
+    # Chỉ đọc tiêu đề RIFF của file audio WAV
+    info = parse_wav_header(audio_file_path)
+    k = resolve_k(k, info.sampwidth)
+
+    # Tiêu đề payload và văn bản (UTF-8, đã nén nếu có lợi)
+    payload = pack_payload(text_data.encode('utf-8'), compress=compress)
+    return _embed_payload(audio_file_path, payload, output_path, bit_to_modify, block_frames, k, info)
+
+
+def extract_text(audio_file_path, bit_to_modify=0, k=1):
+    """
+    Trích xuất chuỗi đã giấu bằng embed_text/hide_text_in_audio.
+
+    Không in ra màn hình; ném FileNotFoundError hoặc ValueError (không có tin,
+    sai CRC, ...) khi lỗi.
+    """
+    # Ánh xạ dữ liệu vào bộ nhớ: chỉ các byte chứa tiêu đề và payload được đọc từ đĩa
+    info = parse_wav_header(audio_file_path)
+    frames = map_data(audio_file_path, dtype=np.uint8, info=info)
+    data = read_payload(frames, bit=bit_to_modify, k=resolve_k(k, info.sampwidth))
+    return data.decode('utf-8', errors='replace')
+
+
+def hide_text_in_audio(audio_file_path, text_file_path, output_path, bit_to_modify=0, block_frames=None, k=1,
+                       compress=True):
+    """
+    Ẩn nội dung từ file văn bản vào file âm thanh WAV bằng kỹ thuật LSB.
+
+    Mỗi byte PCM chứa k bit dữ liệu (mặc định 1). File gốc được sao chép (reflink nếu hệ thống
+    file hỗ trợ) rồi chỉ các byte chứa tin được sửa trực tiếp qua np.memmap.
+
+    Tham số:
+    audio_file_path (str): Đường dẫn đến file âm thanh WAV.
+    text_file_path (str): Đường dẫn đến file văn bản chứa thông điệp bí mật.
+    output_path (str): Đường dẫn để lưu file âm thanh đã giấu tin.
+    bit_to_modify (int): Bit thứ n (từ 0 đến 7) trong mỗi byte để giấu tin.
+                         Mặc định là 0 (bit cuối cùng).
+    block_frames (int): Nếu được chỉ định, file được đọc và ghi theo từng khối
+                        `block_frames` frame, bộ nhớ không phụ thuộc độ dài file.
+    k (int | dict): Số bit giấu trong mỗi byte, bắt đầu từ bit_to_modify (1-4),
+                    hoặc dict {độ rộng mẫu: k} để chọn theo loại file. Mặc định là 1.
+    compress (bool): Nén văn bản (zlib/bz2/lzma, chọn thuật toán cho kết quả ngắn nhất)
+                     trước khi giấu nếu việc nén làm nó ngắn hơn. Mặc định là True.
+    """
+    try:
+        # 1. Kiểm tra sự tồn tại của các file đầu vào
+        if not os.path.exists(audio_file_path) or not os.path.exists(text_file_path):
+            print("❌ Lỗi: Không tìm thấy một trong các file đầu vào.")
+            print(f"Vui lòng kiểm tra lại đường dẫn của '{audio_file_path}' và '{text_file_path}'.")
+            return
+
+        # 2. Đọc nội dung từ file văn bản
+        with open(text_file_path, 'r', encoding='utf-8') as text_file:
+            text_data = text_file.read()
+
+        # 3. Kiểm tra dung lượng (chỉ đọc tiêu đề RIFF)
+        info = parse_wav_header(audio_file_path)
+        k = resolve_k(k, info.sampwidth)
+        payload = pack_payload(text_data.encode('utf-8'), compress=compress)
+        n_bits = len(payload) * 8
+        capacity = info.data_size * k
+        print(f"📦 Dung lượng: {k} bit/byte, tối đa {capacity} bit, cần {n_bits} bit "
+              f"({units_needed(n_bits, k)} byte).")
+        if n_bits > capacity:
+            print("❌ Lỗi: File âm thanh quá nhỏ để chứa toàn bộ dữ liệu.")
+            return
+
+        # 4. Giấu dữ liệu
+        _embed_payload(audio_file_path, payload, output_path, bit_to_modify, block_frames, k, info)
+
+        print(f"✅ Đã ẩn dữ liệu thành công vào '{output_path}'")
+        print(f"📝 Nội dung đã giấu: {text_data[:30]}...")
+
+    except Exception as e:
+        print(f"❌ Có lỗi xảy ra: {e}")
+
+
+def extract_text_from_audio(audio_file_path, bit_to_modify=0, k=1):
+    """
+    Trích xuất nội dung từ file âm thanh WAV đã được giấu tin.
+
+    Tham số:
+    audio_file_path (str): Đường dẫn đến file âm thanh WAV.
+    bit_to_modify (int): Bit thứ n (từ 0 đến 7) trong mỗi byte đã được dùng để giấu tin.
+                         Mặc định là 0 (bit cuối cùng).
+    k (int | dict): Số bit đã giấu trong mỗi byte, phải giống giá trị khi giấu.
+    """
+    try:
+        # 1. Kiểm tra sự tồn tại của file đầu vào
+        if not os.path.exists(audio_file_path):
+            print("❌ Lỗi: Không tìm thấy file âm thanh.")
+            return None
+
+        # 2. Trích xuất: chỉ các byte chứa tiêu đề và payload được đọc từ đĩa
+        try:
+            text = extract_text(audio_file_path, bit_to_modify, k)
+        except ValueError as e:
+            print(f"❌ Lỗi: {e}")
+            return None
+
+        print(f"✅ Đã trích xuất thành công nội dung từ '{audio_file_path}'")
+        return text
+
+    except Exception as e:
+        print(f"❌ Có lỗi xảy ra trong quá trình trích xuất: {e}")
+        return None
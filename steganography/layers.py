@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import namedtuple
+
+from .lsb_message import embed_message_buffer, extract_message, extract_message_buffer
+from .steghide_async import SteghideRunner
+
+# Kết quả trích xuất của một lớp: giá trị (None nếu lỗi), ngoại lệ (None nếu thành công)
+# và thời gian chạy của riêng lớp đó (giây)
+LayerResult = namedtuple('LayerResult', 'layer value error seconds')
+
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+async def embed_layers(carrier, steghide_secret, password, lsb_message, output, k=1,
+                       keep_intermediate=None, runner=None):
+    """
+    Nhúng 2 lớp: lớp thứ nhất bằng Steghide, lớp thứ hai bằng LSB, không qua file WAV trung gian.
+
+    `steghide_secret` là bytes hoặc đường dẫn file bí mật cho Steghide. Kết quả của
+    Steghide được đọc một lần vào bộ nhớ (thư mục tạm của `runner` nằm trên tmpfs nếu
+    có), lớp LSB được nhúng trực tiếp vào bộ nhớ đệm đó và file cuối cùng chỉ được ghi
+    một lần. File sau lớp Steghide chỉ được lưu khi có `keep_intermediate`; lớp Steghide
+    được trích xuất từ file này (xem extract_layers).
+
+    `runner` là SteghideRunner dùng chung khi chạy nhiều tác vụ đồng thời. Ném
+    SteghideError, OSError hoặc ValueError khi lỗi; trả về `output`.
+    """
+    runner = runner or SteghideRunner()
+    stego = await runner.embed(carrier, steghide_secret, password)
+    if keep_intermediate is not None:
+        await asyncio.to_thread(_write, keep_intermediate, stego)
+
+    # Nhúng LSB trong thread riêng để vòng lặp sự kiện tiếp tục điều phối các tiến trình steghide khác
+    await asyncio.to_thread(embed_message_buffer, stego, lsb_message, k)
+    await asyncio.to_thread(_write, output, stego)
+    return output
+
+
+def embed_two_layers(carrier, steghide_secret, password, lsb_message, output, k=1,
+                     keep_intermediate=None, command=None):
+    """Chạy embed_layers từ mã đồng bộ; xem embed_layers."""
+    return asyncio.run(embed_layers(carrier, steghide_secret, password, lsb_message, output, k,
+                                    keep_intermediate, SteghideRunner(command=command)))
+
+
+async def _timed(layer, awaitable):
+    start = time.perf_counter()
+    try:
+        value, error = await awaitable, None
+    except Exception as e:
+        value, error = None, e
+    return LayerResult(layer, value, error, time.perf_counter() - start)
+
+
+def _extract_lsb(stego, k):
+    if isinstance(stego, (bytes, bytearray, memoryview)):
+        return extract_message_buffer(stego, k)
+    return extract_message(stego, k)
+
+
+async def extract_layers(stego, password, steghide_stego, k=1, runner=None, timeout=None):
+    """
+    Trích xuất đồng thời lớp LSB và lớp Steghide.
+
+    Lớp LSB được giải mã từ `stego` (đường dẫn hoặc nội dung file WAV) trong một thread,
+    trong khi tiến trình steghide trích xuất từ `steghide_stego` được chờ bất đồng bộ,
+    nên thời gian của cả tác vụ gần bằng lớp chậm hơn thay vì tổng của hai lớp. Lỗi
+    của lớp này không làm dừng lớp kia.
+
+    `steghide_stego` là file sau lớp Steghide (keep_intermediate của embed_layers), không
+    phải `stego`: lớp LSB đã ghi đè các bit thấp mà steghide dùng để giấu dữ liệu, nên
+    steghide thật không trích xuất được từ file cuối cùng.
+
+    Trả về dict {'lsb': LayerResult, 'steghide': LayerResult}; giá trị của lớp LSB là
+    chuỗi, của lớp Steghide là bytearray.
+    """
+    runner = runner or SteghideRunner()
+    results = await asyncio.gather(
+        _timed('lsb', asyncio.to_thread(_extract_lsb, stego, k)),
+        _timed('steghide', runner.extract(steghide_stego, password, timeout=timeout)),
+    )
+    return {result.layer: result for result in results}
+
+
+def extract_two_layers(stego, password, steghide_stego, k=1, command=None, timeout=None):
+    """Chạy extract_layers từ mã đồng bộ; xem extract_layers."""
+    return asyncio.run(extract_layers(stego, password, steghide_stego, k,
+                                      SteghideRunner(command=command), timeout))
+
+
+def run_layer_extractions(jobs, max_concurrency=None, command=None, timeout=None):
+    """
+    Trích xuất 2 lớp cho nhiều file cùng lúc; mỗi tác vụ là dict tham số của
+    extract_layers (stego, password, steghide_stego và tùy chọn k).
+
+    Các tác vụ dùng chung một SteghideRunner nên số tiến trình steghide chạy cùng lúc
+    không vượt quá `max_concurrency`. Trả về danh sách kết quả theo thứ tự `jobs`.
+    """
+    async def main():
+        runner = SteghideRunner(max_concurrency, timeout, command)
+        return await asyncio.gather(*(extract_layers(runner=runner, **job) for job in jobs))
+
+    return asyncio.run(main())
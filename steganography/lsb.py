@@ -0,0 +1,120 @@
+import numpy as np
+
+from .payload import HEADER_BITS, unpack_header, verify_payload
+
+_SAMPLE_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+# Số bit thấp tối đa được dùng trong mỗi mẫu ở chế độ k-LSB
+MAX_K = 4
+
+
+def sample_dtype(sampwidth):
+    """Trả về kiểu dữ liệu NumPy tương ứng với độ rộng mẫu (byte) của file WAV."""
+    try:
+        return np.dtype(_SAMPLE_DTYPES[sampwidth])
+    except KeyError:
+        raise ValueError(f"Không hỗ trợ độ rộng mẫu {sampwidth} byte.") from None
+
+
+def _unsigned(samples):
+    """Xem mảng mẫu dưới dạng số không dấu cùng độ rộng để thao tác bit an toàn."""
+    return samples.view(np.dtype(f'u{samples.dtype.itemsize}'))
+
+
+def bytes_to_bits(data):
+    """Chuyển dữ liệu bytes thành mảng bit (uint8, mỗi phần tử 0 hoặc 1)."""
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+def bits_to_bytes(bits):
+    """Gộp mảng bit thành bytes (bit cao trước, giống format(..., '08b'))."""
+    return np.packbits(np.asarray(bits, dtype=np.uint8)).tobytes()
+
+
+def resolve_k(k, sampwidth):
+    """
+    Xác định số bit thấp được dùng mỗi mẫu (k-LSB) cho độ rộng mẫu `sampwidth`.
+
+    `k` có thể là một số nguyên từ 1 đến MAX_K, hoặc một dict {độ rộng mẫu: k}
+    để chọn k riêng cho từng loại file (ví dụ {1: 1, 2: 2, 4: 4}).
+    """
+    if isinstance(k, dict):
+        k = k.get(sampwidth, 1)
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k phải nằm trong khoảng 1 đến {MAX_K}.")
+    return k
+
+
+def check_bit_range(bit, k, unit_bits):
+    """Ném ValueError nếu `k` bit bắt đầu từ bit thứ `bit` không nằm gọn trong đơn vị `unit_bits` bit."""
+    if bit < 0 or bit + k > unit_bits:
+        raise ValueError("Vùng bit cần thay đổi vượt quá độ rộng mẫu.")
+
+
+def units_needed(n_bits, k=1):
+    """Số mẫu cần dùng để giấu `n_bits` bit khi mỗi mẫu mang `k` bit."""
+    return -(-n_bits // k)
+
+
+def embed_bits(samples, bits, bit=0, k=1):
+    """
+    Ghi các bit vào `k` bit bắt đầu từ bit thứ `bit` của các mẫu đầu tiên (ghi tại chỗ).
+
+    Tham số:
+    samples (np.ndarray): Mảng mẫu có thể ghi (uint8/int16/int32).
+    bits (np.ndarray): Mảng bit 0/1 cần giấu.
+    bit (int): Vị trí bit thấp nhất được thay đổi trong mỗi mẫu. Mặc định là 0 (LSB).
+    k (int): Số bit giấu trong mỗi mẫu (k-LSB). Mặc định là 1.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    n_units = units_needed(len(bits), k)
+    if n_units > len(samples):
+        raise ValueError("Số bit cần giấu vượt quá dung lượng của file âm thanh.")
+    check_bit_range(bit, k, samples.dtype.itemsize * 8)
+
+    plane = _unsigned(samples)[:n_units]
+    if k == 1:
+        values = bits.astype(plane.dtype)
+    else:
+        # Gom k bit liên tiếp thành một giá trị (bit cao trước) cho mỗi mẫu
+        groups = np.zeros(n_units * k, dtype=plane.dtype)
+        groups[:len(bits)] = bits
+        values = (groups.reshape(-1, k) << _shifts(k, plane.dtype)).sum(axis=1, dtype=plane.dtype)
+
+    mask = plane.dtype.type(((1 << k) - 1) << bit)
+    plane &= ~mask
+    plane |= values << plane.dtype.type(bit)
+    return samples
+
+
+def extract_bits(samples, n_bits, bit=0, offset=0, k=1):
+    """Đọc `n_bits` bit từ `k` bit bắt đầu tại bit thứ `bit` của các mẫu, kể từ mẫu `offset`."""
+    plane = _unsigned(samples)[offset:offset + units_needed(n_bits, k)]
+    values = plane >> plane.dtype.type(bit)
+    if k == 1:
+        return (values & 1).astype(np.uint8)
+    bits = (values[:, None] >> _shifts(k, plane.dtype)) & 1
+    return bits.astype(np.uint8).ravel()[:n_bits]
+
+
+def _shifts(k, dtype):
+    """Độ dịch của từng bit trong một nhóm k bit (bit cao trước)."""
+    return np.arange(k - 1, -1, -1, dtype=dtype)
+
+
+def read_payload(units, bit=0, k=1):
+    """
+    Trích xuất payload có tiêu đề từ `k` bit bắt đầu tại bit thứ `bit` của mảng đơn vị mang tin.
+
+    `units` thường là np.memmap của chunk 'data' (mẫu PCM, hoặc uint8 khi giấu theo
+    byte): chỉ các mẫu chứa tiêu đề và đúng số mẫu chứa payload được đọc từ đĩa.
+    Ném ValueError nếu file không chứa tin hoặc payload bị hỏng.
+    """
+    flags, length, crc = unpack_header(bits_to_bytes(extract_bits(units, HEADER_BITS, bit, k=k)))
+
+    if units_needed(HEADER_BITS + length * 8, k) > len(units):
+        raise ValueError("Độ dài payload trong tiêu đề vượt quá dung lượng file âm thanh.")
+
+    # HEADER_BITS chia hết cho mọi k <= MAX_K nên payload bắt đầu tại đầu một mẫu
+    data = bits_to_bytes(extract_bits(units, length * 8, bit, offset=HEADER_BITS // k, k=k))
+    return verify_payload(data, length, crc, flags)
@@ -0,0 +1,138 @@
+from .lsb import bits_to_bytes, bytes_to_bits, embed_bits, read_payload, resolve_k, units_needed
+from .payload import pack_payload
+from .streaming import stream_embed_bits
+from .wav_io import buffer_data, clone_file, map_data, parse_wav_bytes, parse_wav_header
+
+
+def message_to_binary(message, compress=True):
+    """
+    Chuyển đổi một chuỗi văn bản thành mảng bit (mã hóa UTF-8).
+    Thêm tiêu đề payload (độ dài, CRC) vào trước thông điệp để trích xuất đúng số bit cần thiết.
+    Với `compress=True`, thông điệp được nén nếu việc nén làm nó ngắn hơn.
+    """
+    return bytes_to_bits(pack_payload(message.encode('utf-8'), compress=compress))
+
+def binary_to_message(binary_message):
+    """Chuyển đổi một mảng bit (không gồm tiêu đề) thành chuỗi văn bản."""
+    return bits_to_bytes(binary_message).decode('utf-8', errors='replace')
+
+def _embed_binary(audio_path, output_path, binary_message, block_frames, k, info):
+    """Nhúng mảng bit đã có tiêu đề (message_to_binary) vào file WAV có tiêu đề `info`; `k` đã được chuẩn hóa."""
+    if len(binary_message) > info.nframes * info.nchannels * k:
+        raise ValueError("Thông điệp quá dài, không thể giấu trong file âm thanh này.")
+
+    if block_frames is not None:
+        # Đọc và ghi theo từng khối, bộ nhớ không phụ thuộc độ dài file
+        return stream_embed_bits(audio_path, output_path, bits_to_bytes(binary_message),
+                                 block_frames=block_frames, k=k)
+
+    # Sao chép file gốc rồi chỉ sửa các mẫu chứa tin ngay trên file mới
+    clone_file(audio_path, output_path)
+    audio_array = map_data(output_path, mode='r+', info=info)
+    embed_bits(audio_array, binary_message, k=k)
+    audio_array.flush()
+    del audio_array
+    return len(binary_message)
+    
+def embed_message(audio_path, output_path, message, block_frames=None, k=1, compress=True):
+    """
+    Nhúng thông điệp vào file âm thanh bằng LSB, không in ra màn hình.
+
+    Ném FileNotFoundError/ValueError khi lỗi (ví dụ thông điệp quá dài), để dùng
+    trong các chương trình xử lý hàng loạt. Trả về số bit đã nhúng.
+    """
+    info = parse_wav_header(audio_path)
+    k = resolve_k(k, info.sampwidth)
+    return _embed_binary(audio_path, output_path, message_to_binary(message, compress), block_frames, k, info)
+
+def extract_message(audio_path, k=1):
+    """Trích xuất thông điệp đã nhúng bằng LSB; ném FileNotFoundError/ValueError khi lỗi."""
+    # Ánh xạ chunk 'data' vào bộ nhớ: chỉ các mẫu chứa tiêu đề và thông điệp được đọc từ đĩa
+    audio_array = map_data(audio_path)
+    message_bytes = read_payload(audio_array, k=resolve_k(k, audio_array.dtype.itemsize))
+    return message_bytes.decode('utf-8', errors='replace')
+
+def embed_message_buffer(wav_buffer, message, k=1, compress=True):
+    """
+    Nhúng thông điệp bằng LSB trực tiếp vào nội dung file WAV trong bộ nhớ.
+
+    `wav_buffer` phải ghi được (bytearray hoặc memoryview ghi được) và được sửa tại
+    chỗ, không sao chép. Ném ValueError khi lỗi; trả về số bit đã nhúng.
+    """
+    info = parse_wav_bytes(wav_buffer)
+    k = resolve_k(k, info.sampwidth)
+
+    binary_message = message_to_binary(message, compress)
+    if len(binary_message) > info.nframes * info.nchannels * k:
+        raise ValueError("Thông điệp quá dài, không thể giấu trong file âm thanh này.")
+
+    embed_bits(buffer_data(wav_buffer, info=info), binary_message, k=k)
+    return len(binary_message)
+
+def extract_message_buffer(wav_buffer, k=1):
+    """Trích xuất thông điệp LSB từ nội dung file WAV trong bộ nhớ; ném ValueError khi lỗi."""
+    info = parse_wav_bytes(wav_buffer)
+    message_bytes = read_payload(buffer_data(wav_buffer, info=info), k=resolve_k(k, info.sampwidth))
+    return message_bytes.decode('utf-8', errors='replace')
+
+def embed_message_in_audio(audio_path, output_path, message, block_frames=None, k=1, compress=True):
+    """
+    Nhúng một thông điệp vào file âm thanh bằng LSB.
+
+    Mặc định file gốc được sao chép (reflink nếu hệ thống file hỗ trợ) rồi chỉ các
+    mẫu chứa tin được sửa trực tiếp qua np.memmap, nên chi phí ghi tỉ lệ với độ dài
+    thông điệp. Nếu có `block_frames`, file được đọc và ghi theo từng khối.
+    `k` là số bit thấp dùng trong mỗi mẫu (1-4), hoặc dict {độ rộng mẫu: k}.
+    Với `compress=True`, thông điệp được nén trước khi nhúng nếu việc nén làm nó ngắn hơn.
+    """
+    try:
+        info = parse_wav_header(audio_path)
+        k = resolve_k(k, info.sampwidth)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh tại '{audio_path}'.")
+        return
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return
+    
+    binary_message = message_to_binary(message, compress)
+    message_len = len(binary_message)
+    capacity = info.nframes * info.nchannels * k
+    print(f"Dung lượng LSB: {k} bit/mẫu, tối đa {capacity} bit.")
+    
+    if message_len > capacity:
+        print("Lỗi: Thông điệp quá dài, không thể giấu trong file âm thanh này.")
+        return
+
+    print(f"\n--- Bắt đầu nhúng lớp thứ 2 (LSB Python) ---")
+    print(f"Bắt đầu nhúng thông điệp có độ dài {message_len} bit vào {units_needed(message_len, k)} mẫu...")
+    
+    try:
+        _embed_binary(audio_path, output_path, binary_message, block_frames, k, info)
+    except (OSError, ValueError) as e:
+        print(f"Lỗi: {e}")
+        return
+        
+    print(f"Nhúng thành công {message_len} bit.")
+    print(f"Quá trình nhúng LSB hoàn tất. File âm thanh mới được lưu tại: {output_path}")
+    return True
+
+def extract_message_from_audio(audio_path, k=1):
+    """
+    Trích xuất thông điệp từ file âm thanh đã giấu tin bằng LSB.
+    `k` phải giống giá trị đã dùng khi nhúng.
+    """
+    print("\n--- Bắt đầu trích xuất lớp LSB Python ---")
+    print("Bắt đầu trích xuất thông điệp...")
+
+    try:
+        extracted_message = extract_message(audio_path, k)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh tại '{audio_path}'.")
+        return None
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return None
+
+    print("Trích xuất LSB thành công! Tiêu đề và CRC hợp lệ.")
+    return extracted_message
@@ -0,0 +1,175 @@
+import wave
+from collections import namedtuple
+
+import numpy as np
+
+from .streaming import DEFAULT_BLOCK_FRAMES, read_float_blocks
+
+# Giới hạn SNR của từng đoạn khi tính SNR phân đoạn (dB), theo cách tính thông dụng
+SEG_SNR_MIN = -10.0
+SEG_SNR_MAX = 35.0
+
+# Độ dài mặc định của mỗi đoạn khi tính SNR phân đoạn (giây)
+SEGMENT_SECONDS = 0.02
+
+AudioMetrics = namedtuple('AudioMetrics', 'mse snr psnr segmental_snr max_abs_error nframes channels')
+
+
+def _db(numerator, denominator):
+    """10 * log10(numerator / denominator); trả về inf khi mẫu số bằng 0."""
+    if denominator == 0:
+        return float('inf')
+    if numerator == 0:
+        return float('-inf')
+    return float(10 * np.log10(numerator / denominator))
+
+
+def _segment_snr(signal_energy, noise_energy):
+    """SNR (dB) của từng đoạn, giới hạn trong [SEG_SNR_MIN, SEG_SNR_MAX]."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        snr = 10 * np.log10(signal_energy / noise_energy)
+    # Đoạn không có sai khác (kể cả đoạn im lặng) được tính bằng giới hạn trên
+    snr = np.nan_to_num(snr, nan=SEG_SNR_MAX, posinf=SEG_SNR_MAX, neginf=SEG_SNR_MIN)
+    return np.clip(snr, SEG_SNR_MIN, SEG_SNR_MAX)
+
+
+def _pcm_format(sampwidth):
+    """(Tâm, biên độ toàn thang) của mẫu PCM `sampwidth` byte; mẫu 8-bit không dấu có tâm 128."""
+    return (128.0 if sampwidth == 1 else 0.0), float(1 << (8 * sampwidth - 1))
+
+
+def _normalized_blocks(original_blocks, modified_blocks, original_width, modified_width):
+    """
+    Đưa các cặp khối (gốc, đã sửa) về cùng thang đo: bỏ tâm của từng bên theo độ rộng
+    mẫu của chính nó, rồi quy tín hiệu đã sửa về đơn vị mẫu của file gốc. Nhờ vậy file
+    gốc 8-bit so sánh được với file int16 mà phase, echo và spread ghi ra.
+    """
+    original_center, original_scale = _pcm_format(original_width)
+    modified_center, modified_scale = _pcm_format(modified_width)
+    factor = original_scale / modified_scale
+    for original_block, modified_block in zip(original_blocks, modified_blocks):
+        modified_block = modified_block - modified_center
+        if factor != 1.0:
+            modified_block *= factor
+        yield original_block - original_center, modified_block
+
+
+def _compare_blocks(blocks, n_channels, segment_frames):
+    """
+    Tích lũy các chỉ số từ các cặp khối (gốc, đã sửa) liên tiếp đã bỏ tâm, mỗi khối là
+    bội số của `segment_frames` frame (trừ khối cuối). Trả về AudioMetrics.
+    """
+    signal_energy = np.zeros(n_channels)
+    noise_energy = np.zeros(n_channels)
+    peak = np.zeros(n_channels)
+    max_error = np.zeros(n_channels)
+    seg_snr_sum = np.zeros(n_channels)
+    seg_snr_total = 0.0
+    n_segments = 0
+    n_frames = 0
+
+    for original_block, modified_block in blocks:
+        n = min(len(original_block), len(modified_block))
+        signal = original_block[:n].reshape(n, n_channels)
+        error = modified_block[:n].reshape(n, n_channels) - signal
+
+        signal_sq = signal * signal
+        error_sq = error * error
+        signal_energy += signal_sq.sum(axis=0)
+        noise_energy += error_sq.sum(axis=0)
+        np.maximum(peak, np.abs(signal).max(axis=0, initial=0), out=peak)
+        np.maximum(max_error, np.abs(error).max(axis=0, initial=0), out=max_error)
+
+        # Năng lượng của từng đoạn; khối luôn là bội số của segment_frames nên
+        # chỉ đoạn cuối cùng của file có thể ngắn hơn
+        bounds = np.arange(0, n, segment_frames)
+        if len(bounds):
+            segment_signal = np.add.reduceat(signal_sq, bounds, axis=0)
+            segment_noise = np.add.reduceat(error_sq, bounds, axis=0)
+            seg_snr_sum += _segment_snr(segment_signal, segment_noise).sum(axis=0)
+            seg_snr_total += _segment_snr(segment_signal.sum(axis=1), segment_noise.sum(axis=1)).sum()
+            n_segments += len(bounds)
+        n_frames += n
+
+        if n < len(original_block) or n < len(modified_block):
+            break
+
+    if n_frames == 0:
+        raise ValueError("File WAV không chứa dữ liệu âm thanh.")
+
+    channels = tuple(
+        AudioMetrics(
+            mse=float(noise_energy[c] / n_frames),
+            snr=_db(signal_energy[c], noise_energy[c]),
+            psnr=_db(peak[c] ** 2, noise_energy[c] / n_frames),
+            segmental_snr=float(seg_snr_sum[c] / n_segments),
+            max_abs_error=float(max_error[c]),
+            nframes=n_frames,
+            channels=None,
+        )
+        for c in range(n_channels)
+    )
+    mse = float(noise_energy.sum() / (n_frames * n_channels))
+    return AudioMetrics(
+        mse=mse,
+        snr=_db(signal_energy.sum(), noise_energy.sum()),
+        psnr=_db(peak.max() ** 2, mse),
+        segmental_snr=float(seg_snr_total / n_segments),
+        max_abs_error=float(max_error.max()),
+        nframes=n_frames,
+        channels=channels,
+    )
+
+
+def _segment_frames(framerate, segment_frames):
+    return segment_frames if segment_frames is not None else max(1, int(framerate * SEGMENT_SECONDS))
+
+
+def compare_audio(original_path, modified_path, block_frames=DEFAULT_BLOCK_FRAMES, segment_frames=None):
+    """
+    Tính các chỉ số chất lượng giữa hai file WAV trong một lần duyệt theo khối.
+
+    Hai file được đọc song song theo từng khối `block_frames` frame và các tổng được
+    tích lũy bằng float64, nên không bị tràn số như khi bình phương trực tiếp mảng
+    int16 và bộ nhớ không phụ thuộc độ dài file. Nếu hai file dài khác nhau, chỉ
+    phần chung được so sánh.
+
+    Trả về AudioMetrics (MSE, SNR, PSNR, SNR phân đoạn, sai số tuyệt đối lớn nhất,
+    số frame) cho toàn bộ tín hiệu; trường `channels` chứa AudioMetrics của từng
+    kênh. PSNR dùng biên độ lớn nhất của file gốc làm giá trị đỉnh. SNR phân đoạn
+    là trung bình SNR của các đoạn `segment_frames` frame (mặc định 20 ms).
+
+    Hai file có thể khác độ rộng mẫu (ví dụ file gốc 8-bit và file int16 đã giấu tin):
+    mỗi file được chuẩn hóa theo độ rộng mẫu của chính nó, MSE và sai số tính theo
+    đơn vị mẫu của file gốc. Ném ValueError nếu hai file khác số kênh hoặc tần số lấy mẫu.
+    """
+    with wave.open(original_path, 'rb') as original, wave.open(modified_path, 'rb') as modified:
+        n_channels = original.getnchannels()
+        if modified.getnchannels() != n_channels or modified.getframerate() != original.getframerate():
+            raise ValueError("Hai file WAV phải có cùng số kênh và tần số lấy mẫu.")
+
+        segment_frames = _segment_frames(original.getframerate(), segment_frames)
+        block_frames = max(segment_frames, block_frames - block_frames % segment_frames)
+        blocks = _normalized_blocks(read_float_blocks(original, np.float64, block_frames),
+                                    read_float_blocks(modified, np.float64, block_frames),
+                                    original.getsampwidth(), modified.getsampwidth())
+        return _compare_blocks(blocks, n_channels, segment_frames)
+
+
+def compare_arrays(original, modified, framerate, block_frames=DEFAULT_BLOCK_FRAMES, segment_frames=None):
+    """
+    Giống compare_audio nhưng trên hai mảng mẫu PCM đã nằm trong bộ nhớ (dạng (frame,)
+    hoặc (frame, kênh); độ rộng mẫu lấy từ kiểu của từng mảng), xử lý theo từng khối
+    để không tạo mảng trung gian lớn. Ném ValueError nếu hai mảng khác số kênh.
+    """
+    if original.shape[1:] != modified.shape[1:]:
+        raise ValueError("Hai tín hiệu phải có cùng số kênh.")
+    n_channels = original.shape[1] if original.ndim > 1 else 1
+
+    segment_frames = _segment_frames(framerate, segment_frames)
+    block_frames = max(segment_frames, block_frames - block_frames % segment_frames)
+    n = min(len(original), len(modified))
+    blocks = _normalized_blocks((original[i:i + block_frames].astype(np.float64) for i in range(0, n, block_frames)),
+                                (modified[i:i + block_frames].astype(np.float64) for i in range(0, n, block_frames)),
+                                original.dtype.itemsize, modified.dtype.itemsize)
+    return _compare_blocks(blocks, n_channels, segment_frames)
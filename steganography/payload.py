@@ -0,0 +1,129 @@
+import bz2
+import lzma
+import struct
+import zlib
+
+# Tiêu đề nhị phân đặt trước payload:
+#   magic (2 byte) | version (1 byte) | flags (1 byte) | độ dài payload (4 byte) | CRC32 (4 byte)
+MAGIC = b'SG'
+VERSION = 1
+HEADER = struct.Struct('>2sBBII')
+HEADER_SIZE = HEADER.size
+HEADER_BITS = HEADER_SIZE * 8
+
+# Các bit của trường flags
+# Payload là dữ liệu AES-GCM chia đoạn (steganography.aes); tính toàn vẹn do tag của
+# từng đoạn bảo đảm nên trường CRC32 không được dùng (bằng 0)
+FLAG_AES_GCM = 0x01
+# Bit 1-2: thuật toán nén dữ liệu (0 nếu không nén); độ dài và CRC32 tính trên dữ liệu đã nén
+COMPRESSION_MASK = 0x06
+FLAG_ZLIB = 0x02
+FLAG_BZ2 = 0x04
+FLAG_LZMA = 0x06
+
+# Dạng thô (không có tiêu đề/checksum riêng của từng định dạng) để không tốn bit cho phần
+# mà tiêu đề payload đã có; từ điển LZMA giới hạn 4 MiB để bộ nhớ khi nén vừa phải
+_LZMA_FILTERS = [{'id': lzma.FILTER_LZMA2, 'preset': 9 | lzma.PRESET_EXTREME, 'dict_size': 1 << 22}]
+
+# Kích thước tối đa của payload sau khi giải nén, để một file được tạo có chủ đích
+# (payload nhỏ giải nén thành hàng GB) không làm cạn bộ nhớ khi trích xuất
+MAX_DECOMPRESSED_SIZE = 64 << 20
+
+
+def _deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+# Cờ nén -> (hàm nén, hàm tạo bộ giải nén); các bộ giải nén đều có
+# decompress(data, max_length) và thuộc tính eof
+CODECS = {
+    FLAG_ZLIB: (_deflate, lambda: zlib.decompressobj(-15)),
+    FLAG_BZ2: (lambda data: bz2.compress(data, 9), bz2.BZ2Decompressor),
+    FLAG_LZMA: (lambda data: lzma.compress(data, lzma.FORMAT_RAW, filters=_LZMA_FILTERS),
+                lambda: lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=_LZMA_FILTERS)),
+}
+
+
+def pack_header(length, crc=0, flags=0):
+    """Tạo tiêu đề payload cho dữ liệu dài `length` byte, dùng khi dữ liệu được sinh dần theo luồng."""
+    return HEADER.pack(MAGIC, VERSION, flags, length, crc)
+
+
+def compress_payload(data):
+    """
+    Nén thử `data` bằng mọi thuật toán trong CODECS và giữ kết quả ngắn nhất.
+
+    Trả về bộ (dữ liệu, cờ nén); nếu không thuật toán nào làm dữ liệu ngắn hơn,
+    trả về chính `data` với cờ 0.
+    """
+    best, best_flag = data, 0
+    for flag, (compress, _) in CODECS.items():
+        packed = compress(data)
+        if len(packed) < len(best):
+            best, best_flag = packed, flag
+    return best, best_flag
+
+
+def decompress_payload(data, flags, max_length=MAX_DECOMPRESSED_SIZE):
+    """
+    Giải nén dữ liệu theo cờ nén trong `flags` (không nén thì trả về nguyên dữ liệu).
+
+    Ném ValueError nếu dữ liệu hỏng, bị cắt cụt hoặc dài hơn `max_length` byte sau khi
+    giải nén; bộ giải nén dừng ngay khi vượt giới hạn nên bộ nhớ không tăng quá mức này.
+    """
+    codec = flags & COMPRESSION_MASK
+    if not codec:
+        return data
+    decompressor = CODECS[codec][1]()
+    try:
+        result = decompressor.decompress(data, max_length + 1)
+    except (zlib.error, OSError, EOFError, lzma.LZMAError) as e:
+        raise ValueError(f"Không giải nén được payload: {e}") from e
+    if len(result) > max_length:
+        raise ValueError(f"Payload sau khi giải nén vượt quá {max_length} byte.")
+    if not decompressor.eof:
+        raise ValueError("Không giải nén được payload: dữ liệu nén bị cắt cụt.")
+    return result
+
+
+def pack_payload(data, flags=0, compress=False):
+    """
+    Ghép tiêu đề (magic, version, flags, độ dài, CRC32) vào trước dữ liệu bytes.
+
+    Với `compress=True`, dữ liệu được nén bằng thuật toán cho kết quả ngắn nhất
+    (compress_payload) và thuật toán được ghi vào flags để bên trích xuất giải nén.
+    """
+    if compress:
+        data, codec = compress_payload(data)
+        flags |= codec
+    return pack_header(len(data), zlib.crc32(data), flags) + data
+
+
+def unpack_header(header):
+    """
+    Đọc tiêu đề payload.
+
+    Trả về bộ (flags, length, crc). Ném ValueError nếu tiêu đề không hợp lệ,
+    ví dụ khi file không chứa tin.
+    """
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Không đủ dữ liệu để đọc tiêu đề payload.")
+    magic, version, flags, length, crc = HEADER.unpack(header[:HEADER_SIZE])
+    if magic != MAGIC:
+        raise ValueError("Không tìm thấy tiêu đề payload. File có thể không chứa tin.")
+    if version != VERSION:
+        raise ValueError(f"Không hỗ trợ phiên bản payload {version}.")
+    return flags, length, crc
+
+
+def verify_payload(data, length, crc, flags=0):
+    """
+    Kiểm tra độ dài và CRC32 của payload đã trích xuất, trả về dữ liệu đã giải nén
+    theo cờ nén trong `flags`.
+    """
+    if len(data) != length:
+        raise ValueError("Payload bị cắt cụt: file âm thanh không chứa đủ dữ liệu.")
+    if zlib.crc32(data) != crc:
+        raise ValueError("Sai CRC: payload bị hỏng.")
+    return decompress_payload(data, flags)
@@ -0,0 +1,152 @@
+from functools import partial
+
+import numpy as np
+
+from .lsb import bits_to_bytes, bytes_to_bits
+from .payload import HEADER_BITS, pack_payload, unpack_header, verify_payload
+from .streaming import stream_transform
+from .wav_io import map_data, parse_wav_header, read_params
+
+# Pha của tần số thấp (bin 1) ứng với bit '0' và bit '1'
+PHASE_0 = np.pi / 2
+PHASE_1 = -np.pi / 2
+
+def _frame_blocks(data, n_blocks, block_size):
+    """Xem `n_blocks` khối đầu tiên của dữ liệu dưới dạng mảng (n_blocks, block_size[, kênh])."""
+    return data[:n_blocks * block_size].reshape(n_blocks, block_size, *data.shape[1:])
+
+def phase_transform(secret_bits, block_size):
+    """
+    Tạo hàm mã hóa pha cho một khối âm thanh bắt đầu tại frame `start`.
+    Khối phải bắt đầu tại ranh giới của một khối FFT (bội số của `block_size`).
+    """
+    def transform(data, start):
+        stego_data = np.copy(data)
+        first_bit = start // block_size
+        last_bit = min(len(secret_bits), (start + len(data)) // block_size)
+        n_blocks = last_bit - first_bit
+        if n_blocks <= 0:
+            return stego_data
+
+        # Biến đổi Fourier tất cả các khối cùng lúc (mỗi hàng là một khối)
+        spectrum = np.fft.rfft(_frame_blocks(data, n_blocks, block_size), axis=1)
+
+        # Mã hóa bit vào pha tuyệt đối của tần số thấp (bin 1), giữ nguyên biên độ
+        target_phase = np.where(secret_bits[first_bit:last_bit] == 1, PHASE_1, PHASE_0)
+        target_phase = target_phase.reshape(-1, *([1] * (data.ndim - 1)))
+        spectrum[:, 1] = np.abs(spectrum[:, 1]) * np.exp(1j * target_phase)
+
+        # Chuyển đổi ngược về miền thời gian
+        stego_blocks = np.fft.irfft(spectrum, n=block_size, axis=1)
+        stego_data[:n_blocks * block_size] = stego_blocks.reshape(-1, *data.shape[1:])
+        return stego_data
+
+    return transform
+
+def _embed_phase_bits(carrier_file, secret_bits, output_file, block_frames, block_size):
+    """Giấu mảng bit đã có tiêu đề payload bằng phase coding; xem embed_phase."""
+    # Chỉ đọc tiêu đề để kiểm tra dung lượng trước khi nạp dữ liệu âm thanh
+    n_frames = read_params(carrier_file).nframes
+
+    # Mỗi khối block_size mẫu giấu được 1 bit
+    if len(secret_bits) > n_frames // block_size:
+        raise ValueError("File âm thanh quá nhỏ để giấu tin nhắn này.")
+
+    make_transform = partial(phase_transform, secret_bits, block_size)
+    if block_frames is not None:
+        stream_transform(carrier_file, output_file, make_transform, dtype=np.float64,
+                         align=block_size, block_frames=block_frames)
+        return len(secret_bits)
+
+    from scipy.io import wavfile
+    sample_rate, data = wavfile.read(carrier_file)
+
+    # Thực hiện biến đổi Fourier cho tất cả các khối trong một lần gọi
+    stego_data = make_transform()(data.astype(np.float64), 0)
+
+    # Chuẩn hóa lại dữ liệu và lưu
+    stego_data_int16 = np.int16(stego_data / np.max(np.abs(stego_data)) * 32767)
+    wavfile.write(output_file, sample_rate, stego_data_int16)
+    return len(secret_bits)
+
+def embed_phase(carrier_file, secret_message, output_file, block_frames=None, block_size=512, compress=True):
+    """
+    Giấu tin nhắn bằng phase coding, không in ra màn hình.
+
+    Ném FileNotFoundError/ValueError khi lỗi (file không hợp lệ, không đủ dung lượng),
+    để dùng trong các chương trình xử lý hàng loạt. Trả về số bit đã giấu (gồm tiêu đề).
+    Với `compress=True`, tin nhắn được nén trước khi giấu nếu việc nén làm nó ngắn hơn.
+    """
+    # Chuyển đổi tiêu đề payload và tin nhắn (đã nén nếu có lợi) thành mảng bit;
+    # mỗi bit tốn một khối FFT nên tin nhắn ngắn hơn giấu nhanh hơn tương ứng
+    secret_bits = bytes_to_bits(pack_payload(secret_message.encode('utf-8'), compress=compress))
+    return _embed_phase_bits(carrier_file, secret_bits, output_file, block_frames, block_size)
+
+def hide_message_phase_coding(carrier_file, secret_message, output_file, block_frames=None, block_size=512,
+                              compress=True):
+    """
+    Giấu một chuỗi tin nhắn vào file WAV bằng kỹ thuật phase coding đơn giản.
+
+    Mỗi bit được giấu vào pha của tần số thấp của một khối `block_size` mẫu;
+    tin nhắn (UTF-8) có tiêu đề payload ở trước để có thể trích xuất mà không cần file gốc.
+    Nếu `block_frames` được chỉ định, file được xử lý theo dạng luồng từng khối
+    (bộ nhớ không phụ thuộc độ dài file), cho kết quả giống hệt khi đọc toàn bộ.
+    """
+    secret_bits = bytes_to_bits(pack_payload(secret_message.encode('utf-8'), compress=compress))
+    print(f"Tin nhắn bí mật: {len(secret_bits)} bit (gồm tiêu đề)")
+    try:
+        _embed_phase_bits(carrier_file, secret_bits, output_file, block_frames, block_size)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {carrier_file}")
+        return
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return
+    print(f"Đã giấu tin nhắn vào file: {output_file}")
+
+
+def decode_phase_bits(data, block_size):
+    """Giải các bit từ pha của bin 1 của mọi khối trong `data` bằng một lần gọi rfft."""
+    n_blocks = len(data) // block_size
+    low_freq = np.fft.rfft(_frame_blocks(data.astype(np.float64), n_blocks, block_size), axis=1)[:, 1]
+    if low_freq.ndim > 1:
+        # Các kênh mang cùng một bit nên cộng lại để tăng độ tin cậy
+        low_freq = low_freq.sum(axis=1)
+    return (np.angle(low_freq) < 0).astype(np.uint8)
+
+def extract_phase(stego_file, block_size=512):
+    """
+    Trích xuất tin nhắn đã giấu bằng phase coding, không in ra màn hình.
+
+    Chỉ các khối chứa tiêu đề, sau đó đúng số khối chứa tin nhắn được đọc
+    (qua np.memmap) và giải trong một lần biến đổi Fourier theo lô.
+    Ném FileNotFoundError/ValueError khi lỗi.
+    """
+    info = parse_wav_header(stego_file)
+    data = map_data(stego_file, info=info)
+    if info.nchannels > 1:
+        data = data.reshape(-1, info.nchannels)
+
+    header_bits = decode_phase_bits(data[:HEADER_BITS * block_size], block_size)
+    flags, length, crc = unpack_header(bits_to_bytes(header_bits))
+
+    total_bits = HEADER_BITS + length * 8
+    if total_bits * block_size > len(data):
+        raise ValueError("Độ dài tin nhắn trong tiêu đề vượt quá dung lượng file âm thanh.")
+
+    message_bits = decode_phase_bits(data[HEADER_BITS * block_size:total_bits * block_size], block_size)
+    return verify_payload(bits_to_bytes(message_bits), length, crc, flags).decode('utf-8', errors='replace')
+
+def extract_message_phase_coding(stego_file, block_size=512):
+    """Trích xuất tin nhắn từ file WAV đã giấu bằng phase coding (xem extract_phase)."""
+    try:
+        message = extract_phase(stego_file, block_size)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {stego_file}")
+        return None
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return None
+
+    print(f"Tin nhắn đã trích xuất: {message}")
+    return message
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Số chip trong mỗi khối của chuỗi giả ngẫu nhiên; mỗi khối được sinh độc lập
+BLOCK_CHIPS = 64
+
+# Giới hạn mặc định của bộ nhớ đệm các khối đã sinh (byte)
+DEFAULT_CACHE_BYTES = 64 << 20
+
+
+def _seed(key):
+    """Chuyển khóa (số nguyên, chuỗi hoặc bytes) thành số nguyên không âm để làm entropy."""
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    if isinstance(key, bytes):
+        return int.from_bytes(hashlib.sha256(key).digest(), 'big')
+    # SeedSequence không nhận số âm; đưa về [0, 2**256) như khóa đã băm, giữ nguyên
+    # các khóa không âm để file đã giấu trước đây vẫn giải được
+    return int(key) % (1 << 256) if key < 0 else key
+
+
+class PNCache:
+    """
+    Bộ nhớ đệm LRU cho các khối chuỗi giả ngẫu nhiên, giới hạn theo tổng số byte.
+
+    An toàn khi dùng từ nhiều thread. Các mảng được trả về ở chế độ chỉ đọc
+    vì chúng được dùng chung giữa các lần gọi.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key, factory):
+        """Trả về khối ứng với `cache_key`, gọi `factory()` để sinh khối nếu chưa có trong bộ nhớ đệm."""
+        with self._lock:
+            block = self._blocks.get(cache_key)
+            if block is not None:
+                self._blocks.move_to_end(cache_key)
+                return block
+
+        block = factory()
+        block.flags.writeable = False
+        if block.nbytes > self.max_bytes:
+            return block
+
+        with self._lock:
+            if cache_key not in self._blocks:
+                self._blocks[cache_key] = block
+                self.nbytes += block.nbytes
+            # Loại các khối lâu chưa dùng nhất cho đến khi về dưới giới hạn
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._blocks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return block
+
+    def clear(self):
+        """Xóa toàn bộ bộ nhớ đệm."""
+        with self._lock:
+            self._blocks.clear()
+            self.nbytes = 0
+
+
+pn_cache = PNCache()
+
+
+def _generate_block(key, chip_size, index):
+    """
+    Sinh khối thứ `index` (BLOCK_CHIPS * chip_size mẫu) của chuỗi nhiễu Gauss.
+
+    Dùng bộ sinh đếm Philox: khóa Philox lấy từ (key, chip_size), còn chỉ số khối
+    nằm ở word cao của bộ đếm, nên mỗi khối được sinh trực tiếp mà không cần sinh
+    các khối đứng trước.
+    """
+    philox_key = np.random.SeedSequence([_seed(key), chip_size]).generate_state(2, np.uint64)
+    bit_generator = np.random.Philox(key=philox_key, counter=[0, 0, 0, index])
+    return np.random.Generator(bit_generator).standard_normal(BLOCK_CHIPS * chip_size)
+
+
+def pn_block(key, chip_size, index, cache=None):
+    """Khối thứ `index` của chuỗi giả ngẫu nhiên ứng với (key, chip_size), lấy từ bộ nhớ đệm nếu có."""
+    cache = pn_cache if cache is None else cache
+    return cache.get((key, chip_size, index), lambda: _generate_block(key, chip_size, index))
+
+
+def pn_range(key, chip_size, start, stop, cache=None):
+    """
+    Trả về các mẫu [start, stop) của chuỗi giả ngẫu nhiên ứng với (key, chip_size).
+
+    Chỉ các khối phủ đoạn được yêu cầu được sinh (hoặc lấy từ bộ nhớ đệm), nên chi
+    phí không phụ thuộc vị trí `start`.
+    """
+    block_len = BLOCK_CHIPS * chip_size
+    first, last = start // block_len, (stop - 1) // block_len
+    if stop <= start:
+        return np.empty(0)
+    if first == last:
+        return pn_block(key, chip_size, first, cache)[start - first * block_len:stop - first * block_len]
+    blocks = [pn_block(key, chip_size, i, cache) for i in range(first, last + 1)]
+    return np.concatenate(blocks)[start - first * block_len:stop - first * block_len]
@@ -0,0 +1,329 @@
+from functools import partial
+import wave
+
+import numpy as np
+
+from .lsb import bits_to_bytes, bytes_to_bits
+from .payload import HEADER_BITS, pack_payload, unpack_header, verify_payload
+from .pn import pn_range
+from .streaming import DEFAULT_BLOCK_FRAMES, read_float_blocks, stream_transform
+from .wav_io import map_data, parse_wav_header, read_params
+
+# Khóa mặc định của chuỗi giả ngẫu nhiên, đây là chìa khóa để giấu và trích xuất
+PN_KEY = 42
+
+# Độ dài chuỗi đồng bộ (preamble) ở chế độ sync, tính theo số chip_size mẫu
+SYNC_CHIPS = 16
+
+# Tỉ số tín hiệu/nhiễu của tương quan mỗi bit khi biên độ được chọn tự động. Với biên độ
+# `a`, tương quan của một bit lệch khỏi 0 khoảng a * sqrt(chip_size) / RMS lần độ lệch
+# chuẩn của phần nhiễu do âm thanh gốc gây ra; 6 lần cho xác suất sai bit cỡ 1e-9
+TARGET_SNR = 6.0
+
+def binary_message(message):
+    """Chuyển đổi chuỗi tin nhắn (UTF-8) thành mảng bit nhị phân."""
+    return bytes_to_bits(message.encode('utf-8'))
+
+def sync_preamble(chip_size=1000, key=PN_KEY):
+    """Chuỗi đồng bộ (SYNC_CHIPS * chip_size mẫu) đặt trước payload ở chế độ sync, sinh từ khóa riêng."""
+    return pn_range(f'sync:{key}', chip_size, 0, SYNC_CHIPS * chip_size)
+
+def default_amplitude(samples, chip_size=1000, chunk_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Biên độ chuỗi nhiễu đủ để giải đúng tin trên `samples` (phần âm thanh sẽ chứa tin):
+    TARGET_SNR * RMS / sqrt(chip_size), theo đơn vị mẫu của file (int16: -32768..32767).
+
+    RMS được tính theo từng đoạn `chunk_frames` mẫu (nên `samples` có thể là np.memmap)
+    và gồm cả thành phần một chiều (ví dụ offset 128 của WAV 8 bit), vì tương quan khi
+    trích xuất không loại bỏ nó. RMS tối thiểu là 1 bước lượng tử để file gần như im
+    lặng vẫn giải được sau khi làm tròn.
+    """
+    samples = samples.reshape(-1)
+    total_sq = 0.0
+    for i in range(0, len(samples), chunk_frames):
+        chunk = np.asarray(samples[i:i + chunk_frames], dtype=np.float64)
+        total_sq += np.dot(chunk, chunk)
+    rms = np.sqrt(total_sq / max(len(samples), 1))
+    return TARGET_SNR * max(rms, 1.0) / np.sqrt(chip_size)
+
+def spread_transform(secret_bits, chip_size, amplitude, key, sync=False):
+    """
+    Tạo hàm phân tán tin nhắn vào các khối âm thanh liên tiếp (bắt đầu từ frame 0).
+    Chuỗi nhiễu của mỗi khối được lấy theo vị trí từ pn_range nên giống hệt khi sinh
+    một lần cho cả file.
+    Với `sync=True`, chuỗi đồng bộ được giấu trước và tin nhắn bắt đầu ngay sau nó.
+    """
+    preamble = sync_preamble(chip_size, key) * amplitude if sync else np.empty(0)
+    sync_len = len(preamble)
+    # Bit '1' nhân chuỗi ngẫu nhiên với 1, bit '0' nhân với -1
+    signs = np.where(secret_bits == 1, 1.0, -1.0)
+    total_data_points_needed = len(secret_bits) * chip_size
+
+    def transform(data, start):
+        stego_audio = np.copy(data)
+
+        # Giấu phần chuỗi đồng bộ rơi vào đoạn này
+        sync_part = preamble[start:start + len(data)]
+        if len(sync_part):
+            stego_audio[:len(sync_part)] += sync_part[:, None] if data.ndim > 1 else sync_part
+
+        # Vị trí của đoạn này tính từ đầu tin nhắn (luôn là bội số của chip_size)
+        begin = max(start, sync_len) - sync_len
+        end = min(start + len(data) - sync_len, total_data_points_needed)
+        if end <= begin:
+            return stego_audio
+
+        # Tạo chuỗi nhiễu giả ngẫu nhiên cho đoạn này, mỗi hàng ứng với 1 bit
+        pn_sequence = pn_range(key, chip_size, begin, end).reshape(-1, chip_size) * amplitude
+
+        # Phân tán tin nhắn vào chuỗi nhiễu bằng một phép nhân broadcast
+        embedded_sequence = (pn_sequence * signs[begin // chip_size:end // chip_size, None]).ravel()
+        if data.ndim > 1:
+            embedded_sequence = embedded_sequence[:, None]
+
+        # Giấu tín hiệu đã phân tán vào đoạn âm thanh
+        offset = begin + sync_len - start
+        stego_audio[offset:offset + end - begin] += embedded_sequence
+        return stego_audio
+
+    return transform
+
+def _secret_bits(secret_message, sync, compress):
+    """Mã hóa tin nhắn thành mảng bit: kèm tiêu đề payload (nén nếu có lợi) ở chế độ sync."""
+    if sync:
+        return bytes_to_bits(pack_payload(secret_message.encode('utf-8'), compress=compress))
+    return binary_message(secret_message)
+
+def _embed_spread_bits(carrier_file, secret_bits, output_file, block_frames, chip_size, amplitude, key, sync):
+    """Giấu mảng bit đã mã hóa (_secret_bits) bằng Spread Spectrum; xem embed_spread."""
+    # Chỉ đọc tiêu đề để kiểm tra dung lượng trước khi nạp dữ liệu âm thanh
+    n_frames = read_params(carrier_file).nframes
+
+    # Kiểm tra xem file có đủ lớn để giấu tin không
+    total_data_points_needed = len(secret_bits) * chip_size + (SYNC_CHIPS * chip_size if sync else 0)
+    if total_data_points_needed > n_frames:
+        raise ValueError("File âm thanh quá nhỏ để giấu tin nhắn này.")
+
+    if amplitude is None:
+        # Chỉ đọc các frame sẽ chứa tin (qua np.memmap) để đo RMS
+        info = parse_wav_header(carrier_file)
+        region = map_data(carrier_file, info=info)[:total_data_points_needed * info.nchannels]
+        amplitude = default_amplitude(region, chip_size)
+    elif amplitude <= 0:
+        raise ValueError("Biên độ chuỗi nhiễu phải lớn hơn 0.")
+
+    make_transform = partial(spread_transform, secret_bits, chip_size, amplitude, key, sync)
+    if block_frames is not None:
+        stream_transform(carrier_file, output_file, make_transform, dtype=np.float64,
+                         align=chip_size, block_frames=block_frames)
+        return len(secret_bits)
+
+    from scipy.io import wavfile
+    sample_rate, data = wavfile.read(carrier_file)
+
+    # Giấu tín hiệu đã phân tán vào file âm thanh (dạng float)
+    stego_audio = make_transform()(data.astype(np.float64), 0)
+    
+    # Chuẩn hóa lại dữ liệu và lưu
+    stego_audio_int16 = np.int16(stego_audio / np.max(np.abs(stego_audio)) * 32767)
+    wavfile.write(output_file, sample_rate, stego_audio_int16)
+    return len(secret_bits)
+
+def embed_spread(carrier_file, secret_message, output_file, block_frames=None,
+                 chip_size=1000, amplitude=None, key=PN_KEY, sync=False, compress=True):
+    """
+    Giấu tin nhắn bằng Spread Spectrum, không in ra màn hình.
+
+    Ném FileNotFoundError/ValueError khi lỗi (file không hợp lệ, không đủ dung lượng,
+    biên độ không dương), để dùng trong các chương trình xử lý hàng loạt. Trả về số
+    bit đã giấu. `amplitude=None` chọn biên độ theo RMS của phần âm thanh chứa tin
+    (default_amplitude).
+    Với `sync=True` và `compress=True`, tin nhắn được nén trước khi giấu nếu việc nén
+    làm nó ngắn hơn; khi không có sync, tin nhắn không có tiêu đề nên luôn giấu nguyên.
+    """
+    secret_bits = _secret_bits(secret_message, sync, compress)
+    return _embed_spread_bits(carrier_file, secret_bits, output_file, block_frames, chip_size, amplitude, key, sync)
+
+def spread_spectrum_embed(carrier_file, secret_message, output_file, block_frames=None,
+                          chip_size=1000, amplitude=None, key=PN_KEY, sync=False, compress=True):
+    """
+    Giấu một chuỗi tin nhắn vào file WAV bằng kỹ thuật Spread Spectrum.
+
+    Mỗi bit được trải trên `chip_size` mẫu của chuỗi nhiễu có biên độ `amplitude`,
+    sinh từ khóa `key`. `amplitude` tính theo đơn vị mẫu của file (int16: -32768..32767);
+    giải mã tin cậy cần amplitude * sqrt(chip_size) khoảng 5-6 lần RMS của âm thanh gốc,
+    ví dụ với chip_size=1000 và nhạc có RMS 3000 là khoảng 500. Mặc định (None) biên độ
+    được chọn tự động theo RMS của phần âm thanh chứa tin. Nếu `block_frames` được chỉ định, file được xử lý theo dạng
+    luồng từng khối (bộ nhớ không phụ thuộc độ dài file), cho kết quả giống hệt khi
+    đọc toàn bộ.
+
+    Với `sync=True`, tin nhắn được giấu kèm tiêu đề payload (độ dài, CRC32) sau một
+    chuỗi đồng bộ, nên có thể trích xuất bằng spread_spectrum_extract_sync mà không
+    cần biết độ dài tin nhắn hay vị trí bắt đầu (ví dụ sau khi file bị cắt hoặc ghép);
+    khi đó tin nhắn được nén nếu `compress=True` và việc nén làm nó ngắn hơn.
+    """
+    secret_bits = _secret_bits(secret_message, sync, compress)
+    print(f"Tin nhắn bí mật: {len(secret_bits)} bit")
+    try:
+        _embed_spread_bits(carrier_file, secret_bits, output_file, block_frames, chip_size, amplitude, key, sync)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {carrier_file}")
+        return
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return
+    print(f"Đã giấu tin nhắn vào file: {output_file}")
+
+
+def despread_bits(blocks, secret_message_length_bits, chip_size, key):
+    """Quyết định các bit bằng tương quan giữa các khối tín hiệu liên tiếp và chuỗi nhiễu."""
+    total_data_points = secret_message_length_bits * chip_size
+
+    extracted_bits = []
+    start = 0
+    for data in blocks:
+        # Chỉ xét các đoạn đủ chip_size mẫu
+        end = min(start + len(data), total_data_points)
+        end -= (end - start) % chip_size
+        if end <= start:
+            break
+        if data.ndim > 1:
+            data = data.mean(axis=1)
+        # Tái tạo chuỗi giả ngẫu nhiên giống hệt khi giấu (biên độ không ảnh hưởng dấu tương quan).
+        # Các khối đã sinh được giữ trong bộ nhớ đệm nên những lần trích xuất sau với cùng
+        # khóa chỉ còn chi phí tính tương quan.
+        pn_sequence = pn_range(key, chip_size, start, end).reshape(-1, chip_size)
+
+        # Tương quan của từng đoạn với chuỗi ngẫu nhiên: tích vô hướng theo hàng
+        stego_segments = data[:end - start].reshape(-1, chip_size)
+        correlation = np.einsum('ij,ij->i', stego_segments, pn_sequence)
+        extracted_bits.append((correlation > 0).astype(np.uint8))
+        start += len(data)
+    return np.concatenate(extracted_bits) if extracted_bits else np.empty(0, dtype=np.uint8)
+
+def extract_spread(stego_file, secret_message_length_bits, block_frames=None, chip_size=1000, key=PN_KEY):
+    """
+    Trích xuất tin nhắn (biết trước độ dài) đã giấu bằng Spread Spectrum, không in ra
+    màn hình. Ném FileNotFoundError/ValueError khi lỗi.
+    """
+    if block_frames is None:
+        from scipy.io import wavfile
+        sample_rate, data = wavfile.read(stego_file)
+        data = data[:secret_message_length_bits * chip_size].astype(np.float64)
+        extracted_bits = despread_bits([data], secret_message_length_bits, chip_size, key)
+    else:
+        block_frames = max(chip_size, block_frames - block_frames % chip_size)
+        with wave.open(stego_file, 'rb') as audio_file:
+            blocks = read_float_blocks(audio_file, np.float64, block_frames)
+            extracted_bits = despread_bits(blocks, secret_message_length_bits, chip_size, key)
+
+    # Chuyển đổi mảng bit thành tin nhắn
+    return bits_to_bytes(extracted_bits).decode('utf-8', errors='replace')
+
+def spread_spectrum_extract(stego_file, secret_message_length_bits, block_frames=None,
+                            chip_size=1000, key=PN_KEY):
+    """
+    Trích xuất tin nhắn từ file WAV đã giấu bằng Spread Spectrum.
+
+    `chip_size` và `key` phải giống giá trị khi giấu. Nếu `block_frames` được chỉ
+    định, chỉ các frame chứa tin được đọc, theo từng khối.
+    """
+    try:
+        message = extract_spread(stego_file, secret_message_length_bits, block_frames, chip_size, key)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {stego_file}")
+        return ""
+    except ValueError:
+        print("Lỗi: File WAV không đúng định dạng. Đảm bảo file là định dạng PCM.")
+        return ""
+    
+    print(f"Tin nhắn đã trích xuất: {message}")
+    return message
+
+
+def _mono(data):
+    """Lấy trung bình các kênh (nếu có) dưới dạng float64."""
+    data = data.astype(np.float64)
+    return data.mean(axis=1) if data.ndim > 1 else data
+
+def find_sync_offset(data, chip_size=1000, key=PN_KEY, chunk_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Tìm vị trí bắt đầu của chuỗi đồng bộ trong tín hiệu `data` (mảng hoặc np.memmap).
+
+    Tương quan chéo chuẩn hóa được tính bằng FFT (scipy.signal.fftconvolve), với độ
+    phức tạp O(n log n), trên từng đoạn `chunk_frames` frame chồng lấn nhau
+    `len(preamble) - 1` mẫu, nên bộ nhớ không phụ thuộc độ dài file.
+    Trả về bộ (vị trí, độ tương quan chuẩn hóa trong [-1, 1]), hoặc (None, 0.0)
+    nếu tín hiệu ngắn hơn chuỗi đồng bộ.
+    """
+    from scipy.signal import fftconvolve
+
+    preamble = sync_preamble(chip_size, key)
+    sync_len = len(preamble)
+    template = preamble[::-1] / np.linalg.norm(preamble)
+    chunk_frames = max(chunk_frames, 2 * sync_len)
+
+    best_offset, best_score = None, 0.0
+    for chunk_start in range(0, max(len(data) - sync_len + 1, 0), chunk_frames - sync_len + 1):
+        chunk = _mono(data[chunk_start:chunk_start + chunk_frames])
+        if len(chunk) < sync_len:
+            break
+        correlation = fftconvolve(chunk, template, mode='valid')
+
+        # Chuẩn hóa theo năng lượng của từng cửa sổ để đoạn âm lớn không lấn át đỉnh tương quan
+        energy = np.cumsum(np.concatenate(([0.0], chunk * chunk)))
+        window_energy = energy[sync_len:] - energy[:-sync_len]
+        scores = correlation / np.sqrt(np.maximum(window_energy, np.finfo(np.float64).tiny))
+
+        i = int(np.argmax(scores))
+        if best_offset is None or scores[i] > best_score:
+            best_offset, best_score = chunk_start + i, float(scores[i])
+    return best_offset, best_score
+
+def extract_spread_sync(stego_file, chip_size=1000, key=PN_KEY, chunk_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Trích xuất tin nhắn đã giấu với `sync=True` mà không cần biết độ dài hay vị trí bắt đầu.
+
+    Chuỗi đồng bộ được tìm bằng find_sync_offset trên dữ liệu ánh xạ bộ nhớ (np.memmap),
+    sau đó tiêu đề payload và tin nhắn được giải từ vị trí tìm được và kiểm tra CRC32.
+    Trả về bộ (tin nhắn, vị trí chuỗi đồng bộ, độ tương quan); không in ra màn hình và
+    ném FileNotFoundError/ValueError khi lỗi.
+    """
+    info = parse_wav_header(stego_file)
+    data = map_data(stego_file, info=info)
+    if info.nchannels > 1:
+        data = data.reshape(-1, info.nchannels)
+
+    offset, score = find_sync_offset(data, chip_size, key, chunk_frames)
+    if offset is None:
+        raise ValueError("File âm thanh ngắn hơn chuỗi đồng bộ.")
+
+    start = offset + SYNC_CHIPS * chip_size
+    header_bits = despread_bits([_mono(data[start:start + HEADER_BITS * chip_size])], HEADER_BITS, chip_size, key)
+    flags, length, crc = unpack_header(bits_to_bytes(header_bits))
+
+    total_bits = HEADER_BITS + length * 8
+    if start + total_bits * chip_size > len(data):
+        raise ValueError("Độ dài tin nhắn trong tiêu đề vượt quá dung lượng file âm thanh.")
+
+    extracted_bits = despread_bits([_mono(data[start:start + total_bits * chip_size])], total_bits, chip_size, key)
+    message = verify_payload(bits_to_bytes(extracted_bits[HEADER_BITS:]), length, crc, flags).decode('utf-8', errors='replace')
+    return message, offset, score
+
+def spread_spectrum_extract_sync(stego_file, chip_size=1000, key=PN_KEY, chunk_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Trích xuất tin nhắn đã giấu với `sync=True` mà không cần biết độ dài hay vị trí
+    bắt đầu (xem extract_spread_sync).
+    """
+    try:
+        message, offset, score = extract_spread_sync(stego_file, chip_size, key, chunk_frames)
+    except FileNotFoundError:
+        print(f"Lỗi: Không tìm thấy file âm thanh {stego_file}")
+        return None
+    except ValueError as e:
+        print(f"Lỗi: {e}")
+        return None
+
+    print(f"Tìm thấy chuỗi đồng bộ tại mẫu {offset} (tương quan {score:.3f})")
+    print(f"Tin nhắn đã trích xuất: {message}")
+    return message
@@ -0,0 +1,50 @@
+# Steghide phải được cài đặt và có thể chạy từ terminal/command line.
+# Lệnh 'steghide' được gọi thông qua subprocess, chỉ nạp khi thực sự chạy steghide.
+# Biến môi trường STEGHIDE thay thế lệnh được gọi, ví dụ STEGHIDE="python fake_steghide.py"
+# để chạy thử bằng chương trình giả lập đi kèm khi chưa cài steghide.
+import os
+import shlex
+
+
+def steghide_command():
+    """Lệnh (dạng danh sách) dùng để gọi steghide, lấy từ biến môi trường STEGHIDE nếu có."""
+    return shlex.split(os.environ.get('STEGHIDE', 'steghide'))
+
+
+def run_steghide_embed(input_file, secret_file, output_file, password):
+    """Sử dụng Steghide để nhúng một file bí mật vào file audio."""
+    import subprocess
+
+    print("\n--- Bắt đầu nhúng lớp thứ nhất (Steghide) ---")
+    print(f"Nhúng file '{secret_file}' vào file '{input_file}'...")
+    
+    command = [*steghide_command(), "embed", "-cf", input_file, "-ef", secret_file, "-sf", output_file, "-p", password, "-f"]
+    try:
+        subprocess.run(command, check=True, text=True, capture_output=True)
+        print(f"Nhúng Steghide thành công. File âm thanh mới được lưu tại: {output_file}")
+        return True
+    except FileNotFoundError:
+        print("Lỗi: Steghide không được tìm thấy. Hãy đảm bảo nó đã được cài đặt và nằm trong PATH.")
+        return False
+    except subprocess.CalledProcessError as e:
+        print(f"Lỗi khi chạy Steghide: {e.stderr}")
+        return False
+
+def run_steghide_extract(input_file, output_path, password):
+    """Sử dụng Steghide để trích xuất file bí mật từ file audio."""
+    import subprocess
+
+    print("\n--- Bắt đầu trích xuất lớp Steghide ---")
+    print(f"Trích xuất file từ '{input_file}'...")
+
+    command = [*steghide_command(), "extract", "-sf", input_file, "-p", password, "-xf", output_path, "-f"]
+    try:
+        subprocess.run(command, check=True, text=True, capture_output=True)
+        print(f"Trích xuất Steghide thành công. File bí mật được lưu tại: {output_path}")
+        return True
+    except FileNotFoundError:
+        print("Lỗi: Steghide không được tìm thấy. Hãy đảm bảo nó đã được cài đặt và nằm trong PATH.")
+        return False
+    except subprocess.CalledProcessError as e:
+        print(f"Lỗi khi chạy Steghide: {e.stderr}")
+        return False
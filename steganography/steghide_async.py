@@ -0,0 +1,138 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+from .steghide import steghide_command
+
+# Thư mục tạm nằm trên RAM (tmpfs) nếu hệ thống có, để file trung gian không chạm đĩa
+TMPFS_DIR = '/dev/shm'
+
+
+class SteghideError(RuntimeError):
+    """Steghide kết thúc với mã lỗi; `returncode` và `stderr` chứa thông tin từ tiến trình."""
+
+    def __init__(self, returncode, stderr):
+        super().__init__(f"Steghide lỗi (mã {returncode}): {stderr.strip()}")
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def _default_staging_dir():
+    if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK):
+        return TMPFS_DIR
+    return None
+
+
+class SteghideRunner:
+    """
+    Chạy nhiều tiến trình steghide đồng thời bằng asyncio.
+
+    Số tiến trình chạy cùng lúc được giới hạn bởi một semaphore (`max_concurrency`,
+    mặc định bằng số CPU). Dữ liệu truyền vào dạng bytes và kết quả được ghi vào một
+    thư mục tạm riêng cho từng tác vụ (mặc định trên tmpfs), thư mục này bị xóa khi
+    tác vụ kết thúc. Việc ghi dữ liệu vào thư mục tạm và đọc kết quả chạy trong thread
+    riêng (asyncio.to_thread) để file lớn không chặn vòng lặp sự kiện. Mỗi tác vụ có
+    thể có thời gian chờ tối đa `timeout` (giây); khi hết giờ hoặc khi tác vụ bị hủy,
+    tiến trình steghide bị dừng ngay.
+    """
+
+    def __init__(self, max_concurrency=None, timeout=None, command=None, staging_dir=None):
+        self.command = list(command) if command is not None else steghide_command()
+        self.timeout = timeout
+        self.staging_dir = staging_dir if staging_dir is not None else _default_staging_dir()
+        self._semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+
+    async def _run(self, args, timeout):
+        """Chạy steghide với `args`; ném SteghideError, TimeoutError hoặc CancelledError."""
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *self.command, *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(),
+                                                   self.timeout if timeout is None else timeout)
+            except BaseException:
+                # Hết giờ hoặc bị hủy: dừng tiến trình để không để lại tiến trình mồ côi
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+            if process.returncode != 0:
+                raise SteghideError(process.returncode, stderr.decode('utf-8', errors='replace'))
+
+    def _stage(self, workdir, name, data):
+        """Ghi `data` (bytes) vào thư mục tạm và trả về đường dẫn; đường dẫn được giữ nguyên."""
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return os.fspath(data)
+        path = os.path.join(workdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    async def embed(self, cover, secret, password, output=None, timeout=None):
+        """
+        Nhúng `secret` vào file âm thanh `cover` bằng steghide.
+
+        `cover` và `secret` là đường dẫn hoặc bytes (bytes được ghi vào thư mục tạm).
+        Nếu `output` là None, trả về nội dung file kết quả dạng bytearray; ngược lại
+        file kết quả được chuyển tới `output` và trả về `output`.
+        """
+        with tempfile.TemporaryDirectory(prefix='steghide-', dir=self.staging_dir) as workdir:
+            cover_path = await asyncio.to_thread(self._stage, workdir, 'cover.wav', cover)
+            secret_path = await asyncio.to_thread(self._stage, workdir, 'secret.bin', secret)
+            stego_path = os.path.join(workdir, 'stego.wav')
+            await self._run(['embed', '-cf', cover_path, '-ef', secret_path, '-sf', stego_path,
+                             '-p', password, '-f', '-q'], timeout)
+            return await asyncio.to_thread(_collect, stego_path, output)
+
+    async def extract(self, stego, password, output=None, timeout=None):
+        """
+        Trích xuất file đã nhúng bằng steghide từ `stego` (đường dẫn hoặc bytes).
+
+        Trả về nội dung đã trích xuất dạng bytearray nếu `output` là None, ngược lại
+        ghi ra `output` và trả về `output`.
+        """
+        with tempfile.TemporaryDirectory(prefix='steghide-', dir=self.staging_dir) as workdir:
+            stego_path = await asyncio.to_thread(self._stage, workdir, 'stego.wav', stego)
+            secret_path = os.path.join(workdir, 'secret.bin')
+            await self._run(['extract', '-sf', stego_path, '-p', password, '-xf', secret_path,
+                             '-f', '-q'], timeout)
+            return await asyncio.to_thread(_collect, secret_path, output)
+
+    async def run(self, jobs):
+        """
+        Chạy đồng thời danh sách tác vụ, mỗi tác vụ là dict gồm 'op' ('embed' hoặc
+        'extract') và các tham số của embed/extract.
+
+        Trả về danh sách kết quả theo thứ tự của `jobs`; tác vụ lỗi có kết quả là
+        ngoại lệ tương ứng thay vì làm dừng các tác vụ khác.
+        """
+        async def run_job(job):
+            params = dict(job)
+            return await getattr(self, params.pop('op'))(**params)
+
+        return await asyncio.gather(*(run_job(job) for job in jobs), return_exceptions=True)
+
+
+def _collect(path, output):
+    if output is None:
+        # Đọc vào bytearray để lớp tiếp theo có thể sửa trực tiếp mà không cần sao chép
+        with open(path, 'rb') as f:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+        return data
+    # shutil.move dùng os.rename khi cùng hệ thống file, sao chép nếu khác (ví dụ từ tmpfs)
+    shutil.move(path, output)
+    return output
+
+
+def run_steghide_jobs(jobs, max_concurrency=None, timeout=None, command=None):
+    """Chạy SteghideRunner.run từ mã đồng bộ; xem SteghideRunner.run."""
+    async def main():
+        return await SteghideRunner(max_concurrency, timeout, command).run(jobs)
+
+    return asyncio.run(main())
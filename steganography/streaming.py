@@ -0,0 +1,117 @@
+import wave
+
+import numpy as np
+
+from .lsb import embed_bits, sample_dtype
+
+# Số frame mặc định cho mỗi khối khi xử lý dạng luồng (~256 KB với 16-bit mono)
+DEFAULT_BLOCK_FRAMES = 1 << 17
+
+
+class BitStream:
+    """Cung cấp dần các bit từ một nguồn bytes (hoặc một iterable các đoạn bytes)."""
+
+    def __init__(self, chunks):
+        if isinstance(chunks, (bytes, bytearray, memoryview)):
+            chunks = [chunks]
+        self._chunks = iter(chunks)
+        self._buffer = np.empty(0, dtype=np.uint8)
+
+    def read(self, n):
+        """Lấy tối đa `n` bit tiếp theo (mảng uint8). Trả về mảng rỗng khi đã hết dữ liệu."""
+        parts = [self._buffer]
+        available = len(self._buffer)
+        while available < n:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            bits = np.unpackbits(np.frombuffer(chunk, dtype=np.uint8))
+            parts.append(bits)
+            available += len(bits)
+        buffer = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        self._buffer = buffer[n:]
+        return buffer[:n]
+
+
+def iter_frames(audio_file, block_frames=DEFAULT_BLOCK_FRAMES):
+    """Sinh lần lượt các khối frame (bytes) từ vị trí hiện tại của một wave.Wave_read."""
+    while True:
+        frames = audio_file.readframes(block_frames)
+        if not frames:
+            return
+        yield frames
+
+
+def stream_embed_bits(input_path, output_path, payload, unit_dtype=None, bit=0,
+                      block_frames=DEFAULT_BLOCK_FRAMES, k=1):
+    """
+    Giấu payload vào `k` bit bắt đầu từ bit thứ `bit` của file WAV, theo từng khối frame.
+
+    `payload` là bytes hoặc một iterable các đoạn bytes, được tiêu thụ dần theo
+    từng khối nên bộ nhớ chỉ phụ thuộc `block_frames`. `unit_dtype` là kiểu của
+    đơn vị mang tin; mặc định là kiểu mẫu theo độ rộng mẫu của file.
+    Trả về số bit đã giấu. Ném ValueError nếu payload dài hơn dung lượng file.
+    """
+    bits = BitStream(payload)
+    n_embedded = 0
+    with wave.open(input_path, 'rb') as src, wave.open(output_path, 'wb') as dst:
+        dst.setparams(src.getparams())
+        dtype = np.dtype(unit_dtype) if unit_dtype is not None else sample_dtype(src.getsampwidth())
+
+        for frames in iter_frames(src, block_frames):
+            units = np.frombuffer(frames, dtype=dtype)
+            block_bits = bits.read(len(units) * k)
+            if len(block_bits):
+                units = embed_bits(units.copy(), block_bits, bit, k)
+                n_embedded += len(block_bits)
+            dst.writeframes(memoryview(units))
+
+    if len(bits.read(1)):
+        raise ValueError("Payload dài hơn dung lượng của file âm thanh.")
+    return n_embedded
+
+
+def read_float_blocks(audio_file, dtype, block_frames):
+    """Sinh các khối mẫu dạng số thực, cùng hình dạng với dữ liệu của scipy.io.wavfile.read."""
+    n_channels = audio_file.getnchannels()
+    pcm_dtype = sample_dtype(audio_file.getsampwidth())
+    for frames in iter_frames(audio_file, block_frames):
+        block = np.frombuffer(frames, dtype=pcm_dtype)
+        if n_channels > 1:
+            block = block.reshape(-1, n_channels)
+        yield block.astype(dtype)
+
+
+def stream_transform(input_path, output_path, make_transform, dtype=np.float64,
+                     align=1, block_frames=DEFAULT_BLOCK_FRAMES):
+    """
+    Áp dụng một phép biến đổi theo khối lên file WAV rồi chuẩn hóa về int16, theo dạng luồng.
+
+    `make_transform()` trả về một hàm `transform(block, start_frame)` nhận các khối
+    theo đúng thứ tự từ đầu file; nó được gọi lại ở mỗi lượt duyệt. Lượt thứ nhất
+    tìm biên độ lớn nhất của tín hiệu đã giấu tin, lượt thứ hai chuẩn hóa và ghi ra
+    file, nên kết quả giống hệt đường xử lý trong bộ nhớ
+    `np.int16(stego / np.max(np.abs(stego)) * 32767)`.
+    Kích thước khối được làm tròn xuống bội số của `align` frame.
+    """
+    block_frames = max(align, block_frames - block_frames % align)
+
+    peak = None
+    with wave.open(input_path, 'rb') as src:
+        transform = make_transform()
+        start = 0
+        for block in read_float_blocks(src, dtype, block_frames):
+            block_peak = np.max(np.abs(transform(block, start)))
+            peak = block_peak if peak is None else max(peak, block_peak)
+            start += len(block)
+
+    with wave.open(input_path, 'rb') as src, wave.open(output_path, 'wb') as dst:
+        dst.setnchannels(src.getnchannels())
+        dst.setsampwidth(2)
+        dst.setframerate(src.getframerate())
+        transform = make_transform()
+        start = 0
+        for block in read_float_blocks(src, dtype, block_frames):
+            stego = transform(block, start)
+            dst.writeframes(np.int16(stego / peak * 32767).tobytes())
+            start += len(block)
@@ -0,0 +1,150 @@
+import os
+import shutil
+import struct
+import wave
+from collections import namedtuple
+
+import numpy as np
+
+from .lsb import sample_dtype
+
+# ioctl FICLONE của Linux: tạo bản sao reflink (chia sẻ block) trên btrfs/xfs
+FICLONE = 0x40049409
+
+# Mã định dạng trong chunk 'fmt '; với WAVE_FORMAT_EXTENSIBLE, định dạng thật nằm ở
+# 2 byte đầu của GUID SubFormat (byte 24-25 của chunk)
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+WavInfo = namedtuple('WavInfo', 'nchannels sampwidth framerate nframes data_offset data_size')
+
+
+def read_params(path):
+    """Chỉ đọc tiêu đề của file WAV và trả về wave._wave_params (nchannels, sampwidth, framerate, nframes, ...)."""
+    with wave.open(path, 'rb') as audio_file:
+        return audio_file.getparams()
+
+
+def _parse_riff(read, total_size):
+    """
+    Phân tích tiêu đề RIFF; `read(offset, size)` trả về `size` byte bắt đầu tại `offset`
+    (ít hơn nếu hết dữ liệu) và `total_size` là kích thước của toàn bộ file.
+    """
+    riff, _, wave_id = struct.unpack('<4sI4s', read(0, 12).ljust(12, b'\0'))
+    if riff != b'RIFF' or wave_id != b'WAVE':
+        raise ValueError("File không phải định dạng WAV (RIFF/WAVE).")
+
+    fmt = None
+    position = 12
+    while True:
+        chunk_header = read(position, 8)
+        if len(chunk_header) < 8:
+            raise ValueError("File WAV không có chunk 'data'.")
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        position += 8
+
+        if chunk_id == b'fmt ':
+            fmt = read(position, min(chunk_size, 40)).ljust(16, b'\0')
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("Chunk 'fmt ' phải đứng trước chunk 'data'.")
+            data_offset = position
+            # Một số chương trình ghi kích thước 0xFFFFFFFF khi ghi theo luồng
+            data_size = min(chunk_size, total_size - data_offset)
+            break
+        position += chunk_size + (chunk_size & 1)
+
+    format_tag, nchannels, framerate, _, _, bits_per_sample = struct.unpack('<HHIIHH', fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag, = struct.unpack('<H', fmt[24:26])
+    if format_tag != WAVE_FORMAT_PCM:
+        raise ValueError("Chỉ hỗ trợ file WAV định dạng PCM.")
+    sampwidth = (bits_per_sample + 7) // 8
+    nframes = data_size // (nchannels * sampwidth)
+    return WavInfo(nchannels, sampwidth, framerate, nframes, data_offset, data_size)
+
+
+def parse_wav_header(path):
+    """
+    Phân tích tiêu đề RIFF của file WAV PCM mà không đọc dữ liệu âm thanh.
+
+    Trả về WavInfo, trong đó `data_offset`/`data_size` xác định vị trí chunk 'data'
+    trong file. Ném ValueError nếu file không phải WAV PCM hợp lệ.
+    """
+    with open(path, 'rb') as f:
+        def read(offset, size):
+            f.seek(offset)
+            return f.read(size)
+
+        return _parse_riff(read, os.fstat(f.fileno()).st_size)
+
+
+def parse_wav_bytes(buffer):
+    """Giống parse_wav_header nhưng với nội dung file WAV đã nằm trong bộ nhớ (bytes, bytearray, ...)."""
+    view = memoryview(buffer).cast('B')
+    return _parse_riff(lambda offset, size: bytes(view[offset:offset + size]), len(view))
+
+
+def buffer_data(buffer, dtype=None, info=None):
+    """
+    Trả về mảng numpy trỏ thẳng vào chunk 'data' của file WAV trong bộ nhớ (không sao chép).
+
+    Nếu `buffer` là bytearray (hoặc memoryview ghi được), sửa mảng sẽ sửa luôn `buffer`.
+    `dtype` có ý nghĩa như trong map_data.
+    """
+    info = info or parse_wav_bytes(buffer)
+    dtype = np.dtype(dtype) if dtype is not None else sample_dtype(info.sampwidth)
+    count = info.nframes * info.nchannels * info.sampwidth // dtype.itemsize
+    if count == 0:
+        raise ValueError("File WAV không chứa dữ liệu âm thanh.")
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=info.data_offset)
+
+
+def map_data(path, dtype=None, mode='r', info=None):
+    """
+    Ánh xạ chunk 'data' của file WAV vào bộ nhớ dưới dạng np.memmap.
+
+    Chỉ các trang được truy cập mới được đọc từ đĩa; với mode='r+' các thay đổi
+    được ghi thẳng vào file. `dtype` mặc định là kiểu mẫu theo độ rộng mẫu,
+    dùng np.uint8 để truy cập theo từng byte.
+    """
+    info = info or parse_wav_header(path)
+    dtype = np.dtype(dtype) if dtype is not None else sample_dtype(info.sampwidth)
+    count = info.nframes * info.nchannels * info.sampwidth // dtype.itemsize
+    if count == 0:
+        raise ValueError("File WAV không chứa dữ liệu âm thanh.")
+    return np.memmap(path, dtype=dtype, mode=mode, offset=info.data_offset, shape=(count,))
+
+
+def clone_file(src, dst):
+    """
+    Sao chép `src` sang `dst` với chi phí thấp nhất có thể.
+
+    Thử lần lượt reflink (FICLONE), os.copy_file_range (sao chép trong kernel),
+    rồi mới đến sao chép thông thường.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            import fcntl
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+
+        if hasattr(os, 'copy_file_range'):
+            remaining = os.fstat(fsrc.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                # copy_file_range chỉ dịch con trỏ file theo số byte đã sao chép,
+                # nên có thể sao chép tiếp phần còn lại theo cách thông thường.
+                pass
+
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
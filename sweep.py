@@ -0,0 +1,262 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+
+from steganography import echo, phase, spread
+from steganography.capacity import expand_plans
+from steganography.lsb import embed_bits, extract_bits, resolve_k
+from steganography.metrics import compare_arrays
+from steganography.wav_io import map_data, parse_wav_header
+
+# Lưới tham số mặc định: kỹ thuật -> {tên tham số: danh sách giá trị}. Tên kỹ thuật
+# và ý nghĩa tham số giống batch.py và steganography.capacity: 'lsb' là k-LSB theo mẫu
+# (lsb_message), 'hide_stegano' là giấu theo từng byte tại bit_to_modify
+DEFAULT_GRID = {
+    'lsb': {'k': [1, 2, 4]},
+    'hide_stegano': {'bit_to_modify': [0, 1], 'k': [1, 2]},
+    'phase': {'block_size': [256, 512, 1024]},
+    'echo': {'delay_0': [None], 'delay_1': [None], 'decay_rate': [0.3, 0.5]},
+    'spread': {'chip_size': [500, 1000], 'amplitude': [None, 100.0, 1000.0]},
+}
+
+# Các cột cố định của bảng kết quả (các cột tham số được thêm sau)
+RESULT_FIELDS = ['carrier', 'technique', 'capacity_bits', 'payload_bits', 'ber', 'snr', 'psnr',
+                 'embed_seconds', 'extract_seconds', 'embed_samples_per_s', 'extract_samples_per_s', 'error']
+
+
+@lru_cache(maxsize=1)
+def load_carrier(path):
+    """
+    Đọc (một lần cho mỗi tiến trình) toàn bộ mẫu của file WAV.
+
+    Trả về (WavInfo, mảng mẫu chỉ đọc dạng (frame,) hoặc (frame, kênh)); các ô
+    của lưới trên cùng một file dùng chung mảng này thay vì đọc lại file. Các ô được
+    gom theo file (run_sweep) nên chỉ cần giữ lại file gần nhất.
+    """
+    info = parse_wav_header(path)
+    data = np.array(map_data(path, info=info))
+    if info.nchannels > 1:
+        data = data.reshape(-1, info.nchannels)
+    data.flags.writeable = False
+    return info, data
+
+
+def _to_int16(stego):
+    """Chuẩn hóa tín hiệu đã giấu về int16, giống khi các kỹ thuật ghi file."""
+    return np.int16(stego / np.max(np.abs(stego)) * 32767)
+
+
+def _run_lsb(info, data, bits, k=1):
+    # Giống lsb_message: k bit thấp của mỗi mẫu PCM
+    k = resolve_k(k, info.sampwidth)
+    samples = np.ascontiguousarray(data).reshape(-1)
+    capacity = samples.size * k
+    if len(bits) > capacity:
+        return capacity, None, None
+
+    def embed():
+        return embed_bits(samples.copy(), bits, k=k).reshape(data.shape)
+
+    def extract(stego):
+        return extract_bits(stego.reshape(-1), len(bits), k=k)
+
+    return capacity, embed, extract
+
+
+def _run_hide_stegano(info, data, bits, bit_to_modify=0, k=1):
+    # Giống hide_stegano: k bit bắt đầu từ bit_to_modify của từng byte dữ liệu âm thanh
+    k = resolve_k(k, info.sampwidth)
+    units = np.ascontiguousarray(data).view(np.uint8).reshape(-1)
+    capacity = units.size * k
+    if len(bits) > capacity:
+        return capacity, None, None
+
+    def embed():
+        return embed_bits(units.copy(), bits, bit_to_modify, k).view(data.dtype).reshape(data.shape)
+
+    def extract(stego):
+        return extract_bits(stego.view(np.uint8).reshape(-1), len(bits), bit_to_modify, k=k)
+
+    return capacity, embed, extract
+
+
+def _run_phase(info, data, bits, block_size=512):
+    capacity = len(data) // block_size
+    if len(bits) > capacity:
+        return capacity, None, None
+
+    def embed():
+        return _to_int16(phase.phase_transform(bits, block_size)(data.astype(np.float64), 0))
+
+    def extract(stego):
+        return phase.decode_phase_bits(stego[:len(bits) * block_size], block_size)
+
+    return capacity, embed, extract
+
+
+def _run_echo(info, data, bits, delay_0=None, delay_1=None, decay_rate=0.5, ramp=0, segment_len=None):
+    delay_0, delay_1 = echo.resolve_delays(info.framerate, delay_0, delay_1)
+    segment_len = echo.segment_length(delay_0, delay_1, segment_len)
+    capacity = len(data) // segment_len
+    if len(bits) > capacity:
+        return capacity, None, None
+
+    def embed():
+        transform = echo.echo_transform(bits, delay_0, delay_1, decay_rate, segment_len, ramp)
+        return _to_int16(transform(data.astype(np.float32), 0))
+
+    def extract(stego):
+        return echo.decode_echo_bits(stego[:len(bits) * segment_len], delay_0, delay_1, segment_len)
+
+    return capacity, embed, extract
+
+
+def _run_spread(info, data, bits, chip_size=1000, amplitude=None, key=spread.PN_KEY):
+    capacity = len(data) // chip_size
+    if len(bits) > capacity:
+        return capacity, None, None
+    if amplitude is None:
+        amplitude = spread.default_amplitude(data[:len(bits) * chip_size], chip_size)
+
+    def embed():
+        transform = spread.spread_transform(bits, chip_size, amplitude, key)
+        return _to_int16(transform(data.astype(np.float64), 0))
+
+    def extract(stego):
+        segment = stego[:len(bits) * chip_size].astype(np.float64)
+        return spread.despread_bits([segment], len(bits), chip_size, key)
+
+    return capacity, embed, extract
+
+
+TECHNIQUES = {
+    'lsb': _run_lsb,
+    'hide_stegano': _run_hide_stegano,
+    'phase': _run_phase,
+    'echo': _run_echo,
+    'spread': _run_spread,
+}
+
+
+def run_cell(carrier_path, technique, params, payload_bits=1024, seed=0):
+    """
+    Giấu, trích xuất và đo chất lượng cho một ô (file, kỹ thuật, tham số) hoàn toàn trong bộ nhớ.
+
+    Trả về một dict kết quả; lỗi của ô được ghi vào trường 'error' thay vì ném ra.
+    """
+    row = dict.fromkeys(RESULT_FIELDS)
+    row.update(carrier=carrier_path, technique=technique, payload_bits=payload_bits, params=params)
+    try:
+        info, data = load_carrier(carrier_path)
+        bits = np.random.default_rng(seed).integers(0, 2, payload_bits, dtype=np.uint8)
+
+        capacity, embed, extract = TECHNIQUES[technique](info, data, bits, **params)
+        row['capacity_bits'] = capacity
+        if embed is None:
+            row['error'] = "File âm thanh quá nhỏ để giấu payload này."
+            return row
+
+        start = time.perf_counter()
+        stego = embed()
+        row['embed_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = extract(stego)
+        row['extract_seconds'] = time.perf_counter() - start
+
+        row['ber'] = float(np.mean(decoded[:payload_bits] != bits)) if len(decoded) == payload_bits else 1.0
+        row['embed_samples_per_s'] = data.size / max(row['embed_seconds'], 1e-12)
+        row['extract_samples_per_s'] = data.size / max(row['extract_seconds'], 1e-12)
+
+        try:
+            metrics = compare_arrays(data, stego, info.framerate)
+            row['snr'], row['psnr'] = metrics.snr, metrics.psnr
+        except ValueError:
+            # Ví dụ file 8-bit: tín hiệu đã giấu được ghi ở dạng int16 nên không so sánh trực tiếp được
+            pass
+    except Exception as e:
+        row['error'] = str(e)
+    return row
+
+
+def _run_batch(carrier_path, cells, payload_bits, seed):
+    """Chạy một nhóm ô trên cùng một file trong một tiến trình con (file chỉ được đọc một lần)."""
+    return [run_cell(carrier_path, technique, params, payload_bits, seed) for technique, params in cells]
+
+
+def run_sweep(carriers, grid=None, payload_bits=1024, workers=None, seed=0):
+    """
+    Chạy toàn bộ lưới tham số trên các file mang tin bằng một pool tiến trình.
+
+    Các ô được gom theo file: mỗi file là một nhóm chạy trong một tiến trình nên chỉ
+    được đọc và giải mã một lần. Chỉ khi số file ít hơn số tiến trình, các ô của mỗi
+    file mới được chia thành workers // số file nhóm để tận dụng các tiến trình còn
+    rảnh. Trả về danh sách dict kết quả theo thứ tự (file, ô) của lưới.
+    """
+    grid = grid or DEFAULT_GRID
+    unknown = sorted(set(grid) - set(TECHNIQUES))
+    if unknown:
+        raise ValueError(f"Không hỗ trợ kỹ thuật '{unknown[0]}'.")
+    cells = expand_plans(grid)
+    workers = workers or os.cpu_count() or 1
+    groups_per_carrier = max(1, workers // max(len(carriers), 1))
+    chunk = max(1, -(-len(cells) // groups_per_carrier))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for carrier_index, carrier in enumerate(carriers):
+            for first in range(0, len(cells), chunk):
+                future = executor.submit(_run_batch, carrier, cells[first:first + chunk], payload_bits, seed)
+                futures[future] = (carrier_index, first)
+
+        for done, future in enumerate(as_completed(futures), 1):
+            carrier_index, first = futures[future]
+            for offset, row in enumerate(future.result()):
+                results[carrier_index, first + offset] = row
+            print(f"⏳ Đã xong {done}/{len(futures)} nhóm")
+
+    return [results[key] for key in sorted(results)]
+
+
+def write_results(rows, output_path):
+    """Ghi bảng kết quả ra file JSON (đuôi .json) hoặc CSV (mỗi tham số một cột)."""
+    if output_path.endswith('.json'):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        return
+
+    param_names = sorted({name for row in rows for name in row['params']})
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS[:2] + param_names + RESULT_FIELDS[2:])
+        writer.writeheader()
+        for row in rows:
+            flat = {name: value for name, value in row.items() if name != 'params'}
+            flat.update(row['params'])
+            writer.writerow(flat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quét lưới tham số của các kỹ thuật giấu tin trên nhiều file WAV.")
+    parser.add_argument('carriers', nargs='+', help="Các file WAV mang tin")
+    parser.add_argument('--grid', help="File JSON dạng {kỹ thuật: {tham số: [giá trị, ...]}}")
+    parser.add_argument('--output', default='sweep_results.csv', help="File kết quả (.csv hoặc .json)")
+    parser.add_argument('--workers', type=int, default=None, help="Số tiến trình (mặc định: số CPU)")
+    parser.add_argument('--payload-bits', type=int, default=1024, help="Số bit ngẫu nhiên được giấu trong mỗi ô")
+    parser.add_argument('--seed', type=int, default=0, help="Hạt giống của payload ngẫu nhiên")
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid:
+        with open(args.grid, encoding='utf-8') as f:
+            grid = json.load(f)
+
+    rows = run_sweep(args.carriers, grid, args.payload_bits, args.workers, args.seed)
+    write_results(rows, args.output)
+    print(f"✅ Đã ghi {len(rows)} kết quả vào '{args.output}'")
@@ -0,0 +1,34 @@
+"""Hàm dùng chung cho các kiểm thử: đưa gói steganography vào sys.path và tạo file WAV mẫu."""
+import os
+import sys
+import wave
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def write_wav(path, seconds=1.0, framerate=8000, channels=1, sampwidth=2, amplitude=0.5, seed=0):
+    """
+    Ghi file WAV PCM gồm âm 440 Hz cộng 1% nhiễu (nhiễu giúp echo hiding giải được tin).
+    Trả về mảng mẫu đã ghi, dạng (frame,) hoặc (frame, kênh).
+    """
+    n_frames = int(seconds * framerate)
+    t = np.arange(n_frames) / framerate
+    signal = amplitude * np.sin(2 * np.pi * 440 * t)
+    signal = np.repeat(signal[:, None], channels, axis=1)
+    signal += np.random.default_rng(seed).normal(0, 0.01, signal.shape)
+    full_scale = (1 << (8 * sampwidth - 1)) - 1
+    samples = np.round(np.clip(signal, -1, 1) * full_scale)
+    if sampwidth == 1:
+        samples = (samples + 128).astype(np.uint8)
+    else:
+        samples = samples.astype(np.dtype(f'<i{sampwidth}'))
+    with wave.open(path, 'wb') as audio:
+        audio.setnchannels(channels)
+        audio.setsampwidth(sampwidth)
+        audio.setframerate(framerate)
+        audio.writeframes(samples.tobytes())
+    return samples if channels > 1 else samples[:, 0]
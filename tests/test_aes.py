@@ -0,0 +1,224 @@
+"""Kiểm thử mã hóa AES-CBC theo luồng (tương thích định dạng cũ) và AES-GCM chia đoạn."""
+import io
+import os
+import tempfile
+import unittest
+
+import support  # noqa: F401  (đưa gói steganography vào sys.path)
+
+from steganography.aes import (AES_BLOCK_SIZE, GCM_HEADER, GCM_TAG_SIZE, decrypt_chunk, decrypt_chunked,
+                               decrypt_file, decrypt_file_gcm, decrypt_stream, encrypt_chunked, encrypt_file,
+                               encrypt_file_gcm, encrypt_stream, gcm_encrypted_size, iter_encrypt_chunked)
+
+try:
+    from Cryptodome.Cipher import AES
+    from Cryptodome.Util.Padding import pad, unpad
+except ImportError:  # pycryptodomex chưa được cài
+    AES = None
+
+KEY = bytes(range(32))
+
+
+def _old_encrypt(data, key):
+    """Định dạng cũ của encrypt_Python.py: đọc cả file, IV + bản mã có padding PKCS#7."""
+    cipher = AES.new(key, AES.MODE_CBC)
+    return cipher.iv + cipher.encrypt(pad(data, AES.block_size))
+
+
+def _old_decrypt(encrypted, key):
+    cipher = AES.new(key, AES.MODE_CBC, encrypted[:AES.block_size])
+    return unpad(cipher.decrypt(encrypted[AES.block_size:]), AES.block_size)
+
+
+@unittest.skipIf(AES is None, "Cần pycryptodomex")
+class CbcStreamTest(unittest.TestCase):
+
+    def _encrypt(self, data, chunk_size):
+        out = io.BytesIO()
+        written = encrypt_stream(io.BytesIO(data), out, KEY, chunk_size)
+        self.assertEqual(written, len(out.getvalue()))
+        return out.getvalue()
+
+    def _decrypt(self, encrypted, chunk_size):
+        out = io.BytesIO()
+        written = decrypt_stream(io.BytesIO(encrypted), out, KEY, chunk_size)
+        self.assertEqual(written, len(out.getvalue()))
+        return out.getvalue()
+
+    def test_round_trip_across_chunk_boundaries(self):
+        for size in (0, 1, 15, 16, 17, 31, 32, 1000, 4099):
+            data = os.urandom(size)
+            for chunk_size in (16, 48, 1 << 20):
+                with self.subTest(size=size, chunk_size=chunk_size):
+                    encrypted = self._encrypt(data, chunk_size)
+                    self.assertEqual(len(encrypted), AES_BLOCK_SIZE + (size // AES_BLOCK_SIZE + 1) * AES_BLOCK_SIZE)
+                    # Đoạn đọc khi giải mã không cần trùng với khi mã hóa, cũng không cần chia hết cho 16
+                    self.assertEqual(self._decrypt(encrypted, 7), data)
+                    self.assertEqual(self._decrypt(encrypted, chunk_size), data)
+
+    def test_iterable_source(self):
+        pieces = [b'a' * 5, b'b' * 30, b'', b'c' * 17]
+        out = io.BytesIO()
+        encrypt_stream(pieces, out, KEY)
+        self.assertEqual(self._decrypt(out.getvalue(), 64), b''.join(pieces))
+
+    def test_old_format_decrypts_with_streaming_decoder(self):
+        data = os.urandom(5000)
+        self.assertEqual(self._decrypt(_old_encrypt(data, KEY), 100), data)
+
+    def test_streaming_output_decrypts_with_old_decoder(self):
+        data = os.urandom(5000)
+        self.assertEqual(_old_decrypt(self._encrypt(data, 100), KEY), data)
+
+    def test_rejects_invalid_length(self):
+        encrypted = self._encrypt(b'payload', 64)
+        for broken in (encrypted[:-1], encrypted[:AES_BLOCK_SIZE], b''):
+            with self.subTest(length=len(broken)):
+                with self.assertRaises(ValueError):
+                    self._decrypt(broken, 64)
+
+
+@unittest.skipIf(AES is None, "Cần pycryptodomex")
+class CbcFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.secret = os.path.join(self._tmp.name, 'secret.txt')
+        self.data = os.urandom(3 * 1000 + 5)
+        with open(self.secret, 'wb') as f:
+            f.write(self.data)
+
+    def test_file_round_trip_with_default_paths(self):
+        encrypted = encrypt_file(self.secret, KEY, chunk_size=64)
+        self.assertEqual(encrypted, self.secret + '.enc')
+        decrypted = decrypt_file(encrypted, KEY, chunk_size=80)
+        self.assertEqual(decrypted, os.path.join(self._tmp.name, 'secret.txt.dec'))
+        with open(decrypted, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_old_format_file(self):
+        encrypted = self.secret + '.enc'
+        with open(encrypted, 'wb') as f:
+            f.write(_old_encrypt(self.data, KEY))
+        with open(decrypt_file(encrypted, KEY), 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_failed_decryption_leaves_no_partial_output(self):
+        encrypted = encrypt_file(self.secret, KEY)
+        with open(encrypted, 'r+b') as f:
+            f.truncate(os.path.getsize(encrypted) - 1)
+        output = os.path.join(self._tmp.name, 'out.dec')
+        with self.assertRaises(ValueError):
+            decrypt_file(encrypted, KEY, output, chunk_size=64)
+        self.assertEqual(sorted(os.listdir(self._tmp.name)), ['secret.txt', 'secret.txt.enc'])
+
+
+@unittest.skipIf(AES is None, "Cần pycryptodomex")
+class GcmChunkedTest(unittest.TestCase):
+    CHUNK = 64
+
+    def setUp(self):
+        self.data = os.urandom(5 * self.CHUNK + 10)
+        self.sealed = list(iter_encrypt_chunked(io.BytesIO(self.data), KEY, self.CHUNK, workers=2))
+
+    def _decrypt(self, encrypted, workers=2):
+        out = io.BytesIO()
+        decrypt_chunked(io.BytesIO(encrypted), out, KEY, workers)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        for size in (0, 1, self.CHUNK, 3 * self.CHUNK, 3 * self.CHUNK + 1):
+            for workers in (1, 4):
+                with self.subTest(size=size, workers=workers):
+                    data = os.urandom(size)
+                    out = io.BytesIO()
+                    written = encrypt_chunked(io.BytesIO(data), out, KEY, self.CHUNK, workers)
+                    self.assertEqual(written, len(out.getvalue()))
+                    self.assertEqual(written, gcm_encrypted_size(size, self.CHUNK))
+                    self.assertEqual(self._decrypt(out.getvalue(), workers), data)
+
+    def test_tampered_chunk_is_named(self):
+        encrypted = bytearray(b''.join(self.sealed))
+        encrypted[GCM_HEADER.size + 2 * (self.CHUNK + GCM_TAG_SIZE) + 5] ^= 1
+        with self.assertRaisesRegex(ValueError, 'Đoạn 2'):
+            self._decrypt(bytes(encrypted))
+
+    def test_tampered_header_is_rejected(self):
+        header = bytearray(self.sealed[0])
+        header[-1] ^= 1
+        with self.assertRaisesRegex(ValueError, 'Đoạn 0'):
+            self._decrypt(bytes(header) + b''.join(self.sealed[1:]))
+
+    def test_reordered_chunks_are_rejected(self):
+        chunks = self.sealed[1:]
+        chunks[1], chunks[2] = chunks[2], chunks[1]
+        with self.assertRaisesRegex(ValueError, 'Đoạn 1'):
+            self._decrypt(self.sealed[0] + b''.join(chunks))
+
+    def test_truncated_file_is_rejected(self):
+        # Bỏ đoạn cuối: đoạn đứng trước không mang cờ đoạn cuối nên tag không khớp
+        with self.assertRaisesRegex(ValueError, 'Đoạn 4'):
+            self._decrypt(b''.join(self.sealed[:-1]))
+        with self.assertRaises(ValueError):
+            self._decrypt(b''.join(self.sealed)[:-1])
+
+    def test_wrong_key_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decrypt_chunked(io.BytesIO(b''.join(self.sealed)), io.BytesIO(), bytes(32))
+
+    def test_rejects_other_formats(self):
+        with self.assertRaises(ValueError):
+            self._decrypt(b'short')
+        with self.assertRaises(ValueError):
+            self._decrypt(b'XXXX' + b''.join(self.sealed)[4:])
+
+
+@unittest.skipIf(AES is None, "Cần pycryptodomex")
+class GcmFileTest(unittest.TestCase):
+    CHUNK = 100
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.secret = os.path.join(self._tmp.name, 'secret.txt')
+        self.data = os.urandom(3 * self.CHUNK + 7)
+        with open(self.secret, 'wb') as f:
+            f.write(self.data)
+
+    def test_file_round_trip_with_default_paths(self):
+        encrypted = encrypt_file_gcm(self.secret, KEY, chunk_size=self.CHUNK)
+        self.assertEqual(encrypted, self.secret + '.gcm')
+        decrypted = decrypt_file_gcm(encrypted, KEY)
+        self.assertEqual(decrypted, os.path.join(self._tmp.name, 'secret.txt.dec'))
+        with open(decrypted, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_decrypt_chunk(self):
+        encrypted = encrypt_file_gcm(self.secret, KEY, chunk_size=self.CHUNK)
+        for index in range(4):
+            with self.subTest(index=index):
+                self.assertEqual(decrypt_chunk(encrypted, KEY, index),
+                                 self.data[index * self.CHUNK:(index + 1) * self.CHUNK])
+        for index in (-1, 4):
+            with self.assertRaises(IndexError):
+                decrypt_chunk(encrypted, KEY, index)
+
+    def test_decrypt_chunk_detects_tampering(self):
+        encrypted = encrypt_file_gcm(self.secret, KEY, chunk_size=self.CHUNK)
+        with open(encrypted, 'r+b') as f:
+            f.seek(GCM_HEADER.size + self.CHUNK + GCM_TAG_SIZE)
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 1]))
+        self.assertEqual(decrypt_chunk(encrypted, KEY, 0), self.data[:self.CHUNK])
+        with self.assertRaisesRegex(ValueError, 'Đoạn 1'):
+            decrypt_chunk(encrypted, KEY, 1)
+        output = os.path.join(self._tmp.name, 'out.dec')
+        with self.assertRaises(ValueError):
+            decrypt_file_gcm(encrypted, KEY, output)
+        self.assertFalse(os.path.exists(output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Kiểm thử xử lý hàng loạt: giấu/trích xuất, chạy tiếp từ nhật ký và lỗi của từng file."""
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from support import write_wav
+
+import batch
+from batch import load_state, read_manifest, run_batch, scan_directory
+
+
+def _crash_embed(carrier, message, output, block_frames=None, **params):
+    # Mô phỏng tiến trình con bị dừng đột ngột (ví dụ bị hệ điều hành kết thúc khi hết bộ nhớ)
+    if os.path.basename(carrier) == 'crash.wav':
+        os._exit(1)
+    batch.TECHNIQUES['lsb'][0](carrier, message, output, block_frames, **params)
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+        self.carriers = os.path.join(self.tmp, 'carriers')
+        self.payloads = os.path.join(self.tmp, 'payloads')
+        os.makedirs(os.path.join(self.carriers, 'sub'))
+        os.makedirs(self.payloads)
+        self.names = ['a', 'b', os.path.join('sub', 'c')]
+        for i, name in enumerate(self.names):
+            # Đủ dài cho echo hiding (mỗi bit một đoạn 512 mẫu)
+            write_wav(os.path.join(self.carriers, name + '.wav'), seconds=3, framerate=44100, seed=i)
+            os.makedirs(os.path.dirname(os.path.join(self.payloads, name)), exist_ok=True)
+            with open(os.path.join(self.payloads, name + '.txt'), 'w', encoding='utf-8') as f:
+                f.write(f'tin nhắn {i} ✓')
+
+    def path(self, *parts):
+        return os.path.join(self.tmp, *parts)
+
+    def _embed(self, technique='lsb', **kwargs):
+        entries = scan_directory(self.carriers, self.path('stego'), 'embed', payload_dir=self.payloads)
+        return run_batch(entries, technique, workers=2, **kwargs)
+
+    def test_embed_then_extract(self):
+        for technique in ('lsb', 'echo'):
+            with self.subTest(technique=technique):
+                summary = self._embed(technique)
+                self.assertEqual((summary['ok'], summary['error']), (3, 0))
+                entries = scan_directory(self.path('stego'), self.path('out'), 'extract')
+                summary = run_batch(entries, technique, 'extract', workers=2)
+                self.assertEqual((summary['ok'], summary['error']), (3, 0))
+                for i, name in enumerate(self.names):
+                    with open(self.path('out', name + '.txt'), encoding='utf-8') as f:
+                        self.assertEqual(f.read(), f'tin nhắn {i} ✓')
+
+    def test_rerun_skips_completed_jobs(self):
+        state = self.path('state.jsonl')
+        os.remove(os.path.join(self.payloads, 'b.txt'))
+        summary = self._embed(state_path=state)
+        self.assertEqual((summary['ok'], summary['error'], summary['skipped']), (2, 1, 0))
+        self.assertEqual(len(load_state(state)), 2)
+
+        # Lần chạy lại chỉ làm tác vụ bị lỗi; dòng nhật ký bị cắt dở được bỏ qua
+        with open(self.path('payloads', 'b.txt'), 'w', encoding='utf-8') as f:
+            f.write('đã sửa')
+        with open(state, 'a', encoding='utf-8') as f:
+            f.write('{"key": "cắt dở')
+        summary = self._embed(state_path=state)
+        self.assertEqual((summary['ok'], summary['error'], summary['skipped']), (1, 0, 2))
+        self.assertEqual(len(load_state(state)), 3)
+
+    def test_errors_are_recorded_per_file(self):
+        with open(os.path.join(self.carriers, 'broken.wav'), 'wb') as f:
+            f.write(b'not a wav file')
+        with open(os.path.join(self.payloads, 'broken.txt'), 'w', encoding='utf-8') as f:
+            f.write('x')
+        summary = self._embed()
+        self.assertEqual((summary['ok'], summary['error']), (3, 1))
+        self.assertEqual(summary['errors'][0]['input'], os.path.join(self.carriers, 'broken.wav'))
+
+    def test_rejects_unknown_technique(self):
+        with self.assertRaises(ValueError):
+            run_batch([], 'unknown')
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         "Tiến trình con cần kế thừa TECHNIQUES đã được thay")
+    def test_crashed_worker_only_fails_its_own_job(self):
+        write_wav(os.path.join(self.carriers, 'crash.wav'))
+        with open(os.path.join(self.payloads, 'crash.txt'), 'w', encoding='utf-8') as f:
+            f.write('x')
+        with mock.patch.dict(batch.TECHNIQUES, {'crash': (_crash_embed, None)}):
+            summary = self._embed('crash', max_in_flight=2)
+        self.assertEqual((summary['ok'], summary['error']), (3, 1))
+        self.assertEqual(summary['errors'][0]['input'], os.path.join(self.carriers, 'crash.wav'))
+        self.assertIn('BrokenProcessPool', summary['errors'][0]['error'])
+
+
+class ManifestTest(unittest.TestCase):
+
+    def test_csv_and_jsonl(self):
+        rows = [{'input': 'a.wav', 'output': 'out/a.wav', 'payload': 'a.txt'},
+                {'input': 'b.wav', 'output': 'out/b.wav', 'payload': 'b.txt'}]
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'manifest.csv')
+            with open(csv_path, 'w', encoding='utf-8') as f:
+                f.write('input,output,payload\n')
+                f.writelines(f"{row['input']},{row['output']},{row['payload']}\n" for row in rows)
+            jsonl_path = os.path.join(tmp, 'manifest.jsonl')
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(row) + '\n\n' for row in rows)
+            self.assertEqual([dict(row) for row in read_manifest(csv_path)], rows)
+            self.assertEqual(list(read_manifest(jsonl_path)), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
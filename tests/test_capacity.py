@@ -0,0 +1,164 @@
+"""Kiểm thử tính dung lượng từ tiêu đề, chỉ mục SQLite và việc gán payload (best-fit)."""
+import os
+import struct
+import tempfile
+import unittest
+import wave
+
+from support import write_wav
+
+from capacity_planner import text_payloads
+from steganography.capacity import CarrierIndex, capacity_bits, file_capacity
+from steganography.echo import embed_echo
+from steganography.hide_stegano import embed_text
+from steganography.lsb_message import embed_message
+from steganography.phase import embed_phase
+from steganography.spread import embed_spread
+from steganography.wav_io import WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_PCM, parse_wav_header
+
+WAVE_FORMAT_IEEE_FLOAT = 3
+# Phần đuôi chung của GUID SubFormat (KSDATAFORMAT_SUBTYPE_*)
+_GUID_TAIL = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+
+
+def _write_extensible(path, subformat, sampwidth=2, nframes=1000, framerate=8000):
+    """Ghi file WAV có fmt dạng WAVE_FORMAT_EXTENSIBLE (module wave không ghi được dạng này)."""
+    block_align = sampwidth
+    fmt = struct.pack('<HHIIHHHHI', WAVE_FORMAT_EXTENSIBLE, 1, framerate, framerate * block_align,
+                      block_align, 8 * sampwidth, 22, 8 * sampwidth, 0x4)
+    fmt += struct.pack('<H', subformat) + _GUID_TAIL
+    data = bytes(nframes * block_align)
+    body = b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + b'data' + struct.pack('<I', len(data)) + data
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', len(body)) + body)
+
+
+def _write_24bit(path, nframes=1000):
+    with wave.open(path, 'wb') as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(3)
+        audio.setframerate(8000)
+        audio.writeframes(bytes(3 * nframes))
+
+
+class CapacityTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_capacity_matches_embedders(self):
+        # Tin nhắn đúng bằng dung lượng giấu được, thêm một byte thì bị từ chối
+        cases = [
+            ('lsb', {'k': 2}, lambda c, m, o: embed_message(c, o, m, k=2, compress=False)),
+            ('hide_stegano', {'k': 1}, lambda c, m, o: embed_text(c, m, o, k=1, compress=False)),
+            ('phase', {'block_size': 512}, lambda c, m, o: embed_phase(c, m, o, block_size=512, compress=False)),
+            ('echo', {}, lambda c, m, o: embed_echo(c, m, o, compress=False)),
+            ('spread', {'chip_size': 200, 'sync': True},
+             lambda c, m, o: embed_spread(c, m, o, chip_size=200, sync=True, compress=False)),
+        ]
+        carrier = self.path('carrier.wav')
+        write_wav(carrier, seconds=2, framerate=44100)
+        for technique, params, embed in cases:
+            with self.subTest(technique=technique):
+                n_bytes = file_capacity(carrier, technique, **params) // 8
+                self.assertGreater(n_bytes, 0)
+                embed(carrier, 'x' * n_bytes, self.path('stego.wav'))
+                with self.assertRaises(ValueError):
+                    embed(carrier, 'x' * (n_bytes + 1), self.path('stego.wav'))
+
+    def test_24bit_only_fits_byte_techniques(self):
+        _write_24bit(self.path('24.wav'))
+        info = parse_wav_header(self.path('24.wav'))
+        self.assertEqual(capacity_bits(info, 'hide_stegano'), 3 * 1000 - 96)
+        for technique in ('lsb', 'phase', 'echo', 'spread'):
+            with self.subTest(technique=technique):
+                self.assertEqual(capacity_bits(info, technique), 0)
+
+    def test_bit_range_beyond_a_byte_has_no_capacity(self):
+        write_wav(self.path('a.wav'))
+        info = parse_wav_header(self.path('a.wav'))
+        self.assertGreater(capacity_bits(info, 'hide_stegano', bit_to_modify=6, k=2), 0)
+        self.assertEqual(capacity_bits(info, 'hide_stegano', bit_to_modify=7, k=2), 0)
+
+    def test_extensible_float_is_rejected(self):
+        _write_extensible(self.path('float.wav'), WAVE_FORMAT_IEEE_FLOAT, sampwidth=4)
+        with self.assertRaises(ValueError):
+            parse_wav_header(self.path('float.wav'))
+        _write_extensible(self.path('pcm.wav'), WAVE_FORMAT_PCM)
+        self.assertEqual(parse_wav_header(self.path('pcm.wav')).nframes, 1000)
+
+    def test_unknown_technique(self):
+        write_wav(self.path('a.wav'))
+        with self.assertRaises(ValueError):
+            file_capacity(self.path('a.wav'), 'unknown')
+
+
+class CarrierIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+        self.carriers = os.path.join(self.tmp, 'carriers')
+        os.makedirs(self.carriers)
+        # Dung lượng LSB (k=1) = số mẫu - 96 bit tiêu đề
+        for name, seconds in (('small', 0.1), ('medium', 0.5), ('large', 1.0)):
+            write_wav(os.path.join(self.carriers, name + '.wav'), seconds=seconds)
+        self.index = CarrierIndex(os.path.join(self.tmp, 'index.sqlite'), {'lsb': {'k': [1]}})
+        self.addCleanup(self.index.close)
+
+    def carrier(self, name):
+        return os.path.join(self.carriers, name + '.wav')
+
+    def test_update_skips_unchanged_and_invalid_files(self):
+        with open(os.path.join(self.carriers, 'broken.wav'), 'wb') as f:
+            f.write(b'not a wav file')
+        _write_extensible(os.path.join(self.carriers, 'float.wav'), WAVE_FORMAT_IEEE_FLOAT, sampwidth=4)
+        self.assertEqual(self.index.scan(self.carriers), {'added': 3, 'unchanged': 0, 'invalid': 2})
+        self.assertEqual(self.index.scan(self.carriers), {'added': 0, 'unchanged': 3, 'invalid': 2})
+        self.assertEqual(self.index.capacity(self.carrier('small'), 'lsb', k=1), 800 - 96)
+        # Bộ tham số mới được tính từ thông số đã lưu
+        self.assertEqual(self.index.capacity(self.carrier('small'), 'lsb', k=2), 1600 - 96)
+
+        os.remove(self.carrier('large'))
+        self.assertEqual(self.index.prune(), 1)
+        self.assertIsNone(self.index.capacity(self.carrier('large'), 'lsb', k=1))
+
+    def test_find_sorts_by_capacity(self):
+        self.index.scan(self.carriers)
+        self.assertEqual([path for path, _ in self.index.find('lsb', 50, k=1)],
+                         [self.carrier('small'), self.carrier('medium'), self.carrier('large')])
+        self.assertEqual([path for path, _ in self.index.find('lsb', 200, k=1)],
+                         [self.carrier('medium'), self.carrier('large')])
+
+    def test_assign_best_fit(self):
+        self.index.scan(self.carriers)
+        # small: 88 byte, medium: 488 byte, large: 988 byte. Payload lớn được gán trước,
+        # mỗi payload nhận file nhỏ nhất còn trống giấu được nó
+        assignment = self.index.assign({'a': 50, 'b': 400, 'c': 80, 'd': 2000}, 'lsb', k=1)
+        self.assertEqual(assignment, {'d': None, 'b': self.carrier('medium'),
+                                      'c': self.carrier('small'), 'a': self.carrier('large')})
+        self.assertEqual(self.index.assign({'a': 300, 'b': 600}, 'lsb', k=1),
+                         {'b': self.carrier('large'), 'a': self.carrier('medium')})
+        self.assertEqual(self.index.assign({}, 'lsb', k=1), {})
+
+
+class TextPayloadsTest(unittest.TestCase):
+
+    def test_skips_non_utf8_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'a.txt'), 'w', encoding='utf-8') as f:
+                f.write('xin chào')
+            with open(os.path.join(tmp, 'b.bin'), 'wb') as f:
+                f.write(b'\xff\xfe\x00')
+            os.makedirs(os.path.join(tmp, 'sub'))
+            self.assertEqual(text_payloads(tmp), ({'a.txt': len('xin chào'.encode('utf-8'))}, ['b.bin']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Kiểm thử giấu/trích xuất k-LSB với k từ 1 đến MAX_K."""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from support import write_wav
+
+from steganography.lsb import MAX_K, embed_bits, extract_bits, resolve_k
+from steganography.lsb_message import embed_message, extract_message
+from steganography.streaming import DEFAULT_BLOCK_FRAMES
+from steganography.wav_io import map_data
+
+MESSAGE = 'Tin nhắn k-LSB ✓ ' * 20
+
+
+class BitPlaneTest(unittest.TestCase):
+
+    def test_round_trip_for_every_k(self):
+        rng = np.random.default_rng(1)
+        for dtype in (np.uint8, np.int16, np.int32):
+            for k in range(1, MAX_K + 1):
+                with self.subTest(dtype=dtype.__name__, k=k):
+                    # Số bit không chia hết cho k để kiểm tra mẫu cuối chỉ mang một phần
+                    bits = rng.integers(0, 2, 1001, dtype=np.uint8)
+                    samples = rng.integers(np.iinfo(dtype).min, np.iinfo(dtype).max, 2000, dtype=dtype)
+                    original = samples.copy()
+                    embed_bits(samples, bits, k=k)
+                    np.testing.assert_array_equal(extract_bits(samples, len(bits), k=k), bits)
+
+                    # Chỉ k bit thấp của đúng số mẫu cần dùng bị thay đổi
+                    n_units = -(-len(bits) // k)
+                    changed = (original ^ samples).view(f'u{samples.itemsize}')
+                    self.assertTrue(np.all(changed[:n_units] < (1 << k)))
+                    self.assertFalse(np.any(changed[n_units:]))
+
+    def test_bit_offset(self):
+        bits = np.array([1, 0, 1, 1, 0, 1], dtype=np.uint8)
+        samples = np.zeros(3, dtype=np.uint8)
+        embed_bits(samples, bits, bit=3, k=2)
+        self.assertFalse(np.any(samples & 0b11100111))
+        np.testing.assert_array_equal(extract_bits(samples, len(bits), bit=3, k=2), bits)
+
+    def test_rejects_bits_beyond_sample_width(self):
+        with self.assertRaises(ValueError):
+            embed_bits(np.zeros(8, dtype=np.uint8), np.ones(4, dtype=np.uint8), bit=6, k=3)
+
+    def test_rejects_payload_larger_than_carrier(self):
+        with self.assertRaises(ValueError):
+            embed_bits(np.zeros(4, dtype=np.int16), np.ones(9, dtype=np.uint8), k=2)
+
+    def test_resolve_k(self):
+        self.assertEqual(resolve_k(3, 2), 3)
+        self.assertEqual(resolve_k({1: 1, 2: 4}, 2), 4)
+        self.assertEqual(resolve_k({1: 1}, 2), 1)
+        for k in (0, MAX_K + 1):
+            with self.assertRaises(ValueError):
+                resolve_k(k, 2)
+
+
+class LsbMessageTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+
+    def _round_trip(self, sampwidth, channels, k, block_frames):
+        carrier = os.path.join(self.tmp, 'carrier.wav')
+        stego = os.path.join(self.tmp, 'stego.wav')
+        write_wav(carrier, channels=channels, sampwidth=sampwidth)
+        embed_message(carrier, stego, MESSAGE, block_frames=block_frames, k=k, compress=False)
+        self.assertEqual(extract_message(stego, k=k), MESSAGE)
+
+        # Chỉ k bit thấp của mỗi mẫu bị thay đổi
+        original, modified = map_data(carrier), map_data(stego)
+        changed = (original ^ modified).view(f'u{sampwidth}')
+        self.assertTrue(np.any(changed))
+        self.assertTrue(np.all(changed < (1 << k)))
+
+    def test_file_round_trip_for_every_k(self):
+        for sampwidth in (1, 2):
+            for k in range(1, MAX_K + 1):
+                for block_frames in (None, 1000):
+                    with self.subTest(sampwidth=sampwidth, k=k, block_frames=block_frames):
+                        self._round_trip(sampwidth, 2, k, block_frames)
+
+    def test_streamed_and_in_memory_outputs_match(self):
+        carrier = os.path.join(self.tmp, 'carrier.wav')
+        write_wav(carrier)
+        outputs = []
+        for block_frames in (None, DEFAULT_BLOCK_FRAMES, 777):
+            stego = os.path.join(self.tmp, f'stego_{block_frames}.wav')
+            embed_message(carrier, stego, MESSAGE, block_frames=block_frames, k=3)
+            with open(stego, 'rb') as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+
+    def test_larger_k_fits_longer_messages(self):
+        carrier = os.path.join(self.tmp, 'carrier.wav')
+        stego = os.path.join(self.tmp, 'stego.wav')
+        write_wav(carrier, seconds=0.1)
+        message = 'x' * 150
+        with self.assertRaises(ValueError):
+            embed_message(carrier, stego, message, k=1, compress=False)
+        embed_message(carrier, stego, message, k=2, compress=False)
+        self.assertEqual(extract_message(stego, k=2), message)
+
+
+if __name__ == '__main__':
+    unittest.main()
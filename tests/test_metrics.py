@@ -0,0 +1,115 @@
+"""Kiểm thử các chỉ số chất lượng âm thanh, gồm hồi quy tràn số int16."""
+import os
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+from support import write_wav
+
+from steganography.metrics import compare_arrays, compare_audio
+
+
+def _write_samples(path, samples, framerate=8000):
+    samples = np.asarray(samples)
+    with wave.open(path, 'wb') as audio:
+        audio.setnchannels(samples.shape[1] if samples.ndim > 1 else 1)
+        audio.setsampwidth(samples.dtype.itemsize)
+        audio.setframerate(framerate)
+        audio.writeframes(samples.tobytes())
+
+
+def _reference(original, modified):
+    """MSE và SNR tính trực tiếp bằng float64 trên toàn bộ tín hiệu."""
+    original = original.astype(np.float64)
+    error = modified.astype(np.float64) - original
+    mse = np.mean(error ** 2)
+    return mse, 10 * np.log10(np.sum(original ** 2) / np.sum(error ** 2))
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_int16_extremes_do_not_overflow(self):
+        # Bình phương trực tiếp mảng int16 bị tràn: (30000 - (-30000)) ** 2 quay vòng trong int16
+        original = np.full(4000, 30000, dtype=np.int16)
+        modified = -original
+        _write_samples(self.path('a.wav'), original)
+        _write_samples(self.path('b.wav'), modified)
+
+        metrics = compare_audio(self.path('a.wav'), self.path('b.wav'))
+        self.assertEqual(metrics.mse, 60000.0 ** 2)
+        self.assertEqual(metrics.max_abs_error, 60000.0)
+        self.assertAlmostEqual(metrics.snr, 10 * np.log10(30000.0 ** 2 / 60000.0 ** 2))
+
+    def test_matches_float64_reference(self):
+        original = write_wav(self.path('a.wav'), seconds=2, channels=2, amplitude=0.9)
+        modified = original.copy()
+        modified[::7] ^= 0x0F0F
+        _write_samples(self.path('b.wav'), modified)
+
+        mse, snr = _reference(original, modified)
+        metrics = compare_audio(self.path('a.wav'), self.path('b.wav'))
+        self.assertAlmostEqual(metrics.mse, mse, delta=mse * 1e-12)
+        self.assertAlmostEqual(metrics.snr, snr, places=9)
+        self.assertEqual(metrics.nframes, len(original))
+        self.assertEqual(len(metrics.channels), 2)
+        for c, channel in enumerate(metrics.channels):
+            self.assertAlmostEqual(channel.snr, _reference(original[:, c], modified[:, c])[1], places=9)
+
+    def test_block_size_does_not_change_result(self):
+        original = write_wav(self.path('a.wav'), seconds=2)
+        modified = original + np.int16(3)
+        _write_samples(self.path('b.wav'), modified)
+        results = [compare_audio(self.path('a.wav'), self.path('b.wav'), block_frames=block_frames)
+                   for block_frames in (160, 1000, 1 << 20)]
+        for result in results[1:]:
+            self.assertAlmostEqual(result.mse, results[0].mse)
+            self.assertAlmostEqual(result.segmental_snr, results[0].segmental_snr)
+
+    def test_identical_files(self):
+        write_wav(self.path('a.wav'))
+        metrics = compare_audio(self.path('a.wav'), self.path('a.wav'))
+        self.assertEqual(metrics.mse, 0.0)
+        self.assertEqual(metrics.snr, float('inf'))
+
+    def test_8bit_original_against_int16_stego(self):
+        original = write_wav(self.path('a.wav'), sampwidth=1)
+        # Cùng tín hiệu ở dạng int16 (bỏ tâm 128, nhân 256): sau chuẩn hóa không có sai khác
+        widened = (original.astype(np.int16) - 128) << 8
+        _write_samples(self.path('b.wav'), widened)
+        self.assertEqual(compare_audio(self.path('a.wav'), self.path('b.wav')).mse, 0.0)
+        self.assertEqual(compare_arrays(original, widened, 8000).mse, 0.0)
+
+        # Sai khác 1 mẫu 8-bit được tính theo đơn vị mẫu của file gốc
+        _write_samples(self.path('c.wav'), widened + np.int16(256))
+        self.assertAlmostEqual(compare_audio(self.path('a.wav'), self.path('c.wav')).max_abs_error, 1.0)
+
+    def test_rejects_channel_or_rate_mismatch(self):
+        write_wav(self.path('a.wav'))
+        write_wav(self.path('stereo.wav'), channels=2)
+        write_wav(self.path('rate.wav'), framerate=16000)
+        for other in ('stereo.wav', 'rate.wav'):
+            with self.assertRaises(ValueError):
+                compare_audio(self.path('a.wav'), self.path(other))
+
+    def test_compare_arrays_matches_compare_audio(self):
+        original = write_wav(self.path('a.wav'), seconds=1.5)
+        modified = original // 2
+        _write_samples(self.path('b.wav'), modified)
+        from_files = compare_audio(self.path('a.wav'), self.path('b.wav'))
+        from_arrays = compare_arrays(original, modified, 8000)
+        self.assertAlmostEqual(from_files.snr, from_arrays.snr)
+        self.assertAlmostEqual(from_files.segmental_snr, from_arrays.segmental_snr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Kiểm thử tiêu đề payload (magic, version, độ dài, CRC32), nén payload và việc từ chối payload hỏng."""
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+from support import write_wav
+
+from steganography.lsb import bits_to_bytes, bytes_to_bits, embed_bits, extract_bits, read_payload
+from steganography.lsb_message import embed_message, extract_message
+from steganography.payload import (CODECS, COMPRESSION_MASK, HEADER, HEADER_BITS, HEADER_SIZE, MAGIC, VERSION,
+                                   decompress_payload, pack_header, pack_payload, unpack_header, verify_payload)
+from steganography.wav_io import map_data, parse_wav_header
+
+TEXT = ('Giấu tin trong âm thanh bằng LSB, echo hiding, phase coding và trải phổ. ' * 40).encode('utf-8')
+
+
+class PayloadHeaderTest(unittest.TestCase):
+
+    def test_pack_unpack_round_trip(self):
+        data = 'xin chào'.encode('utf-8')
+        packed = pack_payload(data)
+        self.assertEqual(len(packed), HEADER_SIZE + len(data))
+        flags, length, crc = unpack_header(packed)
+        self.assertEqual((flags, length, crc), (0, len(data), zlib.crc32(data)))
+        self.assertEqual(verify_payload(packed[HEADER_SIZE:], length, crc, flags), data)
+
+    def test_empty_payload(self):
+        flags, length, crc = unpack_header(pack_payload(b''))
+        self.assertEqual(verify_payload(b'', length, crc, flags), b'')
+
+    def test_rejects_wrong_magic(self):
+        header = HEADER.pack(b'XX', VERSION, 0, 0, 0)
+        with self.assertRaisesRegex(ValueError, 'tiêu đề'):
+            unpack_header(header)
+
+    def test_rejects_unknown_version(self):
+        header = HEADER.pack(MAGIC, VERSION + 1, 0, 0, 0)
+        with self.assertRaisesRegex(ValueError, 'phiên bản'):
+            unpack_header(header)
+
+    def test_rejects_short_header(self):
+        with self.assertRaises(ValueError):
+            unpack_header(pack_payload(b'abc')[:HEADER_SIZE - 1])
+
+    def test_rejects_crc_mismatch(self):
+        data = b'payload'
+        flags, length, crc = unpack_header(pack_payload(data))
+        with self.assertRaisesRegex(ValueError, 'CRC'):
+            verify_payload(b'paylaod', length, crc, flags)
+
+    def test_rejects_truncated_payload(self):
+        data = b'payload'
+        flags, length, crc = unpack_header(pack_payload(data))
+        with self.assertRaisesRegex(ValueError, 'cắt cụt'):
+            verify_payload(data[:-1], length, crc, flags)
+
+
+class CompressionTest(unittest.TestCase):
+
+    def test_every_codec_round_trips(self):
+        for flag, (compress, _) in CODECS.items():
+            with self.subTest(flag=flag):
+                packed = compress(TEXT)
+                self.assertLess(len(packed), len(TEXT))
+                self.assertEqual(decompress_payload(packed, flag), TEXT)
+                # Độ dài và CRC32 trong tiêu đề tính trên dữ liệu đã nén
+                payload = pack_header(len(packed), zlib.crc32(packed), flag) + packed
+                flags, length, crc = unpack_header(payload)
+                self.assertEqual(verify_payload(payload[HEADER_SIZE:], length, crc, flags), TEXT)
+
+    def test_pack_payload_picks_shortest_codec(self):
+        packed = pack_payload(TEXT, compress=True)
+        flags, length, crc = unpack_header(packed)
+        self.assertTrue(flags & COMPRESSION_MASK)
+        self.assertEqual(length, min(len(compress(TEXT)) for compress, _ in CODECS.values()))
+        self.assertEqual(verify_payload(packed[HEADER_SIZE:], length, crc, flags), TEXT)
+
+    def test_incompressible_data_is_stored_as_is(self):
+        data = os.urandom(64)
+        flags, length, _ = unpack_header(pack_payload(data, compress=True))
+        self.assertEqual((flags, length), (0, len(data)))
+
+    def test_decompressed_size_is_bounded(self):
+        # Payload nén chỉ vài KB nhưng giải nén ra 1 MiB, vượt giới hạn
+        for flag, (compress, _) in CODECS.items():
+            with self.subTest(flag=flag):
+                packed = compress(bytes(1 << 20))
+                self.assertLess(len(packed), 1 << 12)
+                with self.assertRaisesRegex(ValueError, 'vượt quá'):
+                    decompress_payload(packed, flag, max_length=(1 << 20) - 1)
+                self.assertEqual(len(decompress_payload(packed, flag, max_length=1 << 20)), 1 << 20)
+
+    def test_truncated_or_corrupt_data_is_rejected(self):
+        for flag, (compress, _) in CODECS.items():
+            packed = compress(TEXT)
+            for broken in (packed[:len(packed) // 2], b'\xff' * 32):
+                with self.subTest(flag=flag, length=len(broken)):
+                    with self.assertRaises(ValueError):
+                        decompress_payload(broken, flag)
+
+
+class EmbeddedPayloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.carrier = os.path.join(self._tmp.name, 'carrier.wav')
+        self.stego = os.path.join(self._tmp.name, 'stego.wav')
+        write_wav(self.carrier)
+
+    def test_read_payload_stops_at_header_length(self):
+        samples = np.zeros(4096, dtype=np.int16)
+        embed_bits(samples, bytes_to_bits(pack_payload(b'abc')))
+        self.assertEqual(read_payload(samples), b'abc')
+
+    def test_compressed_message_round_trip(self):
+        message = TEXT.decode('utf-8')
+        embed_message(self.carrier, self.stego, message, compress=True)
+        self.assertEqual(extract_message(self.stego), message)
+        flags, length, _ = unpack_header(bits_to_bytes(extract_bits(map_data(self.stego), HEADER_BITS)))
+        self.assertTrue(flags & COMPRESSION_MASK)
+        self.assertLess(length, len(TEXT))
+
+    def test_carrier_without_message_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'tiêu đề'):
+            extract_message(self.carrier)
+
+    def test_flipped_message_bit_fails_crc(self):
+        embed_message(self.carrier, self.stego, 'bí mật', compress=False)
+        # Đảo LSB của mẫu đầu tiên sau tiêu đề (bit đầu tiên của tin nhắn)
+        with open(self.stego, 'r+b') as f:
+            f.seek(parse_wav_header(self.stego).data_offset + HEADER_BITS * 2)
+            sample, = struct.unpack('<h', f.read(2))
+            f.seek(-2, os.SEEK_CUR)
+            f.write(struct.pack('<h', sample ^ 1))
+        with self.assertRaisesRegex(ValueError, 'CRC'):
+            extract_message(self.stego)
+
+    def test_header_length_beyond_carrier_is_rejected(self):
+        samples = np.zeros(HEADER_BITS + 8, dtype=np.int16)
+        header = HEADER.pack(MAGIC, VERSION, 0, 1 << 20, 0)
+        embed_bits(samples, bytes_to_bits(header))
+        with self.assertRaisesRegex(ValueError, 'vượt quá'):
+            read_payload(samples)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Kiểm thử phase coding: giấu rồi trích xuất lại, theo luồng và trong bộ nhớ."""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from support import write_wav
+
+from steganography.phase import PHASE_0, PHASE_1, decode_phase_bits, embed_phase, extract_phase, phase_transform
+
+
+class PhaseTransformTest(unittest.TestCase):
+
+    def test_batched_transform_matches_per_block_fft(self):
+        rng = np.random.default_rng(2)
+        block_size = 64
+        data = rng.normal(0, 1000, block_size * 20)
+        bits = rng.integers(0, 2, 16, dtype=np.uint8)
+        stego = phase_transform(bits, block_size)(data, 0)
+
+        # Cách làm cũ: mỗi khối một lần FFT, đặt pha của bin 1 theo bit
+        expected = data.copy()
+        for i, bit in enumerate(bits):
+            block = data[i * block_size:(i + 1) * block_size]
+            spectrum = np.fft.fft(block)
+            spectrum[1] = np.abs(spectrum[1]) * np.exp(1j * (PHASE_1 if bit else PHASE_0))
+            spectrum[-1] = np.conj(spectrum[1])
+            expected[i * block_size:(i + 1) * block_size] = np.fft.ifft(spectrum).real
+        np.testing.assert_allclose(stego, expected, atol=1e-6)
+        np.testing.assert_array_equal(decode_phase_bits(stego[:len(bits) * block_size], block_size), bits)
+
+    def test_blocks_after_message_are_unchanged(self):
+        data = np.random.default_rng(3).normal(0, 1000, 64 * 10)
+        stego = phase_transform(np.ones(4, dtype=np.uint8), 64)(data, 0)
+        np.testing.assert_array_equal(stego[4 * 64:], data[4 * 64:])
+
+
+class PhaseFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_round_trip(self):
+        message = 'Phase coding ✓'
+        for channels, sampwidth, block_size in ((1, 2, 512), (2, 2, 256), (1, 1, 128)):
+            for block_frames in (None, 4096):
+                with self.subTest(channels=channels, sampwidth=sampwidth, block_size=block_size,
+                                  block_frames=block_frames):
+                    write_wav(self.path('carrier.wav'), seconds=3, framerate=44100,
+                              channels=channels, sampwidth=sampwidth)
+                    embed_phase(self.path('carrier.wav'), message, self.path('stego.wav'),
+                                block_frames=block_frames, block_size=block_size)
+                    self.assertEqual(extract_phase(self.path('stego.wav'), block_size), message)
+
+    def test_streamed_output_matches_in_memory_output(self):
+        write_wav(self.path('carrier.wav'), seconds=3, framerate=44100, channels=2)
+        outputs = []
+        for block_frames in (None, 5000):
+            stego = self.path(f'stego_{block_frames}.wav')
+            embed_phase(self.path('carrier.wav'), 'cùng kết quả', stego, block_frames=block_frames)
+            with open(stego, 'rb') as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_rejects_message_longer_than_carrier(self):
+        write_wav(self.path('carrier.wav'), seconds=0.5, framerate=8000)
+        with self.assertRaisesRegex(ValueError, 'quá nhỏ'):
+            embed_phase(self.path('carrier.wav'), 'quá dài', self.path('stego.wav'))
+        self.assertFalse(os.path.exists(self.path('stego.wav')))
+
+    def test_carrier_without_message_is_rejected(self):
+        write_wav(self.path('carrier.wav'), seconds=3, framerate=44100)
+        with self.assertRaises(ValueError):
+            extract_phase(self.path('carrier.wav'))
+
+
+if __name__ == '__main__':
+    unittest.main()
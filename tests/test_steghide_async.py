@@ -0,0 +1,178 @@
+"""Kiểm thử SteghideRunner với fake_steghide.py thay cho steghide thật."""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import wave
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from steganography.steghide_async import SteghideError, SteghideRunner, run_steghide_jobs  # noqa: E402
+
+FAKE_COMMAND = [sys.executable, os.path.join(ROOT, 'fake_steghide.py')]
+PASSWORD = 'mật khẩu'
+
+
+def _make_cover(path, n_frames=8000):
+    with wave.open(path, 'wb') as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(8000)
+        audio.writeframes(bytes(range(256)) * (n_frames * 2 // 256))
+
+
+class SteghideRunnerTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.cover = os.path.join(self.tmp, 'cover.wav')
+        _make_cover(self.cover)
+        # Các biến môi trường điều khiển fake_steghide chỉ có hiệu lực trong từng test
+        self._env = mock.patch.dict(os.environ)
+        self._env.start()
+        os.environ.pop('FAKE_STEGHIDE_DELAY', None)
+        os.environ.pop('FAKE_STEGHIDE_FAIL', None)
+
+    def tearDown(self):
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def runner(self, **kwargs):
+        return SteghideRunner(command=FAKE_COMMAND, staging_dir=self.tmp, **kwargs)
+
+    async def test_embed_extract_round_trip_in_memory(self):
+        runner = self.runner()
+        with open(self.cover, 'rb') as f:
+            stego = await runner.embed(f.read(), 'bí mật'.encode('utf-8'), PASSWORD)
+        self.assertIsInstance(stego, bytearray)
+        secret = await runner.extract(stego, PASSWORD)
+        self.assertEqual(secret.decode('utf-8'), 'bí mật')
+
+    async def test_embed_extract_to_output_paths(self):
+        runner = self.runner()
+        stego_path = os.path.join(self.tmp, 'stego.wav')
+        secret_path = os.path.join(self.tmp, 'secret.txt')
+        self.assertEqual(await runner.embed(self.cover, b'payload', PASSWORD, output=stego_path), stego_path)
+        self.assertEqual(await runner.extract(stego_path, PASSWORD, output=secret_path), secret_path)
+        with open(secret_path, 'rb') as f:
+            self.assertEqual(f.read(), b'payload')
+
+    async def test_wrong_password_raises_steghide_error(self):
+        runner = self.runner()
+        stego = await runner.embed(self.cover, b'payload', PASSWORD)
+        with self.assertRaises(SteghideError) as caught:
+            await runner.extract(stego, 'sai mật khẩu')
+        self.assertEqual(caught.exception.returncode, 1)
+        self.assertIn('passphrase', caught.exception.stderr)
+
+    async def test_non_zero_exit_raises_steghide_error(self):
+        os.environ['FAKE_STEGHIDE_FAIL'] = '3'
+        with self.assertRaises(SteghideError) as caught:
+            await self.runner().embed(self.cover, b'payload', PASSWORD)
+        self.assertEqual(caught.exception.returncode, 3)
+        self.assertIn('simulated failure', caught.exception.stderr)
+
+    async def test_timeout_kills_process(self):
+        os.environ['FAKE_STEGHIDE_DELAY'] = '30'
+        start = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.runner(timeout=0.5).embed(self.cover, b'payload', PASSWORD)
+        # Tiến trình bị dừng ngay thay vì chờ hết 30 giây
+        self.assertLess(time.perf_counter() - start, 10)
+
+    async def test_cancel_kills_process(self):
+        os.environ['FAKE_STEGHIDE_DELAY'] = '30'
+        processes = []
+        original = asyncio.create_subprocess_exec
+
+        async def spawn(*args, **kwargs):
+            process = await original(*args, **kwargs)
+            processes.append(process)
+            return process
+
+        with mock.patch('asyncio.create_subprocess_exec', spawn):
+            task = asyncio.create_task(self.runner().embed(self.cover, b'payload', PASSWORD))
+            while not processes:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        self.assertIsNotNone(processes[0].returncode)
+
+    async def test_semaphore_limits_concurrent_processes(self):
+        os.environ['FAKE_STEGHIDE_DELAY'] = '0.3'
+        active = peak = 0
+        original = asyncio.create_subprocess_exec
+
+        async def spawn(*args, **kwargs):
+            nonlocal active, peak
+            process = await original(*args, **kwargs)
+            active += 1
+            peak = max(peak, active)
+            communicate = process.communicate
+
+            async def tracked(*a, **kw):
+                nonlocal active
+                try:
+                    return await communicate(*a, **kw)
+                finally:
+                    active -= 1
+
+            process.communicate = tracked
+            return process
+
+        runner = self.runner(max_concurrency=2)
+        with mock.patch('asyncio.create_subprocess_exec', spawn):
+            results = await runner.run([{'op': 'embed', 'cover': self.cover, 'secret': b'x',
+                                         'password': PASSWORD} for _ in range(5)])
+        self.assertEqual(peak, 2)
+        self.assertTrue(all(isinstance(result, bytearray) for result in results))
+
+    async def test_run_returns_errors_in_job_order(self):
+        runner = self.runner()
+        stego = await runner.embed(self.cover, b'payload', PASSWORD)
+        results = await runner.run([
+            {'op': 'extract', 'stego': stego, 'password': PASSWORD},
+            {'op': 'extract', 'stego': stego, 'password': 'sai'},
+            {'op': 'extract', 'stego': os.path.join(self.tmp, 'missing.wav'), 'password': PASSWORD},
+        ])
+        self.assertEqual(results[0], b'payload')
+        self.assertIsInstance(results[1], SteghideError)
+        self.assertIsInstance(results[2], SteghideError)
+
+    async def test_staging_runs_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        threads = []
+        original = SteghideRunner._stage
+
+        def stage(runner, *args):
+            threads.append(threading.get_ident())
+            return original(runner, *args)
+
+        with mock.patch.object(SteghideRunner, '_stage', stage):
+            await self.runner().embed(self.cover, b'payload', PASSWORD)
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+
+class RunSteghideJobsTest(unittest.TestCase):
+
+    def test_sync_wrapper(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cover = os.path.join(tmp, 'cover.wav')
+            _make_cover(cover)
+            stego, = run_steghide_jobs([{'op': 'embed', 'cover': cover, 'secret': b'abc',
+                                         'password': PASSWORD}], command=FAKE_COMMAND)
+            secret, = run_steghide_jobs([{'op': 'extract', 'stego': stego, 'password': PASSWORD}],
+                                        command=FAKE_COMMAND)
+        self.assertEqual(secret, b'abc')
+
+
+if __name__ == '__main__':
+    unittest.main()